@@ -0,0 +1,86 @@
+"""Benchmark de la comparación de presupuestos.
+
+Mide la latencia de `BudgetService.compare` para el mes actual al crecer
+el número de presupuestos y de transacciones históricas. El mes actual
+siempre tiene PER_MONTH_ROWS gastos: con el índice de cobertura la
+latencia depende de esas filas, no del tamaño del histórico.
+
+`get_budget_spending` se memoriza en la caché de lecturas, así que se
+informan dos cifras: en frío (caché vaciada antes de cada consulta, mide
+el SQL) y en caliente (aciertos de caché).
+
+Uso: python -m benchmarks.bench_budget
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.database import DatabaseManager
+from services.budget_service import BudgetService
+
+HISTORY_DAYS = 3 * 365
+PER_MONTH_ROWS = 300
+REPEATS = 50
+
+
+def _populate(db: DatabaseManager, n_budgets: int, n_transactions: int, today: date) -> None:
+    rng = random.Random(42)
+    categories = [f"Cat{i:03d}" for i in range(n_budgets)]
+    for cat in categories:
+        db.update_budget(cat, 500.0)
+
+    month_start = today.replace(day=1)
+    rows = []
+    for i in range(n_transactions):
+        if i < PER_MONTH_ROWS:
+            day = month_start + timedelta(days=rng.randrange(today.day))
+        else:
+            day = month_start - timedelta(days=1 + rng.randrange(HISTORY_DAYS))
+        rows.append(("Gasto", rng.choice(categories), round(rng.uniform(1, 50), 2),
+                     day.isoformat(), "", "Efectivo"))
+    db.add_transactions_bulk(rows)
+
+
+def run(n_budgets: int, n_transactions: int) -> Tuple[float, float]:
+    """(ms en frío, ms en caliente) por consulta."""
+    today = date.today()
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "bench.db"), pooled=True)
+        try:
+            _populate(db, n_budgets, n_transactions, today)
+            service = BudgetService(db)
+            service.compare(today=today)  # calentar conexiones y páginas de SQLite
+
+            cold = 0.0
+            for _ in range(REPEATS):
+                db.clear_cache()
+                start = time.perf_counter()
+                service.compare(today=today)
+                cold += time.perf_counter() - start
+
+            service.compare(today=today)  # calentar caché
+            start = time.perf_counter()
+            for _ in range(REPEATS):
+                service.compare(today=today)
+            warm = time.perf_counter() - start
+            return cold / REPEATS * 1000, warm / REPEATS * 1000
+        finally:
+            db.close()
+
+
+def main() -> None:
+    print(f"{'presupuestos':>12} {'transacciones':>14} {'ms en frío':>12} {'ms en caliente':>15}")
+    for n_budgets in (10, 50):
+        for n_transactions in (1_000, 10_000, 100_000):
+            cold, warm = run(n_budgets, n_transactions)
+            print(f"{n_budgets:>12} {n_transactions:>14} {cold:>12.3f} {warm:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
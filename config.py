@@ -37,6 +37,7 @@ DEFAULT_THEME = "Dark"
 DEFAULT_COLOR_THEME = "dark-blue"
 
 # Seguridad
-PIN_ITERATIONS = 100_000
+PIN_ITERATIONS = 100_000  # Mínimo; la calibración puede subirlo
+PIN_KDF_TARGET_MS = 250  # Duración buscada de una derivación al calibrar
 PIN_SALT_LENGTH = 16
 MID_LENGTH = 4
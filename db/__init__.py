@@ -1,5 +1,5 @@
 """Módulo de acceso a la base de datos."""
 
-from .database import DatabaseManager
+from .database import CreditLimitExceeded, CreditReconciliation, DatabaseManager
 
-__all__ = ["DatabaseManager"]
+__all__ = ["DatabaseManager", "CreditLimitExceeded", "CreditReconciliation"]
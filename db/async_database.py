@@ -0,0 +1,84 @@
+"""Fachada asíncrona de DatabaseManager.
+
+Cada método público de DatabaseManager tiene aquí un equivalente
+`async` que se ejecuta fuera del hilo que lo espera: las lecturas en un
+pool de hilos (concurrentes entre sí, cada hilo con su conector del
+pool WAL) y las escrituras en un único hilo, así que nunca compiten
+entre ellas por BEGIN IMMEDIATE y se aplican en el orden pedido.
+
+    adb = AsyncDatabaseManager(DatabaseManager(pooled=True))
+    ingresos, gastos = await adb.get_summary()
+    await adb.add_transaction_atomic("Gasto", "Comida", 12.5, "2026-01-03", "", "Efectivo")
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from db.database import DatabaseManager
+
+T = TypeVar("T")
+
+READ_METHODS = (
+    "get_transactions", "get_transaction", "search_transactions", "get_transactions_page",
+    "count_transactions", "get_recent_transactions", "get_summary", "get_totals_cents",
+    "get_totals_by_period", "get_monthly_totals_cents", "balance_at", "net_flow", "balance_series", "get_credit_info",
+    "get_expenses_by_category", "get_savings_goals", "get_budget_comparison",
+    "get_budget_spending", "get_plans", "get_recurring", "get_recurring_schedule",
+    "get_recurring_posted_ids",
+)
+
+# reconcile(fix=True) escribe; se serializa siempre con las escrituras
+WRITE_METHODS = (
+    "add_transaction", "add_transaction_atomic", "add_transactions_bulk", "delete_transaction",
+    "update_credit_limit", "update_credit_usage", "reconcile", "rebuild_monthly_summary",
+    "add_savings_goal", "update_savings_progress", "update_budget", "create_plan",
+    "deposit_to_plan", "delete_plan", "add_recurring", "delete_recurring", "post_recurring",
+)
+
+
+class AsyncDatabaseManager:
+    """Envuelve un DatabaseManager con corrutinas.
+
+    Conviene que `db` use `pooled=True`: los hilos lectores reutilizan
+    entonces sus conexiones. `max_readers` debería coincidir con el del
+    pool para no abrir conexiones temporales.
+    """
+    def __init__(self, db: DatabaseManager, max_readers: int = 4) -> None:
+        self.db = db
+        self._readers = ThreadPoolExecutor(max_workers=max_readers, thread_name_prefix="db-reader")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+
+    async def run_read(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Ejecuta `fn` (una lectura) en el pool de lectores."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, functools.partial(fn, *args, **kwargs))
+
+    async def run_write(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Ejecuta `fn` en el hilo escritor, detrás de las escrituras ya encoladas."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._writer, functools.partial(fn, *args, **kwargs))
+
+    def close(self, wait: bool = True) -> None:
+        """Detiene los hilos (no cierra el DatabaseManager subyacente)."""
+        self._writer.shutdown(wait=wait)
+        self._readers.shutdown(wait=wait)
+
+
+def _mirror(name: str, write: bool) -> Callable[..., Any]:
+    target = getattr(DatabaseManager, name)
+
+    async def method(self: AsyncDatabaseManager, *args: Any, **kwargs: Any) -> Any:
+        run = self.run_write if write else self.run_read
+        return await run(getattr(self.db, name), *args, **kwargs)
+
+    method.__name__ = method.__qualname__ = name
+    method.__doc__ = target.__doc__
+    return method
+
+
+for _name in READ_METHODS:
+    setattr(AsyncDatabaseManager, _name, _mirror(_name, write=False))
+for _name in WRITE_METHODS:
+    setattr(AsyncDatabaseManager, _name, _mirror(_name, write=True))
+del _name
@@ -0,0 +1,114 @@
+"""Índice en memoria de saldos acumulados por día.
+
+Se construye a partir de `flujo_diario` (un valor por día, en centavos)
+como un arreglo denso desde el primer día con movimientos hasta el
+último. Un árbol de Fenwick sobre ese arreglo responde sumas de rango y
+saldos a una fecha en O(log n) y admite actualizaciones puntuales sin
+reconstruirse; diez años de historia son unos 3.650 nodos.
+"""
+from datetime import date, timedelta
+from itertools import accumulate
+from typing import Iterable, List, Tuple, Union
+
+DateLike = Union[str, date]
+
+
+def _as_date(value: DateLike) -> date:
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+class FenwickTree:
+    """Árbol de Fenwick (Binary Indexed Tree) de enteros."""
+
+    def __init__(self, values: Iterable[int]) -> None:
+        tree = [0] + list(values)
+        n = len(tree) - 1
+        # Construcción en O(n): cada nodo empuja su suma a su padre
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self._tree = tree
+        self.size = n
+
+    def add(self, index: int, delta: int) -> None:
+        """Suma `delta` a la posición `index` (base 0)."""
+        i = index + 1
+        tree = self._tree
+        while i <= self.size:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix(self, count: int) -> int:
+        """Suma de las primeras `count` posiciones, es decir [0, count)."""
+        i = min(max(count, 0), self.size)
+        tree = self._tree
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def range_sum(self, start: int, end: int) -> int:
+        """Suma del rango semiabierto [start, end)."""
+        if end <= start:
+            return 0
+        return self.prefix(end) - self.prefix(start)
+
+
+class BalanceIndex:
+    """Saldos y flujos netos por fecha, en centavos."""
+
+    def __init__(self, rows: Iterable[Tuple[str, int]]) -> None:
+        rows = sorted((_as_date(fecha), neto) for fecha, neto in rows)
+        if rows:
+            self.origin = rows[0][0]
+            days = (rows[-1][0] - self.origin).days + 1
+        else:
+            self.origin = date.today()
+            days = 0
+        daily = [0] * days
+        for day, neto in rows:
+            daily[(day - self.origin).days] += neto
+        self._daily = daily
+        self._tree = FenwickTree(daily)
+
+    def _offset(self, day: DateLike) -> int:
+        return (_as_date(day) - self.origin).days
+
+    def add(self, day: DateLike, delta: int) -> bool:
+        """Aplica un movimiento. Devuelve False si la fecha cae fuera del
+        rango cubierto y el índice debe reconstruirse."""
+        i = self._offset(day)
+        if not 0 <= i < len(self._daily):
+            return False
+        self._daily[i] += delta
+        self._tree.add(i, delta)
+        return True
+
+    def balance_at(self, day: DateLike) -> int:
+        """Saldo al cierre de `day` (incluye los movimientos de ese día)."""
+        return self._tree.prefix(self._offset(day) + 1)
+
+    def net_flow(self, start: DateLike, end: DateLike) -> int:
+        """Flujo neto en el rango semiabierto [start, end)."""
+        return self._tree.range_sum(self._offset(start), self._offset(end))
+
+    def series(self, start: DateLike, end: DateLike, step: int = 1) -> List[Tuple[str, int]]:
+        """Saldo al cierre de cada día start, start+step, ... <= end."""
+        if step < 1:
+            raise ValueError("El paso debe ser de al menos un día")
+        first, last = _as_date(start), _as_date(end)
+        if last < first:
+            return []
+        lo = self._offset(first)
+        hi = self._offset(last)
+        # Un solo recorrido acumulado desde el saldo inicial en lugar de
+        # una consulta al árbol por punto
+        daily, n = self._daily, len(self._daily)
+        window = (daily[o] if 0 <= o < n else 0 for o in range(lo + 1, hi + 1))
+        running = list(accumulate(window, initial=self._tree.prefix(lo + 1)))
+        return [((first + timedelta(days=k)).isoformat(), running[k])
+                for k in range(0, hi - lo + 1, step)]
@@ -0,0 +1,123 @@
+"""Gestión de conexiones SQLite persistentes.
+
+Un único escritor de larga duración (serializado con un lock) y un pool
+pequeño de conexiones de lectura, una por hilo. Todas las conexiones se
+abren con los PRAGMAs de rendimiento (WAL, synchronous=NORMAL, caché de
+páginas ampliada, mmap) y con caché de sentencias preparadas.
+"""
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+
+class ConnectionPool:
+    """Pool de conexiones: un escritor compartido y lectores por hilo."""
+
+    def __init__(self, db_name: str, max_readers: int = 4, busy_timeout_ms: int = 5000,
+                 cache_size_kib: int = 16384, mmap_size: int = 64 * 1024 * 1024,
+                 statement_cache: int = 256) -> None:
+        self.db_name = db_name
+        self.max_readers = max_readers
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cache_size_kib = cache_size_kib
+        self.mmap_size = mmap_size
+        self.statement_cache = statement_cache
+
+        self._write_lock = threading.RLock()
+        self._readers_lock = threading.Lock()
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._closed = False
+
+        self._writer = self._open()
+        self._writer.execute("PRAGMA journal_mode=WAL")
+
+    def _open(self) -> sqlite3.Connection:
+        # check_same_thread=False: el escritor se comparte entre hilos (bajo
+        # lock) y close() debe poder cerrar lectores creados en otros hilos.
+        conn = sqlite3.connect(self.db_name, timeout=self.busy_timeout_ms / 1000,
+                               check_same_thread=False,
+                               cached_statements=self.statement_cache)
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kib)}")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    @property
+    def in_memory(self) -> bool:
+        # Cada conexión a ':memory:' es una BD distinta: se comparte el escritor
+        return self.db_name == ":memory:" or self.db_name.startswith("file::memory:")
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Entrega la conexión de escritura con acceso exclusivo."""
+        if self._closed:
+            raise sqlite3.ProgrammingError("El pool de conexiones está cerrado")
+        with self._write_lock:
+            yield self._writer
+
+    def data_version(self) -> Optional[int]:
+        """PRAGMA data_version del escritor.
+
+        Solo cambia cuando otra conexión (p. ej. otro proceso) confirma
+        cambios; los commits propios del escritor no lo alteran. Devuelve
+        None sin esperar si el escritor está ocupado.
+        """
+        if self._closed:
+            raise sqlite3.ProgrammingError("El pool de conexiones está cerrado")
+        if not self._write_lock.acquire(blocking=False):
+            return None
+        try:
+            return self._writer.execute("PRAGMA data_version").fetchone()[0]
+        finally:
+            self._write_lock.release()
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Entrega la conexión de lectura del hilo actual.
+
+        Si se alcanzó `max_readers`, se usa una conexión temporal que se
+        cierra al terminar.
+        """
+        if self._closed:
+            raise sqlite3.ProgrammingError("El pool de conexiones está cerrado")
+        if self.in_memory:
+            with self.writer() as conn:
+                yield conn
+            return
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            with self._readers_lock:
+                if len(self._readers) < self.max_readers:
+                    conn = self._open()
+                    self._readers.append(conn)
+                    self._local.conn = conn
+        if conn is not None:
+            yield conn
+            return
+
+        temp = self._open()
+        try:
+            yield temp
+        finally:
+            temp.close()
+
+    def close(self) -> None:
+        """Cierra todas las conexiones del pool."""
+        if self._closed:
+            return
+        self._closed = True
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+        with self._write_lock:
+            try:
+                self._writer.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+            self._writer.close()
@@ -0,0 +1,110 @@
+"""Libro mayor del crédito interno (Cashea), de solo inserción.
+
+Cada cambio del saldo usado es una fila de `credito_movimientos` con el
+delta realmente aplicado en centavos (un pago recortado a cero guarda el
+recorte, no el monto pagado), así que revertir una transacción es restar
+lo que registró. Cada SNAPSHOT_INTERVAL movimientos se guarda en
+`credito_snapshots` el saldo acumulado; el saldo actual es la última
+instantánea más la cola de movimientos posteriores.
+
+Todas las funciones reciben un cursor y no abren transacciones.
+"""
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SNAPSHOT_INTERVAL = 500
+
+# (transaccion_id o None, tipo, delta_centavos)
+Movement = Tuple[Optional[int], str, int]
+
+
+def _state(cur: sqlite3.Cursor) -> Tuple[int, int]:
+    """(saldo actual, movimientos desde la última instantánea)."""
+    row = cur.execute("SELECT movimiento_id, saldo FROM credito_snapshots ORDER BY movimiento_id DESC LIMIT 1").fetchone()
+    last_id, saldo = row if row is not None else (0, 0)
+    count, tail = cur.execute(
+        "SELECT COUNT(*), IFNULL(SUM(delta), 0) FROM credito_movimientos WHERE id > ?", (last_id,)
+    ).fetchone()
+    return saldo + tail, count
+
+
+def current_balance(cur: sqlite3.Cursor) -> int:
+    """Saldo usado en centavos; coste proporcional a la cola, no al historial."""
+    return _state(cur)[0]
+
+
+def record(cur: sqlite3.Cursor, movements: Iterable[Movement]) -> None:
+    """Añade movimientos y guarda una instantánea si la cola es larga."""
+    movements = [m for m in movements if m[2]]
+    if not movements:
+        return
+    cur.executemany("INSERT INTO credito_movimientos (transaccion_id, tipo, delta) VALUES (?, ?, ?)", movements)
+    saldo, count = _state(cur)
+    if count >= SNAPSHOT_INTERVAL:
+        cur.execute(
+            "INSERT INTO credito_snapshots (movimiento_id, saldo) SELECT MAX(id), ? FROM credito_movimientos",
+            (saldo,),
+        )
+
+
+def recorded_for(cur: sqlite3.Cursor, tx_id: int) -> int:
+    """Efecto neto registrado para una transacción."""
+    cur.execute("SELECT IFNULL(SUM(delta), 0) FROM credito_movimientos WHERE transaccion_id = ?", (tx_id,))
+    return cur.fetchone()[0]
+
+
+def credit_delta(tipo: str, metodo: str, cents: int, usado: int) -> int:
+    """Delta que aplica una transacción nueva sobre el saldo `usado`."""
+    if tipo == "Gasto" and metodo == "CreditoInterno":
+        return cents
+    if tipo == "PagoCredito":
+        return -min(cents, usado)
+    return 0
+
+
+def replay(cur: sqlite3.Cursor) -> Tuple[int, List[Tuple[int, int]]]:
+    """Recalcula el saldo desde `transacciones` en orden de id.
+
+    Devuelve (saldo, [(transaccion_id, delta), ...]) aplicando las mismas
+    reglas que las escrituras, incluido el recorte de pagos en cero.
+    """
+    cur.execute('''
+        SELECT id, tipo, metodo_pago, monto FROM transacciones
+        WHERE tipo = 'PagoCredito' OR (tipo = 'Gasto' AND metodo_pago = 'CreditoInterno')
+        ORDER BY id
+    ''')
+    usado = 0
+    applied = []
+    for tx_id, tipo, metodo, monto in cur.fetchall():
+        delta = credit_delta(tipo, metodo, monto, usado)
+        usado += delta
+        applied.append((tx_id, delta))
+    return usado, applied
+
+
+def recorded_by_transaction(cur: sqlite3.Cursor) -> Dict[int, int]:
+    """{transaccion_id: efecto neto registrado} de los movimientos con transacción."""
+    cur.execute('''
+        SELECT transaccion_id, SUM(delta) FROM credito_movimientos
+        WHERE transaccion_id IS NOT NULL GROUP BY transaccion_id
+    ''')
+    return dict(cur.fetchall())
+
+
+def realign(cur: sqlite3.Cursor) -> int:
+    """Ajusta el efecto registrado de cada transacción vigente al de `replay`.
+
+    Borrar una transacción de crédito cambia el recorte de los pagos
+    posteriores (un pago que se quedó en 30 puede valer ahora 0 o más);
+    la diferencia se añade como movimiento 'reverso'. Las transacciones ya
+    borradas quedan con efecto cero. Devuelve cuántos movimientos se
+    añadieron.
+    """
+    _usado, applied = replay(cur)
+    recorded = recorded_by_transaction(cur)
+    movements = [(tx_id, "reverso", delta - recorded.pop(tx_id, 0)) for tx_id, delta in applied]
+    movements.extend((tx_id, "reverso", -got) for tx_id, got in sorted(recorded.items()))
+    movements = [m for m in movements if m[2]]
+    record(cur, movements)
+    return len(movements)
+
@@ -3,103 +3,344 @@
 Contiene la implementación del gestor SQLite y garantiza operaciones
 atómicas para las transacciones financieras (especialmente crédito interno).
 """
+import functools
 import sqlite3
-from typing import Optional, Tuple, List
+import threading
+from contextlib import contextmanager
+from datetime import date
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, Tuple, List, Union
 
 
 from config import DB_PATH
+from db import credit_ledger
+from db.balance_index import BalanceIndex
+from db.connection import ConnectionPool
+from db.events import CREDIT_TABLES, TX_TABLES, ChangeSet, DataChanged, EventBus
+from db.migrate import apply_migrations, rebuild_monthly_summary
+from db.query_cache import CacheStats, QueryCache
+from utils.money import to_cents
+
+
+def _tx_columns(alias: str = "") -> str:
+    """Columnas de `transacciones` con el monto convertido de centavos a unidades."""
+    p = f"{alias}." if alias else ""
+    return f"{p}id, {p}tipo, {p}categoria, {p}monto / 100.0, {p}fecha, {p}descripcion, {p}metodo_pago"
+
+
+# Los importes se guardan como INTEGER en centavos (migración 6); estas
+# listas reemplazan a SELECT * para devolver float en la API pública.
+TX_COLUMNS = _tx_columns()
+PLAN_COLUMNS = "id, nombre_plan, monto_objetivo / 100.0, monto_actual / 100.0, fecha_limite, color_hex"
+GOAL_COLUMNS = "id, nombre, monto_objetivo / 100.0, monto_actual / 100.0"
+RECURRING_COLUMNS = "id, nombre, monto / 100.0, dia_cobro, categoria, activo"
+
+# Expresión SQL que agrupa `fecha` por periodo (ver get_totals_by_period)
+PERIOD_BUCKETS = {
+    "day": "substr(fecha, 1, 10)",
+    "week": "date(substr(fecha, 1, 10), '-6 days', 'weekday 1')",
+    "month": "substr(fecha, 1, 7)",
+}
+
+# Método de pago con el que se registran los cargos recurrentes
+RECURRING_METHOD = "Debito"
+
+
+class CreditReconciliation(NamedTuple):
+    """Resultado de `DatabaseManager.reconcile`.
+
+    `mismatched` lista (transaccion_id, esperado, registrado) para cada
+    transacción cuyo efecto en el libro difiere del recalculado.
+    """
+    expected: float
+    recorded: float
+    difference: float
+    adjustments: float
+    mismatched: List[Tuple[int, float, float]]
+
+
+class CreditLimitExceeded(ValueError):
+    """Límite de crédito excedido; `row_index` indica la fila culpable en cargas masivas."""
+    def __init__(self, message: str, row_index: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.row_index = row_index
+
+
+def _cached_read(*tables: str):
+    """Memoriza una lectura de DatabaseManager por (método, argumentos).
+
+    `tables` son las tablas que consulta: solo los cambios en ellas
+    descartan la entrada. Las listas se devuelven copiadas para que el
+    llamador no altere la entrada cacheada. Con argumentos no hashables
+    se consulta sin caché.
+    """
+    def decorator(method):
+        name = method.__name__
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = self._cache
+            if cache is None:
+                return method(self, *args, **kwargs)
+            self._sync_data_version()
+            generation = cache.generation
+            try:
+                key = (name, args, tuple(sorted(kwargs.items())))
+                found, value = cache.get(key, generation)
+            except TypeError:
+                return method(self, *args, **kwargs)
+            if not found:
+                value = method(self, *args, **kwargs)
+                cache.put(key, generation, value, tables)
+            return list(value) if isinstance(value, list) else value
+
+        return wrapper
+    return decorator
+
 
 class DatabaseManager:
-    """Gestor de la base de datos SQLite."""
-    def __init__(self, db_name: str = None) -> None:
+    """Gestor de la base de datos SQLite.
+
+    Con `pooled=True` reutiliza conexiones persistentes (un escritor y un
+    pool de lectores por hilo, en modo WAL) en lugar de abrir una conexión
+    por llamada. En ese caso debe llamarse a `close()` al terminar.
+
+    Las lecturas frecuentes se memorizan en una caché LRU de `cache_size`
+    entradas (0 la desactiva). Cada escritura propia publica en `events`
+    un DataChanged con las tablas, ids y meses que tocó; la caché está
+    suscrita y descarta solo lo leído de esas tablas. Los commits de otro
+    proceso (PRAGMA data_version) publican un DataChanged sin tablas, que
+    lo invalida todo.
+    """
+    def __init__(self, db_name: str = None, pooled: bool = False, max_readers: int = 4,
+                 cache_size: int = 128) -> None:
         self.db_name = db_name or str(DB_PATH)
+        self._pool: Optional[ConnectionPool] = ConnectionPool(self.db_name, max_readers) if pooled else None
+        self._has_fts: Optional[bool] = None
+        self._balance_index: Optional[BalanceIndex] = None
+        self._balance_lock = threading.Lock()
+        self._cache: Optional[QueryCache] = QueryCache(cache_size) if cache_size > 0 else None
+        self._watcher: Optional[sqlite3.Connection] = None
+        self._watch_lock = threading.Lock()
+        self._data_version: Optional[int] = None
+        self._generation = 0
+        self._table_generations: Dict[str, int] = {}
+        self._unknown_generation = 0
+        self.events = EventBus()
+        self.events.subscribe(DataChanged, self._on_data_changed)
         self.init_db()
 
     def connect(self) -> sqlite3.Connection:
         conn = sqlite3.connect(self.db_name)
         return conn
 
-    def init_db(self) -> None:
-        """Inicializa las tablas si no existen y añade índices."""
-        with self.connect() as conn:
-            cursor = conn.cursor()
-
-            # Tabla de Transacciones (Ingresos y Gastos)
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS transacciones (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    tipo TEXT NOT NULL,
-                    categoria TEXT,
-                    monto REAL NOT NULL CHECK(monto >= 0),
-                    fecha TEXT NOT NULL,
-                    descripcion TEXT,
-                    metodo_pago TEXT
-                )
-            ''')
-
-            # Tabla de Configuración de Crédito (Sistema Cashéa)
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS credito_config (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    limite_total REAL DEFAULT 0,
-                    saldo_utilizado REAL DEFAULT 0
-                )
-            ''')
+    def close(self) -> None:
+        """Libera las conexiones persistentes."""
+        if self._pool is not None:
+            self._pool.close()
+        with self._watch_lock:
+            if self._watcher is not None:
+                self._watcher.close()
+                self._watcher = None
+
+    # --- Caché de lecturas ---
+    def cache_stats(self) -> Optional[CacheStats]:
+        """Aciertos, fallos, expulsiones e invalidaciones de la caché (None si está desactivada)."""
+        return self._cache.stats() if self._cache is not None else None
+
+    def clear_cache(self) -> None:
+        """Descarta toda la caché y avisa a los suscriptores de un cambio sin detalle."""
+        self.events.publish(DataChanged())
+
+    def _on_data_changed(self, event: DataChanged) -> None:
+        self._generation += 1
+        if event.unknown:
+            self._unknown_generation += 1
+        for table in event.tables:
+            self._table_generations[table] = self._table_generations.get(table, 0) + 1
+        if self._cache is not None:
+            self._cache.invalidate(None if event.unknown else event.tables)
+
+    def data_generation(self, *tables: str) -> int:
+        """Contador que avanza con cada cambio de datos, propio o de otro proceso.
+
+        Con `tables` solo avanza cuando cambia alguna de ellas (o algo sin
+        detalle, como un commit ajeno). Quien guarde el valor puede saber
+        después si sus datos siguen vigentes.
+        """
+        self._sync_data_version()
+        if not tables:
+            return self._generation
+        return self._unknown_generation + sum(self._table_generations.get(t, 0) for t in set(tables))
+
+    def _read_data_version(self) -> Optional[int]:
+        if self._pool is not None:
+            # En el escritor del pool solo lo mueven commits ajenos
+            return self._pool.data_version()
+        # Sin pool, una conexión vigía propia (también ve los commits de este
+        # proceso; _commit_own los descuenta)
+        with self._watch_lock:
+            return self._watched_version()
+
+    def _watched_version(self) -> int:
+        """PRAGMA data_version de la conexión vigía; quien llama tiene `_watch_lock`."""
+        if self._watcher is None:
+            self._watcher = sqlite3.connect(self.db_name, check_same_thread=False)
+        return self._watcher.execute("PRAGMA data_version").fetchone()[0]
+
+    def _own_write_version(self) -> Optional[int]:
+        """Versión del vigía al abrir una escritura propia (None con pool).
+
+        Se lee tras BEGIN IMMEDIATE: desde ahí nadie más puede confirmar
+        hasta nuestro commit, y los lectores aún no están bloqueados.
+        """
+        if self._pool is not None:
+            return None
+        with self._watch_lock:
+            return self._watched_version()
 
-            # Inicializar crédito si está vacío
-            cursor.execute("SELECT count(*) FROM credito_config")
-            if cursor.fetchone()[0] == 0:
-                cursor.execute("INSERT INTO credito_config (limite_total, saldo_utilizado) VALUES (500, 0)")
+    def _commit_own(self, conn: sqlite3.Connection, before: Optional[int]) -> None:
+        """Confirma una escritura propia sin que el vigía la tome por ajena.
 
-            # Tabla de Metas de Ahorro (Legacy - to be migrated if needed, or kept)
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS metas_ahorro (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    nombre TEXT NOT NULL,
-                    monto_objetivo REAL NOT NULL CHECK(monto_objetivo >= 0),
-                    monto_actual REAL DEFAULT 0
-                )
-            ''')
-
-            # Nueva Tabla: Planes de Ahorro por Objetivos
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS planes_ahorro (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    nombre_plan TEXT NOT NULL,
-                    monto_objetivo REAL NOT NULL,
-                    monto_actual REAL DEFAULT 0,
-                    fecha_limite TEXT,
-                    color_hex TEXT
-                )
-            ''')
+        Si al abrirla no había commits ajenos pendientes (`before` es la
+        versión ya vista), la versión tras el commit se da por vista. Con
+        pendientes no se toca y la siguiente sincronización los recoge.
+        """
+        conn.commit()
+        if before is None:
+            return
+        with self._watch_lock:
+            if before == self._data_version:
+                self._data_version = self._watched_version()
+
+    def _sync_data_version(self) -> None:
+        """Descarta caché e índice de saldos si otra conexión confirmó cambios."""
+        version = self._read_data_version()
+        if version is None or version == self._data_version:
+            return
+        changed = self._data_version is not None
+        self._data_version = version
+        if changed:
+            self.clear_cache()
+            with self._balance_lock:
+                self._balance_index = None
+
+    @contextmanager
+    def _reading(self) -> Iterator[sqlite3.Connection]:
+        """Conexión para consultas de solo lectura."""
+        if self._pool is not None:
+            with self._pool.reader() as conn:
+                yield conn
+            return
+        conn = self.connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
 
-            # Tabla de Presupuestos (Smart Budget)
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS presupuestos (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    categoria TEXT UNIQUE NOT NULL,
-                    monto_limite REAL NOT NULL CHECK(monto_limite >= 0)
-                )
-            ''')
+    @contextmanager
+    def _writer(self) -> Iterator[sqlite3.Connection]:
+        """Conexión de escritura, sin abrir transacción."""
+        if self._pool is not None:
+            with self._pool.writer() as conn:
+                yield conn
+            return
+        conn = self.connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
 
-            # Tabla de Transacciones Recurrentes
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS transacciones_recurrentes (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    nombre TEXT NOT NULL,
-                    monto REAL NOT NULL,
-                    dia_cobro INTEGER NOT NULL,
-                    categoria TEXT,
-                    activo INTEGER DEFAULT 1
-                )
-            ''')
+    @contextmanager
+    def _writing(self, flows: Optional[List[Tuple[str, int]]] = None,
+                 changes: Optional[ChangeSet] = None) -> Iterator[sqlite3.Connection]:
+        """Conexión dentro de una transacción BEGIN IMMEDIATE.
+
+        Confirma al salir sin errores y revierte ante cualquier excepción.
+        Si el bloque anota en `flows` los (fecha, delta_centavos) que aplicó
+        al saldo, el índice de saldos se actualiza en sitio; sin `flows` se
+        descarta y se reconstruye en la siguiente consulta. El commit y el
+        parche van bajo el mismo cerrojo que la reconstrucción del índice,
+        así que nadie lo reconstruye con el commit visible y luego recibe
+        el mismo delta otra vez. Las fechas se validan antes del commit:
+        con alguna ilegible el índice se descarta en lugar de fallar una
+        escritura ya confirmada.
+        Lo anotado en `changes` se publica tras el commit (nada si quedó
+        vacío); sin `changes` se publica un cambio sin detalle.
+        """
+        with self._writer() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            before = self._own_write_version()
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            parsed = self._parse_flows(flows)
+            with self._balance_lock:
+                self._commit_own(conn, before)
+                self._apply_flows(parsed)
+        if changes is None:
+            self.clear_cache()
+        elif changes:
+            self.events.publish(changes.event())
 
-            # Índices para consultas frecuentes
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_transacciones_fecha ON transacciones(fecha)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_transacciones_tipo ON transacciones(tipo)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_transacciones_categoria ON transacciones(categoria)")
+    def init_db(self) -> None:
+        """Aplica las migraciones pendientes del esquema.
 
-            conn.commit()
+        Con el esquema al día solo se lee PRAGMA user_version.
+        """
+        with self._writer() as conn:
+            apply_migrations(conn)
+
+    @property
+    def has_fts(self) -> bool:
+        """Indica si existe el índice FTS5 (se comprueba una vez, al primer uso)."""
+        if self._has_fts is None:
+            with self._reading() as conn:
+                row = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='transacciones_fts'").fetchone()
+            self._has_fts = row is not None
+        return self._has_fts
+
+    @staticmethod
+    def _flow_delta(tipo: str, cents: int) -> int:
+        """Efecto de una transacción sobre el saldo (igual que flujo_diario)."""
+        if tipo == "Ingreso":
+            return cents
+        if tipo == "Gasto":
+            return -cents
+        return 0
+
+    @staticmethod
+    def _parse_flows(flows: Optional[List[Tuple[str, int]]]) -> Optional[List[Tuple[date, int]]]:
+        """Flujos con la fecha ya convertida; None si alguna no es ISO."""
+        if flows is None:
+            return None
+        try:
+            return [(date.fromisoformat(fecha[:10]), delta) for fecha, delta in flows if delta]
+        except (TypeError, ValueError):
+            return None
+
+    def _apply_flows(self, flows: Optional[List[Tuple[date, int]]]) -> None:
+        """Parchea el índice de saldos; quien llama tiene `_balance_lock`."""
+        index = self._balance_index
+        if index is None:
+            return
+        if flows is None or not all(index.add(fecha, delta) for fecha, delta in flows):
+            self._balance_index = None
+
+    def _get_balance_index(self) -> BalanceIndex:
+        self._sync_data_version()
+        with self._balance_lock:
+            if self._balance_index is None:
+                with self._reading() as conn:
+                    rows = conn.execute("SELECT fecha, neto FROM flujo_diario WHERE neto != 0").fetchall()
+                self._balance_index = BalanceIndex(rows)
+            return self._balance_index
+
+    def rebuild_monthly_summary(self) -> None:
+        """Recalcula `resumen_mensual` desde cero (reparación)."""
+        with self._writing(changes=ChangeSet().touch(["resumen_mensual"])) as conn:
+            rebuild_monthly_summary(conn.cursor())
 
     # --- Métodos CRUD ---
     def add_transaction(self, tipo: str, categoria: str, monto: float, fecha: str, descripcion: str, metodo: str) -> int:
@@ -112,84 +353,256 @@ class DatabaseManager:
         """
         if monto < 0:
             raise ValueError("El monto debe ser no negativo")
+        cents = to_cents(monto)
 
-        conn = self.connect()
-        try:
-            conn.execute("BEGIN IMMEDIATE")
+        changes = ChangeSet()
+        with self._writing([(fecha, self._flow_delta(tipo, cents))], changes) as conn:
             cursor = conn.cursor()
 
             cursor.execute('''
                 INSERT INTO transacciones (tipo, categoria, monto, fecha, descripcion, metodo_pago)
                 VALUES (?, ?, ?, ?, ?, ?)
-            ''', (tipo, categoria, monto, fecha, descripcion, metodo))
-
-            if metodo == "CreditoInterno" and tipo == "Gasto":
-                cursor.execute("SELECT limite_total, saldo_utilizado FROM credito_config LIMIT 1")
-                row = cursor.fetchone()
-                if row is None:
-                    raise sqlite3.Error("Configuración de crédito no disponible")
-                limite, usado = row
-                if usado + monto > limite:
-                    raise ValueError("Límite de crédito excedido")
-                cursor.execute("UPDATE credito_config SET saldo_utilizado = ?", (usado + monto,))
-            elif tipo == "PagoCredito":
-                cursor.execute("SELECT saldo_utilizado FROM credito_config LIMIT 1")
-                row = cursor.fetchone()
-                if row is None:
-                    raise sqlite3.Error("Configuración de crédito no disponible")
-                usado = row[0]
-                nuevo = max(0, usado - monto)
-                cursor.execute("UPDATE credito_config SET saldo_utilizado = ?", (nuevo,))
-
-            conn.commit()
-            return cursor.lastrowid
-        except sqlite3.Error:
-            conn.rollback()
-            raise
-        except Exception as e:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+            ''', (tipo, categoria, cents, fecha, descripcion, metodo))
+            tx_id = cursor.lastrowid
+            changes.touch(TX_TABLES, [tx_id], [fecha])
+
+            if (metodo == "CreditoInterno" and tipo == "Gasto") or tipo == "PagoCredito":
+                limite = self._credit_limit(cursor)
+                usado = credit_ledger.current_balance(cursor)
+                delta = credit_ledger.credit_delta(tipo, metodo, cents, usado)
+                if delta > 0 and usado + delta > limite:
+                    raise CreditLimitExceeded("Límite de crédito excedido")
+                credit_ledger.record(cursor, [(tx_id, "cargo" if delta > 0 else "pago", delta)])
+                changes.touch(CREDIT_TABLES)
+
+            return tx_id
+
+    def add_transactions_bulk(self, rows: Iterable[tuple]) -> List[int]:
+        """Inserta muchas transacciones en una sola transacción BEGIN IMMEDIATE.
+
+        Cada fila sigue el orden de `add_transaction`:
+        (tipo, categoria, monto, fecha, descripcion, metodo); el monto se
+        convierte a centavos antes de validar el crédito.
+        El crédito se valida fila a fila en el orden recibido, pero el
+        saldo se lee una única vez y los movimientos se añaden en bloque.
+        Devuelve los ids asignados, en el mismo orden. Si alguna fila
+        supera el límite se revierte todo y se lanza CreditLimitExceeded
+        con el índice de esa fila.
+        """
+        rows = [tuple(r) for r in rows]
+        if not rows:
+            return []
+
+        for i, row in enumerate(rows):
+            if len(row) != 6:
+                raise ValueError(f"Fila {i}: se esperaban 6 campos, se recibieron {len(row)}")
+            if row[2] < 0:
+                raise ValueError(f"Fila {i}: el monto debe ser no negativo")
+        rows = [(t, c, to_cents(m), f, d, mp) for t, c, m, f, d, mp in rows]
+        flows = [(f, self._flow_delta(t, m)) for t, _c, m, f, _d, _mp in rows]
+        changes = ChangeSet()
+
+        with self._writing(flows, changes) as conn:
+            cursor = conn.cursor()
+
+            deltas: List[Tuple[int, int]] = []  # (índice de fila, delta)
+            if any((r[0] == "Gasto" and r[5] == "CreditoInterno") or r[0] == "PagoCredito" for r in rows):
+                limite = self._credit_limit(cursor)
+                usado = credit_ledger.current_balance(cursor)
+                for i, (tipo, _cat, monto, _fecha, _desc, metodo) in enumerate(rows):
+                    delta = credit_ledger.credit_delta(tipo, metodo, monto, usado)
+                    if delta > 0 and usado + delta > limite:
+                        raise CreditLimitExceeded(f"Límite de crédito excedido en la fila {i}", row_index=i)
+                    if delta:
+                        usado += delta
+                        deltas.append((i, delta))
+
+            cursor.executemany('''
+                INSERT INTO transacciones (tipo, categoria, monto, fecha, descripcion, metodo_pago)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', rows)
+
+            # Con BEGIN IMMEDIATE y AUTOINCREMENT los ids del lote son consecutivos
+            last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+            ids = list(range(last_id - len(rows) + 1, last_id + 1))
+            credit_ledger.record(cursor, [(ids[i], "cargo" if d > 0 else "pago", d) for i, d in deltas])
+            changes.touch(TX_TABLES, ids, [r[3] for r in rows])
+            if deltas:
+                changes.touch(CREDIT_TABLES)
+            return ids
 
     def get_transactions(self, limit: int = 50) -> List[tuple]:
-        with self.connect() as conn:
+        with self._reading() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM transacciones ORDER BY fecha DESC, id DESC LIMIT ?", (limit,))
+            cursor.execute(f"SELECT {TX_COLUMNS} FROM transacciones ORDER BY fecha DESC, id DESC LIMIT ?", (limit,))
             return cursor.fetchall()
 
+    def get_transaction(self, tx_id: int) -> Optional[tuple]:
+        with self._reading() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {TX_COLUMNS} FROM transacciones WHERE id = ?", (tx_id,))
+            return cursor.fetchone()
+
+    @staticmethod
+    def _fts_query(text: str) -> str:
+        """Convierte texto libre en una consulta FTS5 de prefijos: 'net sup' -> '"net"* "sup"*'."""
+        terms = [t.replace('"', '') for t in text.split()]
+        return " ".join(f'"{t}"*' for t in terms if t)
+
+    @staticmethod
+    def _like_escape(text: str) -> str:
+        """Escapa los comodines de LIKE para buscar `text` literal (con ESCAPE '\\')."""
+        return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    def search_transactions(self, query: str, limit: int = 50,
+                            cursor: Optional[int] = None) -> Tuple[List[tuple], Optional[int]]:
+        """Búsqueda de texto completo en descripción y categoría.
+
+        Cada palabra se busca como prefijo y todas las coincidencias se
+        ordenan por relevancia BM25 (`rank` de FTS5); FTS5 pagina sobre
+        el conjunto completo y solo se cruzan con `transacciones` las
+        filas de la página. Sin FTS se usa LIKE con los comodines del
+        usuario escapados. Devuelve (filas, siguiente_cursor); el cursor
+        es None cuando no hay más.
+        """
+        offset = cursor or 0
+        with self._reading() as conn:
+            cur = conn.cursor()
+            if self.has_fts:
+                match = self._fts_query(query)
+                if not match:
+                    return [], None
+                cur.execute(f'''
+                    SELECT {_tx_columns("t")} FROM (
+                        SELECT rowid AS id, rank AS score
+                        FROM transacciones_fts WHERE transacciones_fts MATCH ?
+                        ORDER BY rank, rowid DESC LIMIT ? OFFSET ?
+                    ) f
+                    JOIN transacciones t ON t.id = f.id
+                    ORDER BY f.score, t.id DESC
+                ''', (match, limit + 1, offset))
+            else:
+                terms = query.split()
+                if not terms:
+                    return [], None
+                where = " AND ".join("(descripcion LIKE ? ESCAPE '\\' OR categoria LIKE ? ESCAPE '\\')"
+                                     for _ in terms)
+                patterns = [f"%{self._like_escape(t)}%" for t in terms]
+                params = [p for pattern in patterns for p in (pattern, pattern)]
+                cur.execute(f'''
+                    SELECT {TX_COLUMNS} FROM transacciones WHERE {where}
+                    ORDER BY fecha DESC, id DESC LIMIT ? OFFSET ?
+                ''', (*params, limit + 1, offset))
+            rows = cur.fetchall()
+        if len(rows) > limit:
+            return rows[:limit], offset + limit
+        return rows, None
+
+    def get_transactions_page(self, cursor: Optional[Tuple[str, int]] = None, limit: int = 100,
+                              backward: bool = False) -> List[tuple]:
+        """Paginación por clave (keyset) sobre (fecha, id), de más reciente a más antigua.
+
+        `cursor` es la clave (fecha, id) de una fila ya mostrada. Hacia
+        adelante devuelve las filas más antiguas que el cursor; con
+        `backward=True` las más recientes (ya en orden descendente).
+        Sin cursor devuelve la primera página. El coste no depende de
+        la profundidad de la página.
+        """
+        with self._reading() as conn:
+            cur = conn.cursor()
+            if cursor is None:
+                cur.execute(f"SELECT {TX_COLUMNS} FROM transacciones ORDER BY fecha DESC, id DESC LIMIT ?", (limit,))
+                return cur.fetchall()
+            fecha, tx_id = cursor
+            if not backward:
+                cur.execute(f'''
+                    SELECT {TX_COLUMNS} FROM transacciones WHERE (fecha, id) < (?, ?)
+                    ORDER BY fecha DESC, id DESC LIMIT ?
+                ''', (fecha, tx_id, limit))
+                return cur.fetchall()
+            cur.execute(f'''
+                SELECT {TX_COLUMNS} FROM transacciones WHERE (fecha, id) > (?, ?)
+                ORDER BY fecha ASC, id ASC LIMIT ?
+            ''', (fecha, tx_id, limit))
+            return cur.fetchall()[::-1]
+
     def delete_transaction(self, tx_id: int) -> None:
         """Elimina una transacción y revierte su impacto en el crédito si aplica."""
-        conn = self.connect()
-        try:
-            conn.execute("BEGIN IMMEDIATE")
+        flows: List[Tuple[str, int]] = []
+        changes = ChangeSet()
+        with self._writing(flows, changes) as conn:
             cursor = conn.cursor()
 
             # 1. Obtener detalles de la transacción antes de borrar
-            cursor.execute("SELECT tipo, monto, metodo_pago FROM transacciones WHERE id = ?", (tx_id,))
+            cursor.execute("SELECT tipo, monto, metodo_pago, fecha FROM transacciones WHERE id = ?", (tx_id,))
             row = cursor.fetchone()
             if not row:
                 return
 
-            tipo, monto, metodo = row
+            tipo, monto, metodo, fecha = row
+            flows.append((fecha, -self._flow_delta(tipo, monto)))
 
-            # 2. Revertir impacto en crédito
-            if metodo == "CreditoInterno" and tipo == "Gasto":
-                # Devolver al saldo disponible (restar de usado)
-                cursor.execute("UPDATE credito_config SET saldo_utilizado = saldo_utilizado - ?", (monto,))
-            elif tipo == "PagoCredito":
-                # Volver a aumentar la deuda
-                cursor.execute("UPDATE credito_config SET saldo_utilizado = saldo_utilizado + ?", (monto,))
+            # 2. Revertir exactamente lo que registró en el libro de crédito
+            # (un pago recortado en cero solo devuelve lo que realmente restó)
+            applied = credit_ledger.recorded_for(cursor, tx_id)
+            if applied:
+                credit_ledger.record(cursor, [(tx_id, "reverso", -applied)])
+                changes.touch(CREDIT_TABLES)
 
             # 3. Borrar la transacción
             cursor.execute("DELETE FROM transacciones WHERE id = ?", (tx_id,))
-            
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+
+            # 4. Los pagos posteriores pudieron quedar recortados de otra forma
+            if applied:
+                credit_ledger.realign(cursor)
+            changes.touch(TX_TABLES, [tx_id], [fecha])
+
+    @staticmethod
+    def _transaction_filters(start: Optional[str], end: Optional[str], categoria: Optional[str],
+                             tipo: Optional[str]) -> Tuple[str, tuple]:
+        """Construye el WHERE para filtros opcionales; el rango de fechas es [start, end)."""
+        clauses, params = [], []
+        if start:
+            clauses.append("fecha >= ?")
+            params.append(start)
+        if end:
+            clauses.append("fecha < ?")
+            params.append(end)
+        if categoria:
+            clauses.append("categoria = ?")
+            params.append(categoria)
+        if tipo:
+            clauses.append("tipo = ?")
+            params.append(tipo)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, tuple(params)
+
+    @_cached_read("transacciones")
+    def count_transactions(self, start: Optional[str] = None, end: Optional[str] = None,
+                           categoria: Optional[str] = None, tipo: Optional[str] = None) -> int:
+        where, params = self._transaction_filters(start, end, categoria, tipo)
+        with self._reading() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT COUNT(*) FROM transacciones {where}", params)
+            return cursor.fetchone()[0]
+
+    def iter_transactions(self, start: Optional[str] = None, end: Optional[str] = None,
+                          categoria: Optional[str] = None, tipo: Optional[str] = None,
+                          chunk_size: int = 1000) -> Iterator[List[tuple]]:
+        """Recorre las transacciones filtradas en bloques de `chunk_size` (fetchmany).
+
+        La memoria usada es constante respecto al total de filas. La
+        conexión permanece ocupada hasta agotar o cerrar el generador.
+        """
+        where, params = self._transaction_filters(start, end, categoria, tipo)
+        with self._reading() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {TX_COLUMNS} FROM transacciones {where} ORDER BY fecha DESC, id DESC", params)
+            while True:
+                chunk = cursor.fetchmany(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
 
     def get_recent_transactions(self, days: int = 90) -> List[tuple]:
         """Obtiene transacciones de los últimos 'days' días."""
@@ -198,130 +611,254 @@ class DatabaseManager:
         # Calculate cutoff date
         cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
         
-        with self.connect() as conn:
+        with self._reading() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM transacciones WHERE fecha >= ? ORDER BY fecha ASC", (cutoff,))
+            cursor.execute(f"SELECT {TX_COLUMNS} FROM transacciones WHERE fecha >= ? ORDER BY fecha ASC", (cutoff,))
             return cursor.fetchall()
 
+    @_cached_read("resumen_mensual", "transacciones")
     def get_summary(self) -> Tuple[float, float]:
-        with self.connect() as conn:
+        ingresos, gastos = self.get_totals_cents()
+        return ingresos / 100, gastos / 100
+
+    @_cached_read("resumen_mensual", "transacciones")
+    def get_totals_cents(self, start: Optional[str] = None, end: Optional[str] = None) -> Tuple[int, int]:
+        """(ingresos, gastos) exactos en centavos dentro de [start, end).
+
+        Sin rango se leen de `resumen_mensual`; con rango se suma sobre
+        `transacciones` (SUM de INTEGER es exacto en SQLite).
+        """
+        with self._reading() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT SUM(monto) FROM transacciones WHERE tipo='Ingreso'")
-            ingresos = cursor.fetchone()[0] or 0.0
-            cursor.execute("SELECT SUM(monto) FROM transacciones WHERE tipo='Gasto'")
-            gastos = cursor.fetchone()[0] or 0.0
+            if start is None and end is None:
+                cursor.execute('''
+                    SELECT IFNULL(SUM(CASE WHEN tipo='Ingreso' THEN total END), 0),
+                           IFNULL(SUM(CASE WHEN tipo='Gasto' THEN total END), 0)
+                    FROM resumen_mensual
+                ''')
+            else:
+                where, params = self._transaction_filters(start, end, None, None)
+                cursor.execute(f'''
+                    SELECT IFNULL(SUM(CASE WHEN tipo='Ingreso' THEN monto END), 0),
+                           IFNULL(SUM(CASE WHEN tipo='Gasto' THEN monto END), 0)
+                    FROM transacciones {where}
+                ''', params)
+            ingresos, gastos = cursor.fetchone()
             return ingresos, gastos
 
+    @_cached_read("transacciones")
+    def get_totals_by_period(self, start: Optional[str] = None, end: Optional[str] = None,
+                             bucket: str = "day", tipo: str = "Gasto") -> List[Tuple[str, int]]:
+        """[(periodo, total_centavos), ...] de `tipo` en [start, end), agrupado en SQLite.
+
+        `bucket` es 'day' (YYYY-MM-DD), 'week' (lunes de la semana, YYYY-MM-DD)
+        o 'month' (YYYY-MM). Solo aparecen los periodos con movimientos.
+        """
+        if bucket not in PERIOD_BUCKETS:
+            raise ValueError(f"Agrupación no válida: {bucket}")
+        where, params = self._transaction_filters(start, end, None, tipo)
+        with self._reading() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT {PERIOD_BUCKETS[bucket]} AS periodo, SUM(monto)
+                FROM transacciones {where}
+                GROUP BY periodo ORDER BY periodo
+            ''', params)
+            return cursor.fetchall()
+
+    @_cached_read("resumen_mensual")
+    def get_monthly_totals_cents(self) -> List[Tuple[str, int, int]]:
+        """[(mes 'YYYY-MM', ingresos, gastos), ...] en centavos, en orden cronológico."""
+        with self._reading() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT mes,
+                       IFNULL(SUM(CASE WHEN tipo='Ingreso' THEN total END), 0),
+                       IFNULL(SUM(CASE WHEN tipo='Gasto' THEN total END), 0)
+                FROM resumen_mensual GROUP BY mes ORDER BY mes
+            ''')
+            return cursor.fetchall()
+
+    # --- Saldos por fecha ---
+    def balance_at(self, day: Union[str, date]) -> float:
+        """Saldo (ingresos - gastos acumulados) al cierre de `day`."""
+        return self._get_balance_index().balance_at(day) / 100
+
+    def net_flow(self, start: Union[str, date], end: Union[str, date]) -> float:
+        """Ingresos menos gastos en el rango semiabierto [start, end)."""
+        return self._get_balance_index().net_flow(start, end) / 100
+
+    def balance_series(self, start: Union[str, date], end: Union[str, date],
+                       step: int = 1) -> List[Tuple[str, float]]:
+        """[(fecha, saldo), ...] cada `step` días desde `start` hasta `end` inclusive."""
+        return [(fecha, cents / 100) for fecha, cents in self._get_balance_index().series(start, end, step)]
+
+    @staticmethod
+    def _credit_limit(cursor: sqlite3.Cursor) -> int:
+        cursor.execute("SELECT limite_total FROM credito_config LIMIT 1")
+        row = cursor.fetchone()
+        if row is None:
+            raise sqlite3.Error("Configuración de crédito no disponible")
+        return row[0]
+
+    @_cached_read(*CREDIT_TABLES)
     def get_credit_info(self) -> Optional[Tuple[float, float]]:
-        with self.connect() as conn:
+        """(límite, usado); el usado sale del libro de movimientos."""
+        with self._reading() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT limite_total, saldo_utilizado FROM credito_config LIMIT 1")
-            return cursor.fetchone()
+            cursor.execute("SELECT limite_total FROM credito_config LIMIT 1")
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            return row[0] / 100, credit_ledger.current_balance(cursor) / 100
+
+    def reconcile(self, fix: bool = False) -> CreditReconciliation:
+        """Recalcula el saldo de crédito desde `transacciones` y lo compara con el libro.
+
+        Con `fix=True` lleva el efecto de cada transacción al reproducido
+        (ver credit_ledger.realign) y añade un movimiento de ajuste por lo
+        que quede, para que el saldo registrado coincida con el recalculado.
+        """
+        changes = ChangeSet()
+        with self._writing(changes=changes) if fix else self._reading() as conn:
+            cursor = conn.cursor()
+            expected, applied = credit_ledger.replay(cursor)
+            recorded = credit_ledger.current_balance(cursor)
+            by_tx = credit_ledger.recorded_by_transaction(cursor)
+            cursor.execute("SELECT IFNULL(SUM(delta), 0) FROM credito_movimientos WHERE transaccion_id IS NULL")
+            adjustments = cursor.fetchone()[0]
+
+            mismatched = []
+            for tx_id, delta in applied:
+                got = by_tx.pop(tx_id, 0)
+                if got != delta:
+                    mismatched.append((tx_id, delta / 100, got / 100))
+            # Transacciones ya borradas cuyo reverso no dejó el efecto en cero
+            mismatched.extend((tx_id, 0.0, got / 100) for tx_id, got in sorted(by_tx.items()) if got)
+
+            difference = recorded - expected
+            if fix and (difference or mismatched):
+                # Primero cada transacción a su efecto reproducido; el resto, como ajuste
+                credit_ledger.realign(cursor)
+                remaining = credit_ledger.current_balance(cursor) - expected
+                credit_ledger.record(cursor, [(None, "ajuste", -remaining)])
+                changes.touch(CREDIT_TABLES)
+        return CreditReconciliation(expected / 100, recorded / 100, difference / 100, adjustments / 100, mismatched)
 
     def update_credit_limit(self, new_limit: float) -> None:
-        with self.connect() as conn:
+        with self._writing(changes=ChangeSet().touch(["credito_config"])) as conn:
             cursor = conn.cursor()
-            cursor.execute("UPDATE credito_config SET limite_total = ?", (new_limit,))
-            conn.commit()
+            cursor.execute("UPDATE credito_config SET limite_total = ?", (to_cents(new_limit),))
 
     def update_credit_usage(self, amount: float, add: bool = True) -> None:
-        # Mantener para compatibilidad, pero preferir add_transaction_atomic
-        with self.connect() as conn:
+        # Mantener para compatibilidad, pero preferir add_transaction_atomic.
+        # Queda en el libro como ajuste manual (sin transacción asociada).
+        with self._writing(changes=ChangeSet().touch(CREDIT_TABLES)) as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT saldo_utilizado FROM credito_config LIMIT 1")
-            row = cursor.fetchone()
-            saldo_actual = row[0] if row is not None else 0
-            if add:
-                new_saldo = saldo_actual + amount
-            else:
-                new_saldo = max(0, saldo_actual - amount)
-            cursor.execute("UPDATE credito_config SET saldo_utilizado = ?", (new_saldo,))
-            conn.commit()
+            cents = to_cents(amount)
+            delta = cents if add else -min(cents, credit_ledger.current_balance(cursor))
+            credit_ledger.record(cursor, [(None, "ajuste", delta)])
 
+    @_cached_read("resumen_mensual")
     def get_expenses_by_category(self) -> List[tuple]:
-        with self.connect() as conn:
+        with self._reading() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT categoria, SUM(monto) FROM transacciones WHERE tipo='Gasto' GROUP BY categoria")
+            cursor.execute('''
+                SELECT NULLIF(categoria, ''), SUM(total) / 100.0 FROM resumen_mensual
+                WHERE tipo='Gasto' GROUP BY categoria
+            ''')
             return cursor.fetchall()
 
     def add_savings_goal(self, nombre: str, objetivo: float) -> None:
-        with self.connect() as conn:
+        changes = ChangeSet()
+        with self._writing(changes=changes) as conn:
             cursor = conn.cursor()
-            cursor.execute("INSERT INTO metas_ahorro (nombre, monto_objetivo) VALUES (?, ?)", (nombre, objetivo))
-            conn.commit()
+            cursor.execute("INSERT INTO metas_ahorro (nombre, monto_objetivo) VALUES (?, ?)", (nombre, to_cents(objetivo)))
+            changes.touch(["metas_ahorro"], [cursor.lastrowid])
 
+    @_cached_read("metas_ahorro")
     def get_savings_goals(self) -> List[tuple]:
-        with self.connect() as conn:
+        with self._reading() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM metas_ahorro")
+            cursor.execute(f"SELECT {GOAL_COLUMNS} FROM metas_ahorro")
             return cursor.fetchall()
 
     def update_savings_progress(self, id_meta: int, monto: float) -> None:
-        with self.connect() as conn:
+        with self._writing(changes=ChangeSet().touch(["metas_ahorro"], [id_meta])) as conn:
             cursor = conn.cursor()
-            cursor.execute("UPDATE metas_ahorro SET monto_actual = monto_actual + ? WHERE id = ?", (monto, id_meta))
-            conn.commit()
+            cursor.execute("UPDATE metas_ahorro SET monto_actual = monto_actual + ? WHERE id = ?", (to_cents(monto), id_meta))
 
     def update_budget(self, categoria: str, monto: float) -> None:
-        with self.connect() as conn:
+        with self._writing(changes=ChangeSet().touch(["presupuestos"])) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO presupuestos (categoria, monto_limite) VALUES (?, ?)
                 ON CONFLICT(categoria) DO UPDATE SET monto_limite = excluded.monto_limite
-            ''', (categoria, monto))
-            conn.commit()
+            ''', (categoria, to_cents(monto)))
 
     def get_budget_comparison(self) -> List[tuple]:
-        """Devuelve [(categoria, gasto_actual, limite), ...]"""
-        # Calcular gasto del mes actual (simplificado: todo gasto histórico por ahora o filtrar por fecha string YYYY-MM)
-        # Nota: Para ser precisos con "Mes Actual", necesitaríamos parsear la fecha.
-        # Dado el formato de fecha 'YYYY-MM-DD', podemos filtrar con LIKE 'YYYY-MM%'
+        """Devuelve [(categoria, gasto_actual, limite), ...] para el mes actual."""
         from datetime import datetime
         current_month = datetime.now().strftime("%Y-%m")
 
-        with self.connect() as conn:
-            cursor = conn.cursor()
-            
-            # 1. Obtener todos los presupuestos
-            cursor.execute("SELECT categoria, monto_limite FROM presupuestos")
-            budgets = cursor.fetchall() # [(cat, limit), ...]
-            
-            results = []
-            for cat, limit in budgets:
-                # 2. Calcular gasto para esta categoría en el mes actual
-                cursor.execute("""
-                    SELECT SUM(monto) FROM transacciones 
-                    WHERE tipo='Gasto' AND categoria=? AND fecha LIKE ?
-                """, (cat, f"{current_month}%"))
-                spent = cursor.fetchone()[0] or 0.0
-                results.append((cat, spent, limit))
-                
-            return results
+        with self._reading() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT p.categoria, IFNULL(SUM(r.total), 0) / 100.0, p.monto_limite / 100.0
+                FROM presupuestos p
+                LEFT JOIN resumen_mensual r
+                    ON r.mes = ? AND r.tipo = 'Gasto' AND r.categoria = p.categoria
+                GROUP BY p.id
+                ORDER BY p.id
+            ''', (current_month,))
+            return cursor.fetchall()
+
+    @_cached_read("presupuestos", "transacciones")
+    def get_budget_spending(self, start: str, end: str) -> List[tuple]:
+        """Devuelve [(categoria, limite_mensual, gastado), ...] en [start, end).
+
+        Una sola consulta agrupada; cada presupuesto se resuelve con una
+        búsqueda por rango sobre idx_transacciones_tipo_cat_fecha.
+        """
+        with self._reading() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT p.categoria, p.monto_limite / 100.0, IFNULL(SUM(t.monto), 0) / 100.0
+                FROM presupuestos p
+                LEFT JOIN transacciones t
+                    ON t.tipo = 'Gasto' AND t.categoria = p.categoria
+                   AND t.fecha >= ? AND t.fecha < ?
+                GROUP BY p.id
+                ORDER BY p.id
+            ''', (start, end))
+            return cursor.fetchall()
 
     # --- Planes de Ahorro (New System) ---
     def create_plan(self, nombre: str, objetivo: float, fecha: str, color: str) -> None:
-        with self.connect() as conn:
+        changes = ChangeSet()
+        with self._writing(changes=changes) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO planes_ahorro (nombre_plan, monto_objetivo, monto_actual, fecha_limite, color_hex)
                 VALUES (?, ?, 0, ?, ?)
-            ''', (nombre, objetivo, fecha, color))
-            conn.commit()
+            ''', (nombre, to_cents(objetivo), fecha, color))
+            changes.touch(["planes_ahorro"], [cursor.lastrowid])
 
+    @_cached_read("planes_ahorro")
     def get_plans(self) -> List[tuple]:
-        with self.connect() as conn:
+        with self._reading() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM planes_ahorro ORDER BY id DESC")
+            cursor.execute(f"SELECT {PLAN_COLUMNS} FROM planes_ahorro ORDER BY id DESC")
             return cursor.fetchall()
 
     def deposit_to_plan(self, plan_id: int, amount: float) -> None:
         """Atomic deposit: Add Expense Transaction AND Update Plan Balance."""
         from datetime import datetime
         date_str = datetime.now().strftime("%Y-%m-%d")
-        
-        conn = self.connect()
-        try:
-            conn.execute("BEGIN IMMEDIATE")
+        cents = to_cents(amount)
+
+        changes = ChangeSet()
+        with self._writing([(date_str, -cents)], changes) as conn:
             cursor = conn.cursor()
 
             # 1. Obtener nombre del plan para la descripción
@@ -335,42 +872,113 @@ class DatabaseManager:
             cursor.execute('''
                 INSERT INTO transacciones (tipo, categoria, monto, fecha, descripcion, metodo_pago)
                 VALUES (?, ?, ?, ?, ?, ?)
-            ''', ("Gasto", "Ahorro/Plan", amount, date_str, f"Aporte a {plan_name}", "Efectivo"))
+            ''', ("Gasto", "Ahorro/Plan", cents, date_str, f"Aporte a {plan_name}", "Efectivo"))
 
-            # 3. Actualizar Saldo del Plan
-            cursor.execute("UPDATE planes_ahorro SET monto_actual = monto_actual + ? WHERE id = ?", (amount, plan_id))
+            tx_id = cursor.lastrowid
 
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+            # 3. Actualizar Saldo del Plan
+            cursor.execute("UPDATE planes_ahorro SET monto_actual = monto_actual + ? WHERE id = ?", (cents, plan_id))
+            changes.touch(TX_TABLES, [tx_id], [date_str]).touch(["planes_ahorro"], [plan_id])
 
     def delete_plan(self, plan_id: int) -> None:
-        with self.connect() as conn:
+        with self._writing(changes=ChangeSet().touch(["planes_ahorro"], [plan_id])) as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM planes_ahorro WHERE id = ?", (plan_id,))
-            conn.commit()
 
     # --- Recurring Transactions ---
-    def add_recurring(self, nombre: str, monto: float, dia: int, categoria: str) -> None:
-        with self.connect() as conn:
+    def add_recurring(self, nombre: str, monto: float, dia: int, categoria: str, inicio: Optional[str] = None) -> None:
+        """Alta de un cargo recurrente; se cobra desde `inicio` (hoy por defecto)."""
+        from datetime import datetime
+        inicio = inicio or datetime.now().strftime("%Y-%m-%d")
+        changes = ChangeSet()
+        with self._writing(changes=changes) as conn:
             cursor = conn.cursor()
             cursor.execute('''
-                INSERT INTO transacciones_recurrentes (nombre, monto, dia_cobro, categoria)
-                VALUES (?, ?, ?, ?)
-            ''', (nombre, monto, dia, categoria))
-            conn.commit()
+                INSERT INTO transacciones_recurrentes (nombre, monto, dia_cobro, categoria, inicio)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (nombre, to_cents(monto), dia, categoria, inicio))
+            changes.touch(["transacciones_recurrentes"], [cursor.lastrowid])
 
+    @_cached_read("transacciones_recurrentes")
     def get_recurring(self) -> List[tuple]:
-        with self.connect() as conn:
+        with self._reading() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM transacciones_recurrentes WHERE activo=1 ORDER BY dia_cobro")
+            cursor.execute(f"SELECT {RECURRING_COLUMNS} FROM transacciones_recurrentes WHERE activo=1 ORDER BY dia_cobro")
+            return cursor.fetchall()
+
+    def get_recurring_schedule(self) -> List[tuple]:
+        """[(id, nombre, monto, dia_cobro, categoria, inicio, ultimo_periodo), ...] de los activos.
+
+        `ultimo_periodo` ('YYYY-MM') es el último mes ya registrado, o None.
+        """
+        with self._reading() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT r.id, r.nombre, r.monto / 100.0, r.dia_cobro, r.categoria, r.inicio,
+                       (SELECT MAX(c.periodo) FROM cargos_recurrentes c WHERE c.recurrente_id = r.id)
+                FROM transacciones_recurrentes r
+                WHERE r.activo = 1
+                ORDER BY r.id
+            ''')
             return cursor.fetchall()
 
+    def get_recurring_posted_ids(self, start: str) -> List[int]:
+        """Ids de las transacciones generadas por cargos recurrentes con fecha >= start."""
+        with self._reading() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT c.transaccion_id FROM cargos_recurrentes c
+                JOIN transacciones t ON t.id = c.transaccion_id
+                WHERE t.fecha >= ?
+            ''', (start,))
+            return [row[0] for row in cursor.fetchall()]
+
+    def post_recurring(self, charges: Iterable[tuple]) -> List[int]:
+        """Registra cargos recurrentes como gastos en una sola transacción.
+
+        Cada cargo es (recurrente_id, periodo, categoria, monto, fecha, descripcion).
+        Los (recurrente_id, periodo) ya registrados se omiten, así que repetir
+        la llamada no duplica nada. Devuelve los ids de las transacciones nuevas.
+        """
+        charges = [tuple(c) for c in charges]
+        if not charges:
+            return []
+        flows: List[Tuple[str, int]] = []
+        changes = ChangeSet()
+        with self._writing(flows, changes) as conn:
+            cursor = conn.cursor()
+            # Releer bajo BEGIN IMMEDIATE: otra instancia pudo registrarlos mientras tanto
+            rids = sorted({c[0] for c in charges})
+            posted = set()
+            for i in range(0, len(rids), 500):
+                chunk = rids[i:i + 500]
+                cursor.execute(f'''
+                    SELECT recurrente_id, periodo FROM cargos_recurrentes
+                    WHERE recurrente_id IN ({", ".join("?" * len(chunk))})
+                ''', chunk)
+                posted.update(cursor.fetchall())
+
+            pending = []
+            for rid, periodo, categoria, monto, fecha, descripcion in charges:
+                if (rid, periodo) not in posted:
+                    posted.add((rid, periodo))
+                    pending.append((rid, periodo, categoria, to_cents(monto), fecha, descripcion))
+            if not pending:
+                return []
+
+            cursor.executemany('''
+                INSERT INTO transacciones (tipo, categoria, monto, fecha, descripcion, metodo_pago)
+                VALUES ('Gasto', ?, ?, ?, ?, ?)
+            ''', [(categoria, cents, fecha, desc, RECURRING_METHOD) for _r, _p, categoria, cents, fecha, desc in pending])
+            last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+            ids = list(range(last_id - len(pending) + 1, last_id + 1))
+            cursor.executemany("INSERT INTO cargos_recurrentes (recurrente_id, periodo, transaccion_id) VALUES (?, ?, ?)",
+                               [(p[0], p[1], tx_id) for p, tx_id in zip(pending, ids)])
+            flows.extend((p[4], -p[3]) for p in pending)
+            changes.touch(TX_TABLES, ids, [p[4] for p in pending]).touch(["cargos_recurrentes"])
+            return ids
+
     def delete_recurring(self, rid: int) -> None:
-        with self.connect() as conn:
+        with self._writing(changes=ChangeSet().touch(["transacciones_recurrentes"], [rid])) as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM transacciones_recurrentes WHERE id=?", (rid,))
-            conn.commit()
@@ -0,0 +1,99 @@
+"""Bus de eventos de cambios en la base de datos.
+
+Cada escritura de DatabaseManager publica, tras el commit, un
+`DataChanged` con las tablas, ids y meses afectados. Los suscriptores
+(la caché de lecturas, la interfaz) deciden a partir de él qué invalidar
+o repintar en lugar de recargarlo todo.
+
+Los manejadores se ejecutan en el hilo que publicó (el escritor). Para
+la interfaz, ui/event_coalescer.py los agrupa y los entrega en el hilo
+de Tk una vez por fotograma.
+"""
+import threading
+from typing import Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple, Type, TypeVar
+
+# Tablas que cambian juntas con cada alta o baja de transacciones (triggers)
+TX_TABLES = ("transacciones", "resumen_mensual", "flujo_diario")
+CREDIT_TABLES = ("credito_config", "credito_movimientos", "credito_snapshots")
+
+
+class DataChanged(NamedTuple):
+    """Cambio confirmado. Sin tablas significa «cualquier cosa» (p. ej. otro proceso)."""
+    tables: FrozenSet[str] = frozenset()
+    ids: Tuple[Tuple[str, FrozenSet[int]], ...] = ()
+    months: FrozenSet[str] = frozenset()
+
+    @property
+    def unknown(self) -> bool:
+        return not self.tables
+
+    def touches(self, tables: Optional[Iterable[str]]) -> bool:
+        """Si el cambio puede afectar a datos leídos de `tables` (None = de todas)."""
+        return self.unknown or tables is None or not self.tables.isdisjoint(tables)
+
+    def ids_for(self, table: str) -> FrozenSet[int]:
+        return dict(self.ids).get(table, frozenset())
+
+    def merge(self, other: "DataChanged") -> "DataChanged":
+        if self.unknown or other.unknown:
+            return DataChanged()
+        ids: Dict[str, FrozenSet[int]] = dict(self.ids)
+        for table, values in other.ids:
+            ids[table] = ids.get(table, frozenset()) | values
+        return DataChanged(self.tables | other.tables, tuple(sorted(ids.items())), self.months | other.months)
+
+
+class ChangeSet:
+    """Acumula lo que toca una escritura mientras se ejecuta su transacción."""
+
+    def __init__(self) -> None:
+        self._tables: set = set()
+        self._ids: Dict[str, set] = {}
+        self._months: set = set()
+
+    def touch(self, tables: Iterable[str], ids: Iterable[int] = (), fechas: Iterable[str] = ()) -> "ChangeSet":
+        """Anota tablas; los `ids` se asocian a la primera y de `fechas` se toma el mes."""
+        tables = tuple(tables)
+        self._tables.update(tables)
+        ids = [i for i in ids if i is not None]
+        if ids:
+            self._ids.setdefault(tables[0], set()).update(ids)
+        self._months.update(f[:7] for f in fechas if f)
+        return self
+
+    def __bool__(self) -> bool:
+        return bool(self._tables)
+
+    def event(self) -> DataChanged:
+        return DataChanged(frozenset(self._tables),
+                           tuple(sorted((t, frozenset(v)) for t, v in self._ids.items())),
+                           frozenset(self._months))
+
+
+E = TypeVar("E", bound=tuple)
+
+
+class EventBus:
+    """Publicación/suscripción por tipo de evento; seguro entre hilos."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._handlers: Dict[type, List[Callable]] = {}
+
+    def subscribe(self, event_type: Type[E], handler: Callable[[E], None]) -> Callable[[], None]:
+        """Registra `handler`; devuelve la función que lo da de baja."""
+        with self._lock:
+            self._handlers.setdefault(event_type, []).append(handler)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                handlers = self._handlers.get(event_type, [])
+                if handler in handlers:
+                    handlers.remove(handler)
+        return unsubscribe
+
+    def publish(self, event: tuple) -> None:
+        with self._lock:
+            handlers = list(self._handlers.get(type(event), ()))
+        for handler in handlers:
+            handler(event)
@@ -1,39 +1,557 @@
-"""Script de migración ligero para la base de datos.
+"""Motor de migraciones del esquema, versionado con PRAGMA user_version.
 
-Este script aplica cambios no destructivos: crea índices y asegura
-que exista una fila en `credito_config`. Para cambios estructurales
-mayores (CHECK en tablas existentes) se recomienda un proceso manual
-de migración que respalde la BD y reconstruya tablas.
+Cada migración es una función que recibe un cursor y lleva el esquema de
+la versión N-1 a la N. Todas las pendientes se aplican en una única
+transacción BEGIN IMMEDIATE junto con la actualización de user_version,
+así que una migración fallida no deja la base de datos a medias.
+
+Si la BD ya está en SCHEMA_VERSION, `apply_migrations` solo lee el
+PRAGMA y no ejecuta ningún DDL.
+
+Las BD anteriores a este motor tienen user_version = 0; la migración 1
+usa CREATE ... IF NOT EXISTS para adoptarlas sin perder datos.
+
+Uso: python -m db.migrate [ruta_bd]
 """
 import sqlite3
+import sys
 from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from db import credit_ledger
+
+
+def _m001_base_schema(cur: sqlite3.Cursor) -> None:
+    """Tablas base, índices simples y fila única de crédito."""
+    # Tabla de Transacciones (Ingresos y Gastos)
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS transacciones (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tipo TEXT NOT NULL,
+            categoria TEXT,
+            monto REAL NOT NULL CHECK(monto >= 0),
+            fecha TEXT NOT NULL,
+            descripcion TEXT,
+            metodo_pago TEXT
+        )
+    ''')
+
+    # Tabla de Configuración de Crédito (Sistema Cashéa)
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS credito_config (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            limite_total REAL DEFAULT 0,
+            saldo_utilizado REAL DEFAULT 0
+        )
+    ''')
+
+    # Inicializar crédito si está vacío
+    cur.execute("SELECT count(*) FROM credito_config")
+    if cur.fetchone()[0] == 0:
+        cur.execute("INSERT INTO credito_config (limite_total, saldo_utilizado) VALUES (500, 0)")
+
+    # Tabla de Metas de Ahorro (Legacy)
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS metas_ahorro (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT NOT NULL,
+            monto_objetivo REAL NOT NULL CHECK(monto_objetivo >= 0),
+            monto_actual REAL DEFAULT 0
+        )
+    ''')
+
+    # Planes de Ahorro por Objetivos
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS planes_ahorro (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre_plan TEXT NOT NULL,
+            monto_objetivo REAL NOT NULL,
+            monto_actual REAL DEFAULT 0,
+            fecha_limite TEXT,
+            color_hex TEXT
+        )
+    ''')
+
+    # Tabla de Presupuestos (Smart Budget)
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS presupuestos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            categoria TEXT UNIQUE NOT NULL,
+            monto_limite REAL NOT NULL CHECK(monto_limite >= 0)
+        )
+    ''')
+
+    # Tabla de Transacciones Recurrentes
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS transacciones_recurrentes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT NOT NULL,
+            monto REAL NOT NULL,
+            dia_cobro INTEGER NOT NULL,
+            categoria TEXT,
+            activo INTEGER DEFAULT 1
+        )
+    ''')
+
+    # Índices para consultas frecuentes
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_transacciones_fecha ON transacciones(fecha)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_transacciones_tipo ON transacciones(tipo)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_transacciones_categoria ON transacciones(categoria)")
+
+
+def _m002_monthly_summary(cur: sqlite3.Cursor) -> None:
+    """Tabla agregada `resumen_mensual` mantenida por triggers.
+
+    Acumulado por (mes, tipo, categoria, metodo_pago). Las categorías y
+    métodos nulos se guardan como '' para que formen parte de la clave.
+    """
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS resumen_mensual (
+            mes TEXT NOT NULL,
+            tipo TEXT NOT NULL,
+            categoria TEXT NOT NULL,
+            metodo_pago TEXT NOT NULL,
+            total REAL NOT NULL DEFAULT 0,
+            n INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (mes, tipo, categoria, metodo_pago)
+        ) WITHOUT ROWID
+    ''')
+    _create_monthly_summary_triggers(cur)
+    rebuild_monthly_summary(cur)
+
+
+def _create_monthly_summary_triggers(cur: sqlite3.Cursor) -> None:
+    cur.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_resumen_insert AFTER INSERT ON transacciones
+        BEGIN
+            INSERT INTO resumen_mensual (mes, tipo, categoria, metodo_pago, total, n)
+            VALUES (substr(NEW.fecha, 1, 7), NEW.tipo, IFNULL(NEW.categoria, ''), IFNULL(NEW.metodo_pago, ''), NEW.monto, 1)
+            ON CONFLICT(mes, tipo, categoria, metodo_pago)
+            DO UPDATE SET total = total + excluded.total, n = n + 1;
+        END
+    ''')
+    cur.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_resumen_delete AFTER DELETE ON transacciones
+        BEGIN
+            UPDATE resumen_mensual SET total = total - OLD.monto, n = n - 1
+            WHERE mes = substr(OLD.fecha, 1, 7) AND tipo = OLD.tipo
+              AND categoria = IFNULL(OLD.categoria, '') AND metodo_pago = IFNULL(OLD.metodo_pago, '');
+            DELETE FROM resumen_mensual
+            WHERE mes = substr(OLD.fecha, 1, 7) AND tipo = OLD.tipo
+              AND categoria = IFNULL(OLD.categoria, '') AND metodo_pago = IFNULL(OLD.metodo_pago, '')
+              AND n <= 0;
+        END
+    ''')
+    cur.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_resumen_update
+        AFTER UPDATE OF tipo, categoria, monto, fecha, metodo_pago ON transacciones
+        BEGIN
+            UPDATE resumen_mensual SET total = total - OLD.monto, n = n - 1
+            WHERE mes = substr(OLD.fecha, 1, 7) AND tipo = OLD.tipo
+              AND categoria = IFNULL(OLD.categoria, '') AND metodo_pago = IFNULL(OLD.metodo_pago, '');
+            DELETE FROM resumen_mensual
+            WHERE mes = substr(OLD.fecha, 1, 7) AND tipo = OLD.tipo
+              AND categoria = IFNULL(OLD.categoria, '') AND metodo_pago = IFNULL(OLD.metodo_pago, '')
+              AND n <= 0;
+            INSERT INTO resumen_mensual (mes, tipo, categoria, metodo_pago, total, n)
+            VALUES (substr(NEW.fecha, 1, 7), NEW.tipo, IFNULL(NEW.categoria, ''), IFNULL(NEW.metodo_pago, ''), NEW.monto, 1)
+            ON CONFLICT(mes, tipo, categoria, metodo_pago)
+            DO UPDATE SET total = total + excluded.total, n = n + 1;
+        END
+    ''')
+
+
+def rebuild_monthly_summary(cur: sqlite3.Cursor) -> None:
+    """Recalcula `resumen_mensual` completo desde `transacciones`."""
+    cur.execute("DELETE FROM resumen_mensual")
+    cur.execute('''
+        INSERT INTO resumen_mensual (mes, tipo, categoria, metodo_pago, total, n)
+        SELECT substr(fecha, 1, 7), tipo, IFNULL(categoria, ''), IFNULL(metodo_pago, ''), SUM(monto), COUNT(*)
+        FROM transacciones
+        GROUP BY 1, 2, 3, 4
+    ''')
+
+
+def _m003_budget_covering_index(cur: sqlite3.Cursor) -> None:
+    """Índice de cobertura para sumas por categoría en un rango de fechas."""
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_transacciones_tipo_cat_fecha ON transacciones(tipo, categoria, fecha, monto)")
+
+
+def _m004_search_index(cur: sqlite3.Cursor) -> None:
+    """Índice FTS5 (contenido externo) sobre descripcion/categoria y sus triggers.
+
+    Si SQLite se compiló sin FTS5 se omite; la búsqueda usará LIKE.
+    """
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='transacciones_fts'")
+    if cur.fetchone() is None:
+        try:
+            cur.execute('''
+                CREATE VIRTUAL TABLE transacciones_fts USING fts5(
+                    descripcion, categoria,
+                    content='transacciones', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                )
+            ''')
+        except sqlite3.OperationalError:
+            return
+    _create_search_triggers(cur)
+    cur.execute("INSERT INTO transacciones_fts (transacciones_fts) VALUES ('rebuild')")
+
+
+def _create_search_triggers(cur: sqlite3.Cursor) -> None:
+    cur.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_fts_insert AFTER INSERT ON transacciones
+        BEGIN
+            INSERT INTO transacciones_fts (rowid, descripcion, categoria)
+            VALUES (NEW.id, NEW.descripcion, NEW.categoria);
+        END
+    ''')
+    cur.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_fts_delete AFTER DELETE ON transacciones
+        BEGIN
+            INSERT INTO transacciones_fts (transacciones_fts, rowid, descripcion, categoria)
+            VALUES ('delete', OLD.id, OLD.descripcion, OLD.categoria);
+        END
+    ''')
+    cur.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_fts_update AFTER UPDATE OF descripcion, categoria ON transacciones
+        BEGIN
+            INSERT INTO transacciones_fts (transacciones_fts, rowid, descripcion, categoria)
+            VALUES ('delete', OLD.id, OLD.descripcion, OLD.categoria);
+            INSERT INTO transacciones_fts (rowid, descripcion, categoria)
+            VALUES (NEW.id, NEW.descripcion, NEW.categoria);
+        END
+    ''')
+
+
+def _m005_check_constraints(cur: sqlite3.Cursor) -> None:
+    """Añade CHECK a planes y recurrentes reconstruyendo las tablas."""
+    rebuild_table(cur, "planes_ahorro", '''
+        CREATE TABLE planes_ahorro (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre_plan TEXT NOT NULL,
+            monto_objetivo REAL NOT NULL CHECK(monto_objetivo >= 0),
+            monto_actual REAL DEFAULT 0 CHECK(monto_actual >= 0),
+            fecha_limite TEXT,
+            color_hex TEXT
+        )
+    ''')
+    rebuild_table(cur, "transacciones_recurrentes", '''
+        CREATE TABLE transacciones_recurrentes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT NOT NULL,
+            monto REAL NOT NULL CHECK(monto >= 0),
+            dia_cobro INTEGER NOT NULL CHECK(dia_cobro BETWEEN 1 AND 31),
+            categoria TEXT,
+            activo INTEGER DEFAULT 1 CHECK(activo IN (0, 1))
+        )
+    ''')
+
+
+def _m006_integer_cents(cur: sqlite3.Cursor) -> None:
+    """Pasa todos los importes de REAL a INTEGER en centavos.
+
+    `typeof(...) = 'integer'` en los CHECK impide que un float sin
+    convertir llegue a la tabla. Las sumas en SQL pasan a ser exactas.
+    """
+    cents = "CAST(ROUND({col} * 100) AS INTEGER)"
+    rebuild_table(cur, "transacciones", '''
+        CREATE TABLE transacciones (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tipo TEXT NOT NULL,
+            categoria TEXT,
+            monto INTEGER NOT NULL CHECK(typeof(monto) = 'integer' AND monto >= 0),
+            fecha TEXT NOT NULL,
+            descripcion TEXT,
+            metodo_pago TEXT
+        )
+    ''', {"monto": cents.format(col="monto")})
+    rebuild_table(cur, "credito_config", '''
+        CREATE TABLE credito_config (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            limite_total INTEGER NOT NULL DEFAULT 0 CHECK(typeof(limite_total) = 'integer'),
+            saldo_utilizado INTEGER NOT NULL DEFAULT 0 CHECK(typeof(saldo_utilizado) = 'integer')
+        )
+    ''', {"limite_total": cents.format(col="IFNULL(limite_total, 0)"),
+          "saldo_utilizado": cents.format(col="IFNULL(saldo_utilizado, 0)")})
+    rebuild_table(cur, "metas_ahorro", '''
+        CREATE TABLE metas_ahorro (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT NOT NULL,
+            monto_objetivo INTEGER NOT NULL CHECK(typeof(monto_objetivo) = 'integer' AND monto_objetivo >= 0),
+            monto_actual INTEGER NOT NULL DEFAULT 0 CHECK(typeof(monto_actual) = 'integer')
+        )
+    ''', {"monto_objetivo": cents.format(col="monto_objetivo"),
+          "monto_actual": cents.format(col="IFNULL(monto_actual, 0)")})
+    rebuild_table(cur, "planes_ahorro", '''
+        CREATE TABLE planes_ahorro (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre_plan TEXT NOT NULL,
+            monto_objetivo INTEGER NOT NULL CHECK(typeof(monto_objetivo) = 'integer' AND monto_objetivo >= 0),
+            monto_actual INTEGER NOT NULL DEFAULT 0 CHECK(typeof(monto_actual) = 'integer' AND monto_actual >= 0),
+            fecha_limite TEXT,
+            color_hex TEXT
+        )
+    ''', {"monto_objetivo": cents.format(col="monto_objetivo"),
+          "monto_actual": cents.format(col="IFNULL(monto_actual, 0)")})
+    rebuild_table(cur, "presupuestos", '''
+        CREATE TABLE presupuestos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            categoria TEXT UNIQUE NOT NULL,
+            monto_limite INTEGER NOT NULL CHECK(typeof(monto_limite) = 'integer' AND monto_limite >= 0)
+        )
+    ''', {"monto_limite": cents.format(col="monto_limite")})
+    rebuild_table(cur, "transacciones_recurrentes", '''
+        CREATE TABLE transacciones_recurrentes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT NOT NULL,
+            monto INTEGER NOT NULL CHECK(typeof(monto) = 'integer' AND monto >= 0),
+            dia_cobro INTEGER NOT NULL CHECK(dia_cobro BETWEEN 1 AND 31),
+            categoria TEXT,
+            activo INTEGER DEFAULT 1 CHECK(activo IN (0, 1))
+        )
+    ''', {"monto": cents.format(col="monto")})
 
+    # El agregado se recalcula entero desde los centavos ya convertidos
+    cur.execute("DROP TABLE resumen_mensual")
+    cur.execute('''
+        CREATE TABLE resumen_mensual (
+            mes TEXT NOT NULL,
+            tipo TEXT NOT NULL,
+            categoria TEXT NOT NULL,
+            metodo_pago TEXT NOT NULL,
+            total INTEGER NOT NULL DEFAULT 0,
+            n INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (mes, tipo, categoria, metodo_pago)
+        ) WITHOUT ROWID
+    ''')
+    rebuild_monthly_summary(cur)
+
+
+def _m007_daily_flow(cur: sqlite3.Cursor) -> None:
+    """Tabla `flujo_diario`: flujo neto (ingresos - gastos) por día, en centavos.
+
+    Mantenida por triggers como `resumen_mensual`. Sirve de base al índice
+    de saldos acumulados (db/balance_index.py).
+    """
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS flujo_diario (
+            fecha TEXT PRIMARY KEY,
+            neto INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''')
+    # Solo Ingreso/Gasto mueven el saldo, igual que en get_summary
+    signed_new = "CASE NEW.tipo WHEN 'Ingreso' THEN NEW.monto WHEN 'Gasto' THEN -NEW.monto ELSE 0 END"
+    signed_old = "CASE OLD.tipo WHEN 'Ingreso' THEN OLD.monto WHEN 'Gasto' THEN -OLD.monto ELSE 0 END"
+    cur.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_flujo_insert AFTER INSERT ON transacciones
+        WHEN NEW.tipo IN ('Ingreso', 'Gasto')
+        BEGIN
+            INSERT INTO flujo_diario (fecha, neto) VALUES (substr(NEW.fecha, 1, 10), {signed_new})
+            ON CONFLICT(fecha) DO UPDATE SET neto = neto + excluded.neto;
+        END
+    ''')
+    cur.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_flujo_delete AFTER DELETE ON transacciones
+        WHEN OLD.tipo IN ('Ingreso', 'Gasto')
+        BEGIN
+            UPDATE flujo_diario SET neto = neto - ({signed_old}) WHERE fecha = substr(OLD.fecha, 1, 10);
+        END
+    ''')
+    cur.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_flujo_update
+        AFTER UPDATE OF tipo, monto, fecha ON transacciones
+        BEGIN
+            UPDATE flujo_diario SET neto = neto - ({signed_old}) WHERE fecha = substr(OLD.fecha, 1, 10);
+            INSERT INTO flujo_diario (fecha, neto) VALUES (substr(NEW.fecha, 1, 10), {signed_new})
+            ON CONFLICT(fecha) DO UPDATE SET neto = neto + excluded.neto;
+        END
+    ''')
+    rebuild_daily_flow(cur)
+
+
+def rebuild_daily_flow(cur: sqlite3.Cursor) -> None:
+    """Recalcula `flujo_diario` completo desde `transacciones`."""
+    cur.execute("DELETE FROM flujo_diario")
+    cur.execute('''
+        INSERT INTO flujo_diario (fecha, neto)
+        SELECT substr(fecha, 1, 10),
+               SUM(CASE tipo WHEN 'Ingreso' THEN monto ELSE -monto END)
+        FROM transacciones WHERE tipo IN ('Ingreso', 'Gasto')
+        GROUP BY 1
+    ''')
+
+
+def _m008_credit_ledger(cur: sqlite3.Cursor) -> None:
+    """Sustituye `credito_config.saldo_utilizado` por el libro `credito_movimientos`.
+
+    El libro se rellena reproduciendo las transacciones de crédito; si el
+    saldo guardado no coincide, la diferencia queda como un movimiento de
+    ajuste para que el usuario vea el mismo saldo que antes.
+    """
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS credito_movimientos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            transaccion_id INTEGER,
+            tipo TEXT NOT NULL CHECK(tipo IN ('cargo', 'pago', 'reverso', 'ajuste')),
+            delta INTEGER NOT NULL CHECK(typeof(delta) = 'integer'),
+            creado TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_credito_movimientos_tx ON credito_movimientos(transaccion_id)")
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS credito_snapshots (
+            movimiento_id INTEGER PRIMARY KEY,
+            saldo INTEGER NOT NULL
+        )
+    ''')
+    # Solo inserción: las instantáneas dejarían de cuadrar si se edita el historial
+    for table in ("credito_movimientos", "credito_snapshots"):
+        for event in ("UPDATE", "DELETE"):
+            cur.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_no_{event.lower()}
+                BEFORE {event} ON {table}
+                BEGIN
+                    SELECT RAISE(ABORT, '{table} es de solo inserción');
+                END
+            ''')
+
+    saldo, applied = credit_ledger.replay(cur)
+    movements = [(tx_id, "cargo" if delta > 0 else "pago", delta) for tx_id, delta in applied]
+    row = cur.execute("SELECT saldo_utilizado FROM credito_config LIMIT 1").fetchone()
+    if row is not None and row[0] != saldo:
+        movements.append((None, "ajuste", row[0] - saldo))
+    credit_ledger.record(cur, movements)
+
+    rebuild_table(cur, "credito_config", '''
+        CREATE TABLE credito_config (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            limite_total INTEGER NOT NULL DEFAULT 0 CHECK(typeof(limite_total) = 'integer')
+        )
+    ''')
+
+
+def _m009_recurring_postings(cur: sqlite3.Cursor) -> None:
+    """Fecha de alta de cada recurrente y registro de cargos ya generados.
+
+    La clave (recurrente_id, periodo) impide registrar dos veces el cargo
+    de un mismo mes. Las suscripciones existentes empiezan a cobrarse
+    desde hoy: no se inventan cargos pasados que quizá ya se anotaron a mano.
+    """
+    cur.execute("ALTER TABLE transacciones_recurrentes ADD COLUMN inicio TEXT")
+    cur.execute("UPDATE transacciones_recurrentes SET inicio = date('now', 'localtime') WHERE inicio IS NULL")
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS cargos_recurrentes (
+            recurrente_id INTEGER NOT NULL,
+            periodo TEXT NOT NULL,
+            transaccion_id INTEGER NOT NULL,
+            PRIMARY KEY (recurrente_id, periodo)
+        ) WITHOUT ROWID
+    ''')
+
+
+def _m010_type_date_index(cur: sqlite3.Cursor) -> None:
+    """Índice cubriente (tipo, fecha, monto) para series de tiempo por tipo."""
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_transacciones_tipo_fecha ON transacciones(tipo, fecha, monto)")
+
+
+# Orden estricto: la posición i (base 1) es la versión que deja la migración.
+MIGRATIONS: List[Callable[[sqlite3.Cursor], None]] = [
+    _m001_base_schema,
+    _m002_monthly_summary,
+    _m003_budget_covering_index,
+    _m004_search_index,
+    _m005_check_constraints,
+    _m006_integer_cents,
+    _m007_daily_flow,
+    _m008_credit_ledger,
+    _m009_recurring_postings,
+    _m010_type_date_index,
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def rebuild_table(cur: sqlite3.Cursor, table: str, create_sql: str,
+                  transforms: Optional[Dict[str, str]] = None) -> None:
+    """Reconstruye `table` con una nueva definición conservando los datos.
+
+    Sigue el procedimiento recomendado por SQLite: crear la tabla nueva,
+    copiar las columnas comunes, borrar la vieja, renombrar y recrear sus
+    índices y triggers. `transforms` permite copiar una columna mediante
+    una expresión SQL sobre la tabla vieja. Debe ejecutarse dentro de una
+    transacción.
+    """
+    transforms = transforms or {}
+    tmp = f"{table}__nueva"
+    old_cols = [r[1] for r in cur.execute(f"PRAGMA table_info({table})")]
+    cur.execute("SELECT type, sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL", (table,))
+    dependents = cur.fetchall()
+    cur.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,))
+    seq = cur.fetchone()
+
+    cur.execute(create_sql.replace(f"CREATE TABLE {table}", f"CREATE TABLE {tmp}", 1))
+    new_cols = [r[1] for r in cur.execute(f"PRAGMA table_info({tmp})")]
+    common = [c for c in new_cols if c in old_cols]
+    cols = ", ".join(common)
+    exprs = ", ".join(transforms.get(c, c) for c in common)
+    cur.execute(f"INSERT INTO {tmp} ({cols}) SELECT {exprs} FROM {table}")
+    cur.execute(f"DROP TABLE {table}")
+    cur.execute(f"ALTER TABLE {tmp} RENAME TO {table}")
+    if seq is not None:
+        # Conservar el contador AUTOINCREMENT para no reutilizar ids borrados
+        cur.execute("UPDATE sqlite_sequence SET seq = max(seq, ?) WHERE name = ?", (seq[0], table))
+    for _type, sql in dependents:
+        cur.execute(sql)
+
+
+def get_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(conn: sqlite3.Connection) -> int:
+    """Aplica las migraciones pendientes y devuelve la versión resultante."""
+    if get_version(conn) >= SCHEMA_VERSION:
+        return SCHEMA_VERSION
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Releer bajo el lock: otro proceso pudo migrar mientras tanto
+        version = get_version(conn)
+        cur = conn.cursor()
+        for target in range(version + 1, SCHEMA_VERSION + 1):
+            MIGRATIONS[target - 1](cur)
+        if version < SCHEMA_VERSION:
+            cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+    return max(version, SCHEMA_VERSION)
+
+
+def migrate(db_path: Optional[str] = None) -> int:
+    """Migra la BD en `db_path` (por defecto la de la aplicación)."""
+    if db_path is None:
+        from config import DB_PATH
+        db_path = str(DB_PATH)
 
-def migrate(db_path: str = "finanzas_personales.db") -> None:
     p = Path(db_path)
     if not p.exists():
         print(f"DB {db_path} no existe; la operación de migración no es necesaria.")
-        return
+        return 0
 
     conn = sqlite3.connect(db_path)
     try:
-        cur = conn.cursor()
-        # Índices no destructivos
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_transacciones_fecha ON transacciones(fecha)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_transacciones_tipo ON transacciones(tipo)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_transacciones_categoria ON transacciones(categoria)")
-
-        # Asegurar fila única en credito_config
-        cur.execute("SELECT count(*) FROM credito_config")
-        row = cur.fetchone()
-        if row is None or row[0] == 0:
-            cur.execute("INSERT INTO credito_config (limite_total, saldo_utilizado) VALUES (500, 0)")
-
-        conn.commit()
-        print("Migración ligera completada: índices creados y crédito asegurado.")
+        before = get_version(conn)
+        after = apply_migrations(conn)
     finally:
         conn.close()
+    if after == before:
+        print(f"Esquema al día (versión {after}).")
+    else:
+        print(f"Migración completada: versión {before} -> {after}.")
+    return after
 
 
 if __name__ == '__main__':
-    migrate()
+    migrate(sys.argv[1] if len(sys.argv) > 1 else None)
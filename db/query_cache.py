@@ -0,0 +1,83 @@
+"""Caché LRU de resultados de consultas de lectura.
+
+Cada entrada guarda la generación vigente cuando empezó la consulta y
+las tablas de las que lee. `invalidate()` avanza la generación y
+descarta las entradas de las tablas indicadas (todas, sin argumento);
+las demás pasan a la generación nueva. Una lectura que se solapó con
+una escritura llega con la generación previa y no se guarda, así que
+nunca se entrega un resultado anterior a la escritura.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, FrozenSet, Hashable, Iterable, NamedTuple, Optional, Tuple
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class QueryCache:
+    def __init__(self, maxsize: int = 128) -> None:
+        if maxsize < 1:
+            raise ValueError("El tamaño de la caché debe ser al menos 1")
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[int, FrozenSet[str], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._hits = self._misses = self._evictions = self._invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable, generation: int) -> Tuple[bool, Any]:
+        """(encontrado, valor) para `key` si se calculó en `generation`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == generation == self._generation:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return True, entry[2]
+            self._misses += 1
+            return False, None
+
+    def put(self, key: Hashable, generation: int, value: Any, tables: Iterable[str] = ()) -> None:
+        """Guarda `value`; sin `tables` la entrada cae con cualquier invalidación."""
+        with self._lock:
+            if generation != self._generation:
+                return  # Hubo una escritura mientras se consultaba
+            self._entries[key] = (generation, frozenset(tables), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, tables: Optional[Iterable[str]] = None) -> None:
+        """Descarta lo leído de `tables` (None = todo) y conserva el resto."""
+        with self._lock:
+            self._generation += 1
+            self._invalidations += 1
+            if tables is None:
+                self._entries.clear()
+                return
+            tables = frozenset(tables)
+            for key, (_gen, deps, value) in list(self._entries.items()):
+                if not deps or not deps.isdisjoint(tables):
+                    del self._entries[key]
+                else:
+                    self._entries[key] = (self._generation, deps, value)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, self._invalidations,
+                              len(self._entries), self.maxsize)
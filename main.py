@@ -1,6 +1,7 @@
 """Punto de Entrada de la Aplicación."""
 import os
 import sys
+import multiprocessing
 import customtkinter as ctk
 
 # Asegurar que se encuentren 'utils' y otros módulos
@@ -11,7 +12,9 @@ import traceback
 from utils.constants import *
 from config import resource_path, DB_PATH
 from db.database import DatabaseManager
+from db.async_database import AsyncDatabaseManager
 from services.transaction_service import TransactionService
+from services.recurring_service import RecurringService
 
 def global_exception_handler(exctype, value, tb):
     """Manejo de errores global para mostrar un messagebox en producción."""
@@ -23,6 +26,12 @@ def global_exception_handler(exctype, value, tb):
 
 sys.excepthook = global_exception_handler
 
+from ui.async_bridge import TkAsyncioBridge
+from ui.view_loader import ViewLoader
+from ui.event_coalescer import FrameCoalescer
+from ui.charts import charts
+from ui.view_registry import ViewRegistry
+from ui.components.skeleton import ViewSkeleton
 from ui.login import LoginWindow
 from ui.components.sidebar import Sidebar
 from ui.views.dashboard import DashboardView
@@ -55,47 +64,122 @@ class FinanceApp(ctk.CTk):
         except Exception as e:
             print(f"No se pudo cargar el icono: {e}")
         
-        self.db = DatabaseManager()
+        self.db = DatabaseManager(pooled=True)
+        self.adb = AsyncDatabaseManager(self.db)
+        self.async_bridge = TkAsyncioBridge(self)
+        self.view_loader = ViewLoader(self.async_bridge, self.adb)
+        self.views = ViewRegistry()
+        # Cambios de datos agrupados por fotograma hacia las vistas residentes
+        self.data_events = FrameCoalescer(self, self.db.events, self.async_bridge)
+        self.data_events.subscribe(self.on_data_changed)
         self.tx_service = TransactionService(self.db)
+        self.recurring_service = RecurringService(self.db)
 
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(1, weight=1)
 
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
         self.withdraw()
         LoginWindow(self, self.start_app)
 
+    def on_close(self):
+        """Detiene el bucle asíncrono y cierra las conexiones persistentes antes de salir."""
+        self.view_loader.cancel()
+        self.data_events.close()
+        self.views.clear()
+        charts.release_all()
+        self.async_bridge.close()
+        self.adb.close()
+        self.db.close()
+        self.destroy()
+
     def start_app(self):
         self.deiconify()
+        self.async_bridge.start()
         self.create_sidebar()
         self.show_view("dashboard")
+        self.post_recurring_charges()
+
+    def post_recurring_charges(self):
+        """Registra en segundo plano los cargos recurrentes vencidos desde la última ejecución.
+
+        Las vistas afectadas se actualizan solas con el DataChanged resultante.
+        """
+        self.async_bridge.spawn(self.adb.run_write(self.recurring_service.post_due),
+                                on_error=lambda e: print(f"Error registrando cargos recurrentes: {e}"))
+
+    def on_data_changed(self, event):
+        for view in self.views.values():
+            view.on_data_changed(event, self.view_loader)
 
     def create_sidebar(self):
         self.sidebar = Sidebar(self, self.show_view)
 
-    def show_view(self, view_name):
-        # Limpiar vista actual (excepto sidebar)
-        for widget in self.winfo_children():
-            if not isinstance(widget, Sidebar) and not isinstance(widget, ctk.CTkToplevel):
-                widget.destroy()
-
-        # Cargar nueva vista
+    def _view_spec(self, view_name):
+        """Clase de la vista y argumentos de su constructor."""
         if view_name == "dashboard":
-            DashboardView(self, self.db)
+            return DashboardView, (self.db,)
         elif view_name == "transactions":
-            TransactionsView(self, self.db, self.tx_service)
+            return TransactionsView, (self.db, self.tx_service, self.async_bridge, self.adb)
         elif view_name == "credit":
-            CreditView(self, self.db, self.tx_service)
+            return CreditView, (self.db, self.tx_service)
         elif view_name == "savings":
-            GoalsView(self, self.db)
+            return GoalsView, (self.db,)
         elif view_name == "settings":
-            SettingsView(self, self.db)
+            return SettingsView, (self.db, self.async_bridge, self.adb)
         elif view_name == "projections":
-            ProjectionsView(self, self.db)
+            return ProjectionsView, (self.db,)
         elif view_name == "recurring":
-            RecurringView(self, self.db)
+            return RecurringView, (self.db,)
         elif view_name == "reports":
-            ReportsView(self, self.db)
+            return ReportsView, (self.db,)
+        return None, ()
+
+    def show_view(self, view_name):
+        # Una carga anterior que aún no terminó ya no debe pintarse
+        self.view_loader.cancel()
+
+        # Ocultar las vistas residentes y quitar lo transitorio (esqueletos), excepto sidebar
+        self.views.hide_all()
+        for widget in self.winfo_children():
+            if isinstance(widget, (Sidebar, ctk.CTkToplevel)) or widget in self.views:
+                continue
+            widget.destroy()
+
+        # Vista ya construida: mostrarla y consultar solo si cambiaron los datos
+        view = self.views.get(view_name)
+        if view is not None:
+            view.grid()
+            view.refresh(self.view_loader)
+            return
+
+        view_cls, args = self._view_spec(view_name)
+        if view_cls is None:
+            return
+        # Generación previa a la consulta: un cambio durante la carga deja la vista marcada como vieja
+        generation = view_cls.current_generation(self.db)
+        load = getattr(view_cls, "load", None)
+        if load is None:
+            # Vistas sin consultas costosas al abrir: se construyen directamente
+            self._register_view(view_name, view_cls(self, *args), generation)
+            return
+
+        # Esqueleto inmediato; la vista real se construye cuando llegan sus datos
+        skeleton = ViewSkeleton(self)
+
+        def on_ready(data):
+            skeleton.destroy()
+            self._register_view(view_name, view_cls(self, *args, data=data), generation)
+
+        self.view_loader.load(load, on_ready, on_error=lambda exc: skeleton.show_error(str(exc)))
+
+    def _register_view(self, view_name, view, generation):
+        view.data_generation = generation
+        self.views.add(view_name, view)
 
 if __name__ == "__main__":
+    # Necesario para el pool de procesos de la simulación en el ejecutable empaquetado
+    multiprocessing.freeze_support()
     app = FinanceApp()
     app.mainloop()
@@ -0,0 +1,257 @@
+"""Respaldos en caliente y almacén de respaldos deduplicado.
+
+`online_backup` copia la base de datos viva con la API de backup de SQLite,
+por lotes de páginas y con pausas entre lotes para ceder el lock a los
+escritores. Es bloqueante: la interfaz lo lanza en un hilo de trabajo.
+
+`BackupStore` guarda cada respaldo como un manifiesto JSON que lista los
+hashes SHA-256 de bloques de tamaño fijo; los bloques se guardan una sola
+vez por contenido, así que los respaldos diarios repetidos solo escriben
+las páginas que cambiaron.
+
+Uso por línea de comandos:
+    python -m services.backup_store <dir_almacen> list
+    python -m services.backup_store <dir_almacen> backup [ruta_bd]
+    python -m services.backup_store <dir_almacen> verify <id>
+    python -m services.backup_store <dir_almacen> restore <id> <ruta_destino>
+    python -m services.backup_store <dir_almacen> prune --keep 7
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+CHUNK_SIZE = 64 * 1024
+PAGES_PER_STEP = 256
+STEP_PAUSE = 0.005
+
+
+def online_backup(source_path: str, target_path: str, pages: int = PAGES_PER_STEP,
+                  pause: float = STEP_PAUSE) -> None:
+    """Copia una BD SQLite en uso a `target_path` de forma consistente.
+
+    Copia `pages` páginas por paso y duerme `pause` segundos entre pasos
+    para ceder el lock a otros escritores.
+    """
+    def _yield_between_steps(status, remaining, total):
+        if remaining and pause:
+            time.sleep(pause)
+
+    src = sqlite3.connect(source_path)
+    try:
+        dst = sqlite3.connect(target_path)
+        try:
+            src.backup(dst, pages=pages, progress=_yield_between_steps)
+        finally:
+            dst.close()
+    finally:
+        src.close()
+
+
+class BackupStore:
+    """Almacén de respaldos deduplicado por contenido."""
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self.chunks_dir = os.path.join(root, "chunks")
+        self.manifests_dir = os.path.join(root, "manifests")
+        os.makedirs(self.chunks_dir, exist_ok=True)
+        os.makedirs(self.manifests_dir, exist_ok=True)
+
+    # --- Rutas ---
+    def _chunk_path(self, digest: str) -> str:
+        return os.path.join(self.chunks_dir, digest[:2], digest)
+
+    def _manifest_path(self, backup_id: str) -> str:
+        return os.path.join(self.manifests_dir, f"{backup_id}.json")
+
+    # --- Operaciones ---
+    def create(self, db_path: str, pages: int = PAGES_PER_STEP, pause: float = STEP_PAUSE) -> Dict:
+        """Respalda `db_path` y devuelve el manifiesto (incluye bytes nuevos escritos)."""
+        backup_id = datetime.now().strftime("backup_%Y%m%d_%H%M%S_%f")
+        snapshot = os.path.join(self.root, f"{backup_id}.tmp")
+        online_backup(db_path, snapshot, pages, pause)
+        try:
+            chunks: List[str] = []
+            new_bytes = 0
+            whole = hashlib.sha256()
+            size = 0
+            with open(snapshot, "rb") as f:
+                while True:
+                    block = f.read(CHUNK_SIZE)
+                    if not block:
+                        break
+                    whole.update(block)
+                    size += len(block)
+                    digest = hashlib.sha256(block).hexdigest()
+                    chunks.append(digest)
+                    path = self._chunk_path(digest)
+                    if not os.path.exists(path):
+                        os.makedirs(os.path.dirname(path), exist_ok=True)
+                        self._write_atomic(path, block)
+                        new_bytes += len(block)
+        finally:
+            os.remove(snapshot)
+
+        manifest = {
+            "id": backup_id,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "source": os.path.abspath(db_path),
+            "size": size,
+            "sha256": whole.hexdigest(),
+            "chunk_size": CHUNK_SIZE,
+            "chunks": chunks,
+            "new_bytes": new_bytes,
+        }
+        self._write_atomic(self._manifest_path(backup_id), json.dumps(manifest, indent=1).encode("utf-8"))
+        return manifest
+
+    def list(self) -> List[str]:
+        """Ids de respaldo, del más antiguo al más reciente."""
+        return sorted(name[:-5] for name in os.listdir(self.manifests_dir) if name.endswith(".json"))
+
+    def load_manifest(self, backup_id: str) -> Dict:
+        path = self._manifest_path(backup_id)
+        if not os.path.exists(path):
+            raise ValueError(f"Respaldo no encontrado: {backup_id}")
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def verify(self, backup_id: str) -> List[str]:
+        """Comprueba bloques, hash completo e integridad SQLite. Devuelve los problemas hallados."""
+        manifest = self.load_manifest(backup_id)
+        problems = []
+        whole = hashlib.sha256()
+        for digest in manifest["chunks"]:
+            path = self._chunk_path(digest)
+            if not os.path.exists(path):
+                problems.append(f"Bloque ausente: {digest}")
+                continue
+            with open(path, "rb") as f:
+                block = f.read()
+            if hashlib.sha256(block).hexdigest() != digest:
+                problems.append(f"Bloque corrupto: {digest}")
+            whole.update(block)
+        if problems:
+            return problems
+        if whole.hexdigest() != manifest["sha256"]:
+            return ["El hash del respaldo completo no coincide"]
+
+        scratch = os.path.join(self.root, f"{backup_id}.verify")
+        try:
+            self._assemble(manifest, scratch)
+            problems.extend(self._integrity_problems(scratch))
+        finally:
+            if os.path.exists(scratch):
+                os.remove(scratch)
+        return problems
+
+    def restore(self, backup_id: str, target_path: str) -> None:
+        """Reconstruye el respaldo en `target_path` tras verificarlo.
+
+        La BD destino no debe estar abierta por la aplicación.
+        """
+        problems = self.verify(backup_id)
+        if problems:
+            raise ValueError("Respaldo inválido: " + "; ".join(problems))
+        manifest = self.load_manifest(backup_id)
+        staging = f"{target_path}.restore"
+        self._assemble(manifest, staging)
+        # Eliminar WAL/SHM de la BD anterior para que no se apliquen sobre la restaurada
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(target_path + suffix):
+                os.remove(target_path + suffix)
+        os.replace(staging, target_path)
+
+    def prune(self, keep: int = 7) -> List[str]:
+        """Conserva los `keep` respaldos más recientes y borra bloques huérfanos."""
+        ids = self.list()
+        removed = ids[:-keep] if keep > 0 else ids
+        for backup_id in removed:
+            os.remove(self._manifest_path(backup_id))
+
+        referenced = set()
+        for backup_id in self.list():
+            referenced.update(self.load_manifest(backup_id)["chunks"])
+        for prefix in os.listdir(self.chunks_dir):
+            folder = os.path.join(self.chunks_dir, prefix)
+            for digest in os.listdir(folder):
+                if digest not in referenced:
+                    os.remove(os.path.join(folder, digest))
+            if not os.listdir(folder):
+                os.rmdir(folder)
+        return removed
+
+    # --- Auxiliares ---
+    def _assemble(self, manifest: Dict, target_path: str) -> None:
+        with open(target_path, "wb") as out:
+            for digest in manifest["chunks"]:
+                with open(self._chunk_path(digest), "rb") as f:
+                    out.write(f.read())
+
+    @staticmethod
+    def _integrity_problems(db_path: str) -> List[str]:
+        conn = sqlite3.connect(db_path)
+        try:
+            rows = [r[0] for r in conn.execute("PRAGMA integrity_check")]
+        except sqlite3.DatabaseError as e:
+            return [f"Integridad SQLite: {e}"]
+        finally:
+            conn.close()
+        return [] if rows == ["ok"] else [f"Integridad SQLite: {r}" for r in rows]
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    from config import DB_PATH
+
+    parser = argparse.ArgumentParser(description="Almacén de respaldos deduplicado de FinanceApp")
+    parser.add_argument("store", help="Directorio del almacén")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list")
+    p_backup = sub.add_parser("backup")
+    p_backup.add_argument("db", nargs="?", default=str(DB_PATH))
+    p_verify = sub.add_parser("verify")
+    p_verify.add_argument("id")
+    p_restore = sub.add_parser("restore")
+    p_restore.add_argument("id")
+    p_restore.add_argument("target")
+    p_prune = sub.add_parser("prune")
+    p_prune.add_argument("--keep", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    store = BackupStore(args.store)
+    if args.command == "list":
+        for backup_id in store.list():
+            print(backup_id)
+    elif args.command == "backup":
+        manifest = store.create(args.db)
+        print(f"{manifest['id']}: {manifest['size']} bytes, {manifest['new_bytes']} nuevos")
+    elif args.command == "verify":
+        problems = store.verify(args.id)
+        for problem in problems:
+            print(problem)
+        print("OK" if not problems else "FALLÓ")
+        return 1 if problems else 0
+    elif args.command == "restore":
+        store.restore(args.id, args.target)
+        print(f"Restaurado en {args.target}")
+    elif args.command == "prune":
+        for backup_id in store.prune(args.keep):
+            print(f"Eliminado {backup_id}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
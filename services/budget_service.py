@@ -0,0 +1,96 @@
+"""Servicio de presupuestos: comparación gasto vs. límite para cualquier periodo."""
+from datetime import date, timedelta
+from typing import List, NamedTuple, Optional
+from db.database import DatabaseManager
+
+AVG_MONTH_DAYS = 365.2425 / 12
+
+
+class BudgetPeriod(NamedTuple):
+    """Rango semiabierto de fechas [start, end)."""
+    start: date
+    end: date
+
+    @classmethod
+    def month(cls, year: int, month: int) -> "BudgetPeriod":
+        start = date(year, month, 1)
+        end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+        return cls(start, end)
+
+    @classmethod
+    def quarter(cls, year: int, quarter: int) -> "BudgetPeriod":
+        if not 1 <= quarter <= 4:
+            raise ValueError("El trimestre debe estar entre 1 y 4")
+        first_month = 3 * (quarter - 1) + 1
+        start = date(year, first_month, 1)
+        end = date(year + 1, 1, 1) if quarter == 4 else date(year, first_month + 3, 1)
+        return cls(start, end)
+
+    @classmethod
+    def custom(cls, start: date, end: date) -> "BudgetPeriod":
+        """Rango libre; `end` es exclusivo."""
+        if end <= start:
+            raise ValueError("La fecha final debe ser posterior a la inicial")
+        return cls(start, end)
+
+    @property
+    def days(self) -> int:
+        return (self.end - self.start).days
+
+    @property
+    def months(self) -> float:
+        """Meses que abarca el periodo (exacto si está alineado a inicio de mes)."""
+        if self.start.day == 1 and self.end.day == 1:
+            return (self.end.year - self.start.year) * 12 + self.end.month - self.start.month
+        return self.days / AVG_MONTH_DAYS
+
+
+class BudgetStatus(NamedTuple):
+    category: str
+    limit: float
+    spent: float
+    remaining: float
+    percent_used: float
+    projected: float
+    projected_overrun: float
+
+
+class BudgetService:
+    """Evalúa los presupuestos mensuales sobre un periodo arbitrario.
+
+    El límite de cada categoría se escala a la duración del periodo y el
+    gasto se proyecta linealmente hasta su final según los días transcurridos.
+    """
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+
+    def compare(self, period: Optional[BudgetPeriod] = None, today: Optional[date] = None) -> List[BudgetStatus]:
+        today = today or date.today()
+        period = period or BudgetPeriod.month(today.year, today.month)
+
+        rows = self.db.get_budget_spending(period.start.isoformat(), period.end.isoformat())
+
+        elapsed = min(max((today - period.start).days + 1, 0), period.days)
+        results = []
+        for category, monthly_limit, spent in rows:
+            limit = monthly_limit * period.months
+            if 0 < elapsed < period.days:
+                projected = spent / elapsed * period.days
+            else:
+                # Periodo futuro o ya cerrado: no hay nada que extrapolar
+                projected = spent
+            percent = (spent / limit * 100) if limit > 0 else 0.0
+            results.append(BudgetStatus(
+                category=category,
+                limit=limit,
+                spent=spent,
+                remaining=limit - spent,
+                percent_used=percent,
+                projected=projected,
+                projected_overrun=max(0.0, projected - limit),
+            ))
+        return results
+
+    def compare_range(self, start: date, end: date, today: Optional[date] = None) -> List[BudgetStatus]:
+        """Atajo para un rango cerrado [start, end] expresado con fechas inclusivas."""
+        return self.compare(BudgetPeriod.custom(start, end + timedelta(days=1)), today)
@@ -1,31 +1,72 @@
 """Servicio para la exportación y gestión de datos."""
 import csv
-import shutil
+import gzip
 import os
 from datetime import datetime
-from config import DB_PATH
+from typing import Callable, Dict, Optional
 from db.database import DatabaseManager
+from services.backup_store import BackupStore, online_backup
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class ExportCancelled(Exception):
+    """El callback de progreso canceló la exportación."""
+
 
 class DataService:
     def __init__(self, db: DatabaseManager):
         self.db = db
 
-    def export_transactions_csv(self, filepath: str) -> None:
-        """Exporta todas las transacciones a un archivo CSV."""
-        transactions = self.db.get_transactions(limit=10000) # Obtener todas/muchas
-        if not transactions:
-            return
+    def export_transactions_csv(self, filepath: str, start: Optional[str] = None, end: Optional[str] = None,
+                                categoria: Optional[str] = None, tipo: Optional[str] = None,
+                                compress: Optional[bool] = None,
+                                progress: Optional[Callable[[int, int], Optional[bool]]] = None) -> int:
+        """Exporta las transacciones a CSV en streaming, con memoria constante.
+
+        Filtros opcionales: rango de fechas [start, end), categoría y tipo.
+        Con `compress` (por defecto, si la ruta termina en .gz) se escribe
+        gzip al vuelo. `progress(escritas, total)` se llama tras cada
+        bloque; si devuelve False se borra el archivo parcial y se lanza
+        ExportCancelled. Devuelve el número de filas exportadas.
+        """
+        total = self.db.count_transactions(start, end, categoria, tipo)
+        if not total:
+            return 0
+
+        if compress is None:
+            compress = filepath.endswith(".gz")
 
         # Definir encabezados basados en la estructura de la BD
         headers = ["ID", "Tipo", "Categoría", "Monto", "Fecha", "Descripción", "Método"]
 
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
-            writer.writerows(transactions)
+        written = 0
+        opener = gzip.open if compress else open
+        try:
+            with opener(filepath, 'wt', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(headers)
+                chunks = self.db.iter_transactions(start, end, categoria, tipo, chunk_size=EXPORT_CHUNK_SIZE)
+                try:
+                    for chunk in chunks:
+                        writer.writerows(chunk)
+                        written += len(chunk)
+                        if progress is not None and progress(written, total) is False:
+                            raise ExportCancelled("Exportación cancelada")
+                finally:
+                    chunks.close()
+        except BaseException:
+            if os.path.exists(filepath):
+                os.remove(filepath)
+            raise
+        return written
 
     def backup_database(self, target_dir: str) -> str:
-        """Crea una copia de seguridad del archivo de base de datos."""
+        """Crea una copia de seguridad consistente de la base de datos en uso.
+
+        Usa la API de backup de SQLite por lotes de páginas, por lo que es
+        seguro aunque la aplicación esté escribiendo (incluido el WAL).
+        """
         if not os.path.exists(target_dir):
             os.makedirs(target_dir)
             
@@ -33,5 +74,12 @@ class DataService:
         filename = f"backup_{timestamp}.db"
         target_path = os.path.join(target_dir, filename)
         
-        shutil.copy2(DB_PATH, target_path)
+        online_backup(self.db.db_name, target_path)
         return target_path
+
+    def incremental_backup(self, store_dir: str, keep: int = 30) -> Dict:
+        """Respaldo deduplicado en `store_dir`; conserva los `keep` más recientes."""
+        store = BackupStore(store_dir)
+        manifest = store.create(self.db.db_name)
+        store.prune(keep)
+        return manifest
@@ -1,5 +1,10 @@
 """Servicio para cálculos financieros y proyecciones."""
+from datetime import datetime, timedelta
 from typing import List, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
 from db.database import DatabaseManager
 
 class FinanceMath:
@@ -9,12 +14,11 @@ class FinanceMath:
         Calcula el ahorro mensual promedio basado en los últimos 'days' días (por defecto 90).
         Fórmula: (Suma(Ingresos) - Suma(Gastos)) / (días / 30)
         """
-        transactions = db.get_recent_transactions(days)
-        
-        ingresos = sum(t[3] for t in transactions if t[1] == "Ingreso")
-        gastos = sum(t[3] for t in transactions if t[1] == "Gasto")
-        
-        net_savings = ingresos - gastos
+        cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        # Suma exacta en centavos hecha por SQLite; solo se pasa a float al final
+        ingresos, gastos = db.get_totals_cents(start=cutoff)
+
+        net_savings = (ingresos - gastos) / 100
         
         # Si no hay ahorros o es negativo, devuelve 0 (¿o permitir negativo? Las proyecciones suelen asumir inversión positiva)
         # Pero para el 'ahorro promedio' podría ser negativo.
@@ -25,29 +29,53 @@ class FinanceMath:
         return monthly_average
 
     @staticmethod
-    def calculate_compound_growth(principal: float, monthly_contribution: float, 
+    def monthly_flows(db: DatabaseManager) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        Devuelve (meses, ingresos, gastos) con los totales mensuales en centavos
+        como arreglos int64, listos para cálculos vectorizados exactos.
+        """
+        rows = db.get_monthly_totals_cents()
+        months = [r[0] for r in rows]
+        ingresos = np.fromiter((r[1] for r in rows), dtype=np.int64, count=len(rows))
+        gastos = np.fromiter((r[2] for r in rows), dtype=np.int64, count=len(rows))
+        return months, ingresos, gastos
+
+    @staticmethod
+    def compound_growth_grid(principal: ArrayLike, monthly_contribution: ArrayLike,
+                             rate_annual: ArrayLike = 0.08, months: ArrayLike = 120) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Trayectorias de interés compuesto mensual para muchos escenarios a la vez.
+
+        Los cuatro parámetros admiten escalares o arreglos y se combinan por
+        broadcasting; cada combinación es un escenario. Se usa la forma cerrada
+        A(m) = P*(1+r)^m + C*((1+r)^m - 1)/r, con r mensual (A(m) = P + C*m si r = 0).
+
+        Devuelve (meses, montos): `meses` es 0..max(months) y `montos` tiene la
+        forma de los escenarios más un último eje de tiempo, p. ej. (n, meses)
+        para entradas 1-D. Los meses posteriores al horizonte de un escenario
+        quedan en NaN.
+        """
+        principal, contribution, rate, horizon = np.broadcast_arrays(
+            np.asarray(principal, dtype=float), np.asarray(monthly_contribution, dtype=float),
+            np.asarray(rate_annual, dtype=float) / 12, np.asarray(months, dtype=np.int64))
+        if horizon.size and horizon.min() < 0:
+            raise ValueError("El horizonte no puede ser negativo")
+        t = np.arange(int(horizon.max(initial=0)) + 1)
+
+        r = rate[..., None]
+        growth = np.power(1 + r, t)
+        # Factor de anualidad; con tasa cero se reduce al número de meses
+        annuity = np.divide(growth - 1, r, out=np.broadcast_to(t, growth.shape).astype(float), where=r != 0)
+        amounts = principal[..., None] * growth + contribution[..., None] * annuity
+        amounts[t > horizon[..., None]] = np.nan
+        return t, amounts
+
+    @staticmethod
+    def calculate_compound_growth(principal: float, monthly_contribution: float,
                                   rate_annual: float = 0.08, months: int = 120) -> Tuple[List[int], List[float]]:
         """
         Calcula el crecimiento del interés compuesto mensualmente.
         Devuelve (lista_de_meses, lista_de_montos).
         """
-        rate_monthly = rate_annual / 12
-        amounts = []
-        time_points = []
-        
-        current_amount = principal
-        
-        # Iniciar en el mes 0
-        amounts.append(current_amount)
-        time_points.append(0)
-        
-        for m in range(1, months + 1):
-            # Interés ganado
-            interest = current_amount * rate_monthly
-            # Añadir contribución
-            current_amount += interest + monthly_contribution
-            
-            amounts.append(current_amount)
-            time_points.append(m)
-            
-        return time_points, amounts
+        t, amounts = FinanceMath.compound_growth_grid(principal, monthly_contribution, rate_annual, months)
+        return t.tolist(), amounts.tolist()
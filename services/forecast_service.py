@@ -0,0 +1,160 @@
+"""Pronóstico diario de caja a partir de recurrentes, cuotas de Cashea e historial.
+
+El calendario es un arreglo NumPy con un valor por día, desde mañana
+hasta el mismo día dentro de N meses. Cada fuente se suma con
+`np.bincount` sobre los índices de día, sin bucles por día ni por mes:
+
+- Recurrentes: una matriz (reglas x meses) de fechas de cobro, con el
+  día ajustado al último del mes cuando éste es corto.
+- Cashea: cada compra a crédito se paga en cuotas cada
+  CASHEA_INSTALLMENT_DAYS días; el saldo usado del libro mayor decide
+  cuáles siguen pendientes.
+- Tendencia: el flujo neto diario promedio de los últimos días, sin los
+  cargos recurrentes (que ya se cuentan por su calendario) ni las
+  compras a crédito (que salen por sus cuotas).
+
+El saldo es de caja: la compra a crédito ya restó en el saldo contable,
+pero el dinero sale al pagar cada cuota, así que el saldo inicial suma
+el crédito usado y las cuotas lo van restando.
+"""
+from datetime import date, timedelta
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from db import credit_ledger
+from db.database import DatabaseManager
+from services.recurring_service import charge_date
+
+# Plan de Cashea: la compra se reparte en cuotas quincenales
+CASHEA_INSTALLMENTS = 3
+CASHEA_INSTALLMENT_DAYS = 14
+
+
+class CashForecast(NamedTuple):
+    dates: np.ndarray        # datetime64[D], un elemento por día
+    balances: np.ndarray     # saldo de caja al cierre de cada día
+    start_balance: float
+    lowest_balance: float
+    lowest_date: date
+    overdraft_days: int
+    first_overdraft: Optional[date]
+
+
+def _to_date(value: np.datetime64) -> date:
+    return value.astype("M8[D]").astype(date)
+
+
+class ForecastService:
+    def __init__(self, db: DatabaseManager) -> None:
+        self.db = db
+
+    def forecast(self, months: int = 12, today: Optional[date] = None, trend_days: int = 90) -> CashForecast:
+        if months < 1:
+            raise ValueError("El horizonte debe ser de al menos un mes")
+        today = today or date.today()
+        y, m = divmod(today.month - 1 + months, 12)
+        end = charge_date(today.year + y, m + 1, today.day)
+        start = np.datetime64(today, "D") + 1
+        dates = np.arange(start, np.datetime64(end, "D") + 1)
+        n = len(dates)
+
+        recent = self.db.get_recent_transactions(days=max(trend_days, CASHEA_INSTALLMENTS * CASHEA_INSTALLMENT_DAYS))
+        used = round(self.db.get_credit_info()[1] * 100)
+
+        flows = self._recurring_flows(today, start, n)
+        flows += self._installment_flows(recent, used, today, start, n)
+        flows += self._trend(recent, today, trend_days)
+
+        start_cents = round(self.db.balance_at(today) * 100) + used
+        balances = np.round(start_cents + np.cumsum(flows)) / 100
+
+        low = int(np.argmin(balances))
+        overdraft = balances < 0
+        first = int(np.argmax(overdraft)) if overdraft.any() else None
+        return CashForecast(
+            dates=dates,
+            balances=balances,
+            start_balance=start_cents / 100,
+            lowest_balance=float(balances[low]),
+            lowest_date=_to_date(dates[low]),
+            overdraft_days=int(overdraft.sum()),
+            first_overdraft=_to_date(dates[first]) if first is not None else None,
+        )
+
+    def _recurring_flows(self, today: date, start: np.datetime64, n: int) -> np.ndarray:
+        """Cargos recurrentes futuros (y los vencidos sin registrar, en el primer día)."""
+        rules = self.db.get_recurring_schedule()
+        if not rules:
+            return np.zeros(n)
+        cents = np.array([round(r[2] * 100) for r in rules], dtype=np.int64)
+        dias = np.array([r[3] for r in rules], dtype=np.int64)
+        inicio = np.array([r[5][:10] if r[5] else today.isoformat() for r in rules], dtype="M8[D]")
+        # Sin cargos registrados, cualquier mes posterior a uno muy antiguo cuenta
+        last = np.array([r[6] or "0001-01" for r in rules], dtype="M8[M]")
+
+        first_month = min(inicio.min().astype("M8[M]"), np.datetime64(today, "M"))
+        last_month = (start + n - 1).astype("M8[M]")
+        month = np.arange(first_month, last_month + 1)
+        first_day = month.astype("M8[D]")
+        length = ((month + 1).astype("M8[D]") - first_day).astype(np.int64)
+
+        # (reglas x meses): fecha de cobro de cada regla en cada mes
+        due = first_day[None, :] + (np.minimum(dias[:, None], length[None, :]) - 1)
+        valid = (month[None, :] > last[:, None]) & (due >= inicio[:, None])
+        idx = np.maximum((due - start).astype(np.int64), 0)
+        valid &= idx < n
+        weights = np.broadcast_to(cents[:, None], due.shape)
+        return -np.bincount(idx[valid], weights=weights[valid], minlength=n)
+
+    def _installment_flows(self, recent: list, used: int, today: date, start: np.datetime64, n: int) -> np.ndarray:
+        """Cuotas pendientes de Cashea, de modo que sumen el saldo usado."""
+        if used <= 0:
+            return np.zeros(n)
+        charges = [(t[4], round(t[3] * 100)) for t in recent
+                   if credit_ledger.credit_delta(t[1], t[6], 1, 0) > 0]
+        if charges:
+            fechas = np.array([c[0][:10] for c in charges], dtype="M8[D]")
+            montos = np.array([c[1] for c in charges], dtype=np.int64)
+            k = np.arange(1, CASHEA_INSTALLMENTS + 1)
+            due = (fechas[:, None] + k[None, :] * CASHEA_INSTALLMENT_DAYS).ravel()
+            # La última cuota absorbe el redondeo
+            cuota = montos // CASHEA_INSTALLMENTS
+            amounts = np.repeat(cuota[:, None], CASHEA_INSTALLMENTS, axis=1)
+            amounts[:, -1] += montos - cuota * CASHEA_INSTALLMENTS
+            amounts = amounts.ravel()
+            pending = due > np.datetime64(today, "D")
+            due, amounts = due[pending], amounts[pending]
+            order = np.argsort(due, kind="stable")
+            due, amounts = due[order], amounts[order]
+        else:
+            due = np.array([], dtype="M8[D]")
+            amounts = np.array([], dtype=np.int64)
+
+        scheduled = int(amounts.sum())
+        if scheduled > used:
+            # Pagos adelantados: se saldan primero las cuotas más próximas
+            paid = scheduled - used
+            covered = np.minimum(np.cumsum(amounts), paid)
+            amounts = amounts - np.diff(covered, prepend=0)
+        elif used > scheduled:
+            # Saldo de compras más antiguas: vence ya
+            due = np.append(start, due)
+            amounts = np.append(used - scheduled, amounts)
+
+        idx = (due - start).astype(np.int64)
+        keep = (idx >= 0) & (idx < n)
+        return -np.bincount(idx[keep], weights=amounts[keep], minlength=n)
+
+    def _trend(self, recent: list, today: date, trend_days: int) -> float:
+        """Flujo neto diario promedio, en centavos, sin recurrentes ni compras a crédito."""
+        cutoff = (today - timedelta(days=trend_days)).isoformat()
+        recurring = set(self.db.get_recurring_posted_ids(cutoff))
+        rows = [t for t in recent if t[4][:10] > cutoff and t[0] not in recurring and t[1] in ("Ingreso", "Gasto")
+                and credit_ledger.credit_delta(t[1], t[6], 1, 0) <= 0]
+        if not rows:
+            return 0.0
+        # Con menos historia que la ventana, promediar solo sobre los días observados
+        span = min(trend_days, (today - date.fromisoformat(rows[0][4][:10])).days + 1)
+        net = sum(round(t[3] * 100) * (1 if t[1] == "Ingreso" else -1) for t in rows)
+        return net / max(span, 1)
@@ -0,0 +1,68 @@
+"""Servicio de cargos recurrentes: convierte suscripciones en gastos.
+
+Cada recurrente se cobra una vez por mes en `dia_cobro`; si el mes es
+más corto (día 29-31) el cargo cae en su último día. Al ejecutarse se
+calculan todos los cargos vencidos desde el último registrado (o desde
+`inicio`), incluidos los meses en que la aplicación estuvo cerrada, y
+se insertan en una sola transacción. La clave (recurrente, periodo)
+hace que ejecutarlo varias veces no duplique cargos.
+"""
+import calendar
+from datetime import date
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+from db.database import DatabaseManager
+
+
+class RecurringCharge(NamedTuple):
+    recurrente_id: int
+    periodo: str
+    categoria: str
+    monto: float
+    fecha: str
+    descripcion: str
+
+
+def _next_month(year: int, month: int) -> Tuple[int, int]:
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def charge_date(year: int, month: int, dia_cobro: int) -> date:
+    """Fecha del cargo del mes, ajustada al último día si el mes es corto."""
+    return date(year, month, min(dia_cobro, calendar.monthrange(year, month)[1]))
+
+
+def due_dates(dia_cobro: int, inicio: date, today: date,
+              last_period: Optional[str] = None) -> Iterator[Tuple[str, date]]:
+    """(periodo 'YYYY-MM', fecha) de cada cargo vencido en (last_period, today].
+
+    Solo cuentan cargos con fecha entre `inicio` y `today`, ambos incluidos.
+    """
+    if last_period:
+        year, month = _next_month(int(last_period[:4]), int(last_period[5:7]))
+    else:
+        year, month = inicio.year, inicio.month
+    while (year, month) <= (today.year, today.month):
+        fecha = charge_date(year, month, dia_cobro)
+        if inicio <= fecha <= today:
+            yield f"{year:04d}-{month:02d}", fecha
+        year, month = _next_month(year, month)
+
+
+class RecurringService:
+    def __init__(self, db: DatabaseManager) -> None:
+        self.db = db
+
+    def due_charges(self, today: Optional[date] = None) -> List[RecurringCharge]:
+        """Cargos vencidos y aún no registrados, en orden de fecha."""
+        today = today or date.today()
+        charges = []
+        for rid, nombre, monto, dia, categoria, inicio, last_period in self.db.get_recurring_schedule():
+            start = date.fromisoformat(inicio[:10]) if inicio else today
+            for periodo, fecha in due_dates(dia, start, today, last_period):
+                charges.append(RecurringCharge(rid, periodo, categoria, monto, fecha.isoformat(), nombre))
+        charges.sort(key=lambda c: (c.fecha, c.recurrente_id))
+        return charges
+
+    def post_due(self, today: Optional[date] = None) -> List[int]:
+        """Registra los cargos vencidos; devuelve los ids de las transacciones nuevas."""
+        return self.db.post_recurring(self.due_charges(today))
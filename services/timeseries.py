@@ -0,0 +1,108 @@
+"""Series de tiempo para gráficos: agregación en SQLite, relleno y reducción.
+
+La suma por día/semana/mes la hace SQLite (`get_totals_by_period`), así
+que a Python solo llega una fila por periodo con movimientos. Aquí se
+rellenan con cero los periodos vacíos y, si la serie supera el
+presupuesto de puntos, se reduce con Largest-Triangle-Three-Buckets
+(LTTB), que conserva picos y valles mejor que promediar o tomar uno de
+cada n.
+"""
+from datetime import date, timedelta
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from db.database import DatabaseManager
+
+# Puntos que se dibujan como máximo; más no se distinguen en un gráfico de 800 px
+MAX_POINTS = 400
+
+_UNITS = {"day": "D", "week": "W", "month": "M"}
+
+
+class Series(NamedTuple):
+    dates: np.ndarray    # datetime64[D], inicio de cada periodo
+    values: np.ndarray   # float64, en unidades
+
+
+def _period_start(day: date, bucket: str) -> np.datetime64:
+    if bucket == "week":
+        return np.datetime64(day - timedelta(days=day.weekday()), "D")
+    return np.datetime64(day, _UNITS[bucket]).astype("M8[D]")
+
+
+def fill_gaps(rows: Sequence[Tuple[str, int]], start: date, end: date, bucket: str = "day") -> Series:
+    """Serie densa con un valor por periodo entre `start` y `end` (exclusivo).
+
+    `rows` son (periodo, centavos) como los devuelve `get_totals_by_period`.
+    """
+    if bucket not in _UNITS:
+        raise ValueError(f"Agrupación no válida: {bucket}")
+    first = _period_start(start, bucket)
+    last = _period_start(end - timedelta(days=1), bucket)
+    if bucket == "month":
+        dates = np.arange(first.astype("M8[M]"), last.astype("M8[M]") + 1).astype("M8[D]")
+        step = None
+    else:
+        step = 7 if bucket == "week" else 1
+        dates = np.arange(first, last + 1, step)
+    values = np.zeros(len(dates))
+    if rows:
+        if bucket == "month":
+            idx = (np.array([r[0] for r in rows], dtype="M8[M]") - first.astype("M8[M]")).astype(np.int64)
+        else:
+            idx = (np.array([r[0] for r in rows], dtype="M8[D]") - first).astype(np.int64) // step
+        keep = (idx >= 0) & (idx < len(dates))
+        np.add.at(values, idx[keep], np.array([r[1] for r in rows], dtype=float)[keep] / 100)
+    return Series(dates, values)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce (x, y) a `threshold` puntos con Largest-Triangle-Three-Buckets.
+
+    `x` puede ser numérico o datetime64. Se conservan siempre el primer y
+    el último punto; de cada cubeta intermedia se elige el que forma el
+    triángulo de mayor área con el punto ya elegido y la media de la
+    cubeta siguiente.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return x, y
+    xf = x.astype("M8[D]").astype(np.int64).astype(float) if np.issubdtype(x.dtype, np.datetime64) else np.asarray(x, dtype=float)
+    yf = np.asarray(y, dtype=float)
+
+    # Límites de las threshold-2 cubetas que reparten los puntos interiores
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Media de la cubeta siguiente (o el último punto en la última cubeta)
+        if i + 2 < len(edges):
+            nlo, nhi = edges[i + 1], edges[i + 2]
+            cx, cy = xf[nlo:nhi].mean(), yf[nlo:nhi].mean()
+        else:
+            cx, cy = xf[-1], yf[-1]
+        ax, ay = xf[a], yf[a]
+        area = np.abs((ax - cx) * (yf[lo:hi] - ay) - (ax - xf[lo:hi]) * (cy - ay))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return x[selected], y[selected]
+
+
+def expense_trend(db: DatabaseManager, days: Optional[int] = 90, bucket: str = "day",
+                  max_points: int = MAX_POINTS, today: Optional[date] = None) -> Series:
+    """Gasto por periodo de los últimos `days` días (None = todo el historial), listo para dibujar."""
+    today = today or date.today()
+    end = today + timedelta(days=1)
+    if days is None:
+        rows = db.get_totals_by_period(None, end.isoformat(), bucket)
+        if not rows:
+            return Series(np.array([], dtype="M8[D]"), np.array([]))
+        start = date.fromisoformat(rows[0][0][:10] if bucket != "month" else rows[0][0] + "-01")
+    else:
+        start = end - timedelta(days=days)
+        rows = db.get_totals_by_period(start.isoformat(), end.isoformat(), bucket)
+    series = fill_gaps(rows, start, end, bucket)
+    return Series(*lttb(series.dates, series.values, max_points))
@@ -0,0 +1,21 @@
+"""Dobles compartidos por las pruebas."""
+
+
+class FakeTk:
+    """Sustituto mínimo de after/after_cancel; run() avanza el reloj."""
+    def __init__(self):
+        self.pending = {}
+        self._next = 0
+
+    def after(self, ms, fn):
+        self._next += 1
+        self.pending[str(self._next)] = fn
+        return str(self._next)
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run(self, ticks):
+        for _ in range(ticks):
+            for after_id in list(self.pending):
+                self.pending.pop(after_id)()
@@ -0,0 +1,104 @@
+import asyncio
+import inspect
+import threading
+from db.async_database import READ_METHODS, WRITE_METHODS, AsyncDatabaseManager
+from db.database import DatabaseManager
+from ui.async_bridge import TkAsyncioBridge
+from tests.fakes import FakeTk
+
+
+def test_every_public_method_is_mirrored():
+    public = {n for n, v in inspect.getmembers(DatabaseManager, inspect.isfunction) if not n.startswith("_")}
+    not_mirrored = {"connect", "close", "init_db", "iter_transactions", "cache_stats", "clear_cache",
+                    "data_generation"}
+    assert public - not_mirrored == set(READ_METHODS) | set(WRITE_METHODS)
+
+
+def test_writes_are_serialized_and_reads_run_concurrently(tmp_path):
+    db = DatabaseManager(str(tmp_path / "async.db"), pooled=True)
+    adb = AsyncDatabaseManager(db)
+    writer_threads = set()
+    original = db.add_transaction_atomic
+
+    def tracked(*args):
+        writer_threads.add(threading.get_ident())
+        return original(*args)
+    db.add_transaction_atomic = tracked
+
+    async def scenario():
+        ids = await asyncio.gather(*(
+            adb.add_transaction_atomic("Ingreso", "Sueldo", 10.0, f"2026-01-{d:02d}", "", "Efectivo")
+            for d in range(1, 11)
+        ))
+        summary, page = await asyncio.gather(adb.get_summary(), adb.get_transactions(limit=3))
+        return ids, summary, page
+
+    try:
+        ids, summary, page = asyncio.run(scenario())
+    finally:
+        adb.close()
+        db.close()
+    assert ids == list(range(1, 11))  # en el orden en que se encolaron
+    assert len(writer_threads) == 1
+    assert summary == (100.0, 0.0)
+    assert [r[4] for r in page] == ["2026-01-10", "2026-01-09", "2026-01-08"]
+
+
+def test_bridge_drives_coroutines_on_the_tk_thread():
+    root = FakeTk()
+    bridge = TkAsyncioBridge(root)
+    bridge.start()
+    results, errors = [], []
+    tk_thread = threading.get_ident()
+
+    async def work():
+        value = await asyncio.get_running_loop().run_in_executor(None, lambda: 21 * 2)
+        return value, threading.get_ident()
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    bridge.spawn(work(), on_done=results.append)
+    bridge.spawn(fail(), on_error=errors.append)
+    for _ in range(200):
+        root.run(1)
+        if results and errors:
+            break
+        threading.Event().wait(0.001)
+    bridge.close()
+    assert results == [(42, tk_thread)]
+    assert str(errors[0]) == "boom"
+    assert not bridge.running
+
+
+def test_view_loader_discards_stale_loads(tmp_path):
+    from ui.view_loader import ViewLoader
+
+    db = DatabaseManager(str(tmp_path / "views.db"), pooled=True)
+    db.add_transaction("Ingreso", "Sueldo", 80.0, "2026-01-01", "", "Efectivo")
+    adb = AsyncDatabaseManager(db)
+    root = FakeTk()
+    bridge = TkAsyncioBridge(root)
+    bridge.start()
+    loader = ViewLoader(bridge, adb)
+    release = threading.Event()
+    shown = []
+
+    def slow_view(db):
+        release.wait(5)
+        return "vieja"
+
+    loader.load(slow_view, shown.append)
+    root.run(2)
+    loader.load(lambda db: db.get_summary(), shown.append)  # el usuario cambia de vista
+    release.set()
+    for _ in range(200):
+        root.run(1)
+        if shown:
+            break
+        threading.Event().wait(0.001)
+    root.run(5)
+    bridge.close()
+    adb.close()
+    db.close()
+    assert shown == [(80.0, 0.0)]
@@ -0,0 +1,46 @@
+from datetime import date
+import pytest
+from db.database import DatabaseManager
+from services.budget_service import BudgetPeriod, BudgetService
+
+
+def test_periods_are_half_open():
+    assert BudgetPeriod.month(2026, 12) == (date(2026, 12, 1), date(2027, 1, 1))
+    assert BudgetPeriod.quarter(2026, 2) == (date(2026, 4, 1), date(2026, 7, 1))
+    assert BudgetPeriod.quarter(2026, 2).months == 3
+    with pytest.raises(ValueError):
+        BudgetPeriod.custom(date(2026, 1, 2), date(2026, 1, 2))
+
+
+def test_compare_month_with_projection(tmp_path):
+    db = DatabaseManager(str(tmp_path / "budget.db"))
+    db.update_budget("Comida", 300.0)
+    db.update_budget("Renta", 1000.0)
+    db.add_transaction("Gasto", "Comida", 100.0, "2026-04-01", "", "Efectivo")
+    db.add_transaction("Gasto", "Comida", 50.0, "2026-04-10", "", "Efectivo")
+    db.add_transaction("Gasto", "Comida", 999.0, "2026-05-01", "Fuera del mes", "Efectivo")
+    db.add_transaction("Ingreso", "Comida", 70.0, "2026-04-05", "No es gasto", "Efectivo")
+
+    # 10 de 30 días transcurridos
+    comida, renta = BudgetService(db).compare(BudgetPeriod.month(2026, 4), today=date(2026, 4, 10))
+
+    assert comida.category == "Comida"
+    assert comida.spent == 150.0
+    assert comida.remaining == 150.0
+    assert comida.percent_used == pytest.approx(50.0)
+    assert comida.projected == pytest.approx(450.0)
+    assert comida.projected_overrun == pytest.approx(150.0)
+    assert renta.spent == 0.0 and renta.projected_overrun == 0.0
+
+
+def test_compare_quarter_scales_monthly_limit(tmp_path):
+    db = DatabaseManager(str(tmp_path / "budget.db"))
+    db.update_budget("Comida", 100.0)
+    db.add_transaction("Gasto", "Comida", 120.0, "2026-01-15", "", "Efectivo")
+    db.add_transaction("Gasto", "Comida", 90.0, "2026-03-31", "", "Efectivo")
+
+    [status] = BudgetService(db).compare(BudgetPeriod.quarter(2026, 1), today=date(2026, 6, 1))
+
+    assert status.limit == 300.0
+    assert status.spent == 210.0
+    assert status.projected == 210.0
@@ -0,0 +1,27 @@
+import numpy as np
+from ui.chart_layer import Debouncer, fill_vertices
+from tests.fakes import FakeTk
+
+
+def test_debouncer_delivers_only_the_last_value_per_frame():
+    root = FakeTk()
+    received = []
+    debounce = Debouncer(root, received.append)
+    for value in range(100):
+        debounce(value)
+    assert len(root.pending) == 1 and received == []
+    root.run(1)
+    assert received == [99]
+
+    debounce(5)
+    debounce.flush()
+    assert received == [99, 5] and not root.pending
+    debounce(6)
+    debounce.cancel()
+    root.run(1)
+    assert received == [99, 5]
+
+
+def test_fill_vertices_outline_the_band():
+    verts = fill_vertices(np.array([0, 1, 2]), np.array([1.0, 2.0, 3.0]), 0.0)
+    assert verts.tolist() == [[0, 1], [1, 2], [2, 3], [2, 0], [1, 0], [0, 0]]
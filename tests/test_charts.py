@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+from ui.charts import ChartEngine
+
+
+class _FakeFigure:
+    def __init__(self, figsize=(8, 4), dpi=100, facecolor=None):
+        self.cleared = 0
+        self.canvas = None
+        self.set_size_inches(*figsize)
+        self.set_dpi(dpi)
+
+    def set_size_inches(self, w, h):
+        self.size = (w, h)
+
+    def set_dpi(self, dpi):
+        self.dpi = dpi
+
+    def set_facecolor(self, color):
+        pass
+
+    def clear(self):
+        self.cleared += 1
+
+    @property
+    def bbox(self):
+        return SimpleNamespace(width=self.size[0] * self.dpi, height=self.size[1] * self.dpi)
+
+
+class _FakeWidget:
+    def __init__(self, master):
+        self.master = master
+        self.alive = True
+
+    def winfo_exists(self):
+        return self.alive
+
+    def destroy(self):
+        self.alive = False
+
+
+class _FakeCanvas:
+    def __init__(self, fig, master):
+        fig.canvas = self
+        self.widget = _FakeWidget(master)
+
+    def get_tk_widget(self):
+        return self.widget
+
+
+def _detach(fig):
+    fig.canvas = None
+
+
+class _FakeEngine(ChartEngine):
+    def _load_backend(self):
+        return _FakeFigure, _FakeCanvas, _detach
+
+
+def test_figures_are_pooled_by_slot_and_released_explicitly():
+    engine = _FakeEngine()
+    master = object()
+    fig = engine.figure("reports.trend", figsize=(8, 4))
+    canvas = engine.canvas(fig, master)
+    assert engine.canvas(fig, master) is canvas
+    stats = engine.stats()
+    assert (stats.live, stats.pooled, stats.created) == (1, 0, 1)
+    assert stats.buffer_bytes == 800 * 400 * 4
+
+    engine.release_all()
+    assert not canvas.widget.alive and fig.canvas is None and fig.cleared == 1
+    assert (engine.stats().live, engine.stats().pooled) == (0, 1)
+
+    # El mismo slot reutiliza la figura; otro slot crea una nueva
+    assert engine.figure("reports.trend", figsize=(6, 3)) is fig and fig.size == (6, 3)
+    other = engine.figure("dashboard.gastos")
+    assert other is not fig
+    stats = engine.stats()
+    assert (stats.created, stats.reused, stats.pooled) == (2, 1, 0)
+
+    # Liberar dos veces o una figura nunca montada no rompe nada
+    engine.release(fig)
+    engine.release(fig)
+    assert engine.stats().pooled == 1
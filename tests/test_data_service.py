@@ -0,0 +1,65 @@
+import csv
+import gzip
+import pytest
+from db.database import DatabaseManager
+from services.data_service import DataService, ExportCancelled
+
+
+def test_streaming_export_has_no_row_cap_and_honours_filters(tmp_path):
+    db = DatabaseManager(str(tmp_path / "export.db"))
+    db.add_transactions_bulk([
+        ("Gasto" if i % 2 else "Ingreso", "Comida", 1.0, f"2025-{1 + i % 12:02d}-01", "", "Efectivo")
+        for i in range(12_000)
+    ])
+    ds = DataService(db)
+
+    out = tmp_path / "todo.csv.gz"
+    calls = []
+    assert ds.export_transactions_csv(str(out), progress=lambda done, total: calls.append((done, total))) == 12_000
+    with gzip.open(out, "rt", encoding="utf-8") as f:
+        assert sum(1 for _ in csv.reader(f)) == 12_001
+    assert calls[-1] == (12_000, 12_000)
+
+    filtered = tmp_path / "enero.csv"
+    assert ds.export_transactions_csv(str(filtered), start="2025-01-01", end="2025-02-01", tipo="Ingreso") == 1_000
+
+    cancelled = tmp_path / "cancelado.csv"
+    with pytest.raises(ExportCancelled):
+        ds.export_transactions_csv(str(cancelled), progress=lambda done, total: False)
+    assert not cancelled.exists()
+
+
+def test_online_backup_copies_live_wal_database(tmp_path):
+    db = DatabaseManager(str(tmp_path / "live.db"), pooled=True)
+    try:
+        db.add_transaction("Ingreso", "Sueldo", 100.0, "2026-01-01", "", "Transferencia")
+        path = DataService(db).backup_database(str(tmp_path / "copias"))
+    finally:
+        db.close()
+
+    assert DatabaseManager(path).get_summary() == (100.0, 0.0)
+
+
+def test_backup_store_deduplicates_verifies_restores_and_prunes(tmp_path):
+    from services.backup_store import BackupStore
+
+    db_file = str(tmp_path / "live.db")
+    db = DatabaseManager(db_file)
+    db.add_transactions_bulk([("Gasto", "Comida", 1.0, "2025-01-01", "x" * 200, "Efectivo")] * 5000)
+    store = BackupStore(str(tmp_path / "store"))
+
+    first = store.create(db_file)
+    db.add_transaction("Ingreso", "Sueldo", 50.0, "2026-01-01", "", "Transferencia")
+    second = store.create(db_file)
+
+    assert first["new_bytes"] == first["size"]
+    assert second["new_bytes"] < second["size"] // 2
+    assert store.verify(second["id"]) == []
+
+    restored = str(tmp_path / "restaurada.db")
+    store.restore(first["id"], restored)
+    assert DatabaseManager(restored).get_summary() == (0.0, 5000.0)
+
+    assert store.prune(keep=1) == [first["id"]]
+    assert store.list() == [second["id"]]
+    assert store.verify(second["id"]) == []
@@ -1,7 +1,10 @@
 import os
 import tempfile
 import sqlite3
+import threading
+import pytest
 from db.database import DatabaseManager
+from db.events import DataChanged
 
 
 def test_credit_usage_and_payment(tmp_path):
@@ -20,3 +23,316 @@ def test_credit_usage_and_payment(tmp_path):
     db.add_transaction("PagoCredito", "Financiero", 20.0, "2026-01-03", "Abono", "Transferencia")
     lim, used_after = db.get_credit_info()
     assert used_after == 10.0
+
+
+def test_pooled_manager_reads_own_writes_and_closes(tmp_path):
+    db = DatabaseManager(str(tmp_path / "pooled.db"), pooled=True)
+    try:
+        db.add_transaction("Ingreso", "Sueldo", 100.0, "2026-01-01", "Pago", "Transferencia")
+        db.add_transaction("Gasto", "Comida", 40.0, "2026-01-02", "Super", "Efectivo")
+        assert db.get_summary() == (100.0, 40.0)
+
+        with db._reading() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    finally:
+        db.close()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        db.get_summary()
+
+
+def test_pooled_manager_rolls_back_on_credit_limit(tmp_path):
+    db = DatabaseManager(str(tmp_path / "pooled.db"), pooled=True)
+    try:
+        db.update_credit_limit(50.0)
+        with pytest.raises(ValueError):
+            db.add_transaction("Gasto", "Ropa", 80.0, "2026-01-03", "", "CreditoInterno")
+        assert db.get_transactions() == []
+        assert db.get_credit_info() == (50.0, 0)
+    finally:
+        db.close()
+
+
+def test_bulk_insert_returns_ids_and_applies_credit_once(tmp_path):
+    db = DatabaseManager(str(tmp_path / "bulk.db"))
+    db.update_credit_limit(100.0)
+
+    rows = [
+        ("Gasto", "Comida", 60.0, "2026-01-01", "Cena", "CreditoInterno"),
+        ("PagoCredito", "Financiero", 50.0, "2026-01-02", "Abono", "Transferencia"),
+        ("Gasto", "Ropa", 80.0, "2026-01-03", "Zapatos", "CreditoInterno"),
+        ("Ingreso", "Sueldo", 500.0, "2026-01-04", "Pago", "Transferencia"),
+    ]
+    ids = db.add_transactions_bulk(rows)
+
+    assert len(ids) == 4
+    stored = {row[0]: row[1:] for row in db.get_transactions(limit=10)}
+    assert [stored[i] for i in ids] == rows
+    assert db.get_credit_info() == (100.0, 90.0)
+
+
+def test_bulk_insert_reports_row_over_limit_and_rolls_back(tmp_path):
+    from db.database import CreditLimitExceeded
+
+    db = DatabaseManager(str(tmp_path / "bulk.db"))
+    db.update_credit_limit(100.0)
+
+    rows = [
+        ("Gasto", "Comida", 60.0, "2026-01-01", "", "CreditoInterno"),
+        ("Ingreso", "Sueldo", 10.0, "2026-01-02", "", "Efectivo"),
+        ("Gasto", "Comida", 50.0, "2026-01-03", "", "CreditoInterno"),
+    ]
+    with pytest.raises(CreditLimitExceeded) as exc:
+        db.add_transactions_bulk(rows)
+
+    assert exc.value.row_index == 2
+    assert db.get_transactions() == []
+    assert db.get_credit_info() == (100.0, 0)
+
+
+def test_monthly_summary_tracks_insert_update_delete(tmp_path):
+    db = DatabaseManager(str(tmp_path / "rollup.db"))
+    keep = db.add_transaction("Gasto", "Comida", 30.0, "2026-01-05", "", "Efectivo")
+    gone = db.add_transaction("Gasto", "Renta", 200.0, "2026-01-06", "", "Efectivo")
+    db.add_transaction("Ingreso", "Sueldo", 1000.0, "2026-02-01", "", "Transferencia")
+
+    db.delete_transaction(gone)
+    with db._writing() as conn:
+        conn.execute("UPDATE transacciones SET monto = 4500, fecha = '2026-02-10' WHERE id = ?", (keep,))
+
+    assert db.get_summary() == (1000.0, 45.0)
+    assert db.get_expenses_by_category() == [("Comida", 45.0)]
+    with db._reading() as conn:
+        rows = conn.execute("SELECT mes, tipo, categoria, total, n FROM resumen_mensual ORDER BY mes, tipo").fetchall()
+    assert rows == [("2026-02", "Gasto", "Comida", 4500, 1), ("2026-02", "Ingreso", "Sueldo", 100000, 1)]
+
+
+def test_amounts_are_stored_as_exact_cents(tmp_path):
+    db = DatabaseManager(str(tmp_path / "cents.db"))
+    db.update_credit_limit(1.0)
+    db.add_transactions_bulk([("Gasto", "Café", 0.1, "2026-03-01", "", "CreditoInterno")] * 10)
+    db.add_transaction("Ingreso", "Sueldo", 0.3, "2026-03-02", "", "Efectivo")
+
+    assert db.get_totals_cents() == (30, 100)
+    assert db.get_summary() == (0.3, 1.0)
+    assert db.get_credit_info() == (1.0, 1.0)
+    with pytest.raises(sqlite3.IntegrityError):
+        with db._writing() as conn:
+            conn.execute("UPDATE transacciones SET monto = 0.5")
+
+    from services.finance_math import FinanceMath
+    months, ingresos, gastos = FinanceMath.monthly_flows(db)
+    assert months == ["2026-03"]
+    assert ingresos.dtype.name == "int64" and (ingresos - gastos).tolist() == [-70]
+
+
+def test_monthly_summary_is_backfilled_for_existing_database(tmp_path):
+    db_file = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(db_file)
+    conn.execute('''
+        CREATE TABLE transacciones (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, tipo TEXT NOT NULL, categoria TEXT,
+            monto REAL NOT NULL, fecha TEXT NOT NULL, descripcion TEXT, metodo_pago TEXT
+        )
+    ''')
+    conn.executemany("INSERT INTO transacciones (tipo, categoria, monto, fecha, descripcion, metodo_pago) VALUES (?, ?, ?, ?, ?, ?)", [
+        ("Ingreso", "Sueldo", 500.0, "2025-12-01", "", "Transferencia"),
+        ("Gasto", "Comida", 20.0, "2025-12-02", "", "Efectivo"),
+        ("Gasto", "Comida", 5.0, "2026-01-02", "", "Efectivo"),
+    ])
+    conn.commit()
+    conn.close()
+
+    db = DatabaseManager(db_file)
+    assert db.get_summary() == (500.0, 25.0)
+    assert db.get_expenses_by_category() == [("Comida", 25.0)]
+
+
+def test_keyset_pages_walk_forward_and_backward(tmp_path):
+    db = DatabaseManager(str(tmp_path / "pages.db"))
+    db.add_transactions_bulk([
+        ("Gasto", "Comida", float(i), f"2026-01-{1 + i // 3:02d}", "", "Efectivo") for i in range(10)
+    ])
+    expected = db.get_transactions(limit=100)
+
+    seen, page = [], db.get_transactions_page(limit=4)
+    while page:
+        seen.extend(page)
+        page = db.get_transactions_page((page[-1][4], page[-1][0]), limit=4)
+    assert seen == expected
+
+    last = expected[-1]
+    assert db.get_transactions_page((last[4], last[0]), limit=4, backward=True) == expected[-5:-1]
+    assert db.get_transaction(expected[0][0]) == expected[0]
+
+
+def test_search_transactions_prefix_ranked_and_synced(tmp_path):
+    db = DatabaseManager(str(tmp_path / "search.db"))
+    netflix = db.add_transaction("Gasto", "Entretenimiento", 12.0, "2026-01-01", "Netflix mensual", "Efectivo")
+    db.add_transaction("Gasto", "Comida", 30.0, "2026-01-02", "Supermercado Central", "Efectivo")
+    db.add_transaction("Gasto", "Comida", 8.0, "2026-01-03", "Café", "Efectivo")
+
+    rows, nxt = db.search_transactions("net")
+    assert [r[0] for r in rows] == [netflix] and nxt is None
+    assert [r[5] for r in db.search_transactions("cafe")[0]] == ["Café"]
+    assert len(db.search_transactions("comi")[0]) == 2
+
+    first, nxt = db.search_transactions("comida", limit=1)
+    second, last = db.search_transactions("comida", limit=1, cursor=nxt)
+    assert len(first) == len(second) == 1 and first != second and last is None
+
+    db.delete_transaction(netflix)
+    assert db.search_transactions("netflix") == ([], None)
+
+
+def test_search_ranks_the_full_match_set(tmp_path):
+    db = DatabaseManager(str(tmp_path / "rank.db"))
+    best = db.add_transaction("Gasto", "Ocio", 5.0, "2020-01-01", "Netflix", "Efectivo")
+    db.add_transactions_bulk([("Gasto", "Ocio", 1.0, "2026-01-01", f"Netflix cuota extra número {i}", "Efectivo")
+                              for i in range(1200)])
+    rows, _ = db.search_transactions("netflix", limit=5)
+    assert rows[0][0] == best  # la más antigua pero la más relevante
+
+
+def test_like_fallback_treats_wildcards_literally(tmp_path):
+    db = DatabaseManager(str(tmp_path / "like.db"))
+    literal = db.add_transaction("Gasto", "Comida", 1.0, "2026-01-01", "Descuento 50%", "Efectivo")
+    db.add_transaction("Gasto", "Comida", 1.0, "2026-01-02", "Menu_dia", "Efectivo")
+    db.add_transaction("Gasto", "Comida", 1.0, "2026-01-03", "Menu del dia 500", "Efectivo")
+    db._has_fts = False
+    assert [r[0] for r in db.search_transactions("50%")[0]] == [literal]
+    assert [r[5] for r in db.search_transactions("u_d")[0]] == ["Menu_dia"]
+
+
+def test_balance_queries_follow_writes(tmp_path):
+    db = DatabaseManager(str(tmp_path / "balance.db"))
+    db.add_transaction("Ingreso", "Sueldo", 1000.0, "2026-01-01", "", "Transferencia")
+    gasto = db.add_transaction("Gasto", "Renta", 400.0, "2026-01-05", "", "Efectivo")
+    db.add_transaction("PagoCredito", "Financiero", 50.0, "2026-01-06", "", "Efectivo")
+
+    assert db.balance_at("2025-12-31") == 0.0
+    assert db.balance_at("2026-01-04") == 1000.0
+    assert db.balance_at("2026-03-01") == 600.0
+    assert db.net_flow("2026-01-02", "2026-01-06") == -400.0
+
+    # Actualización en sitio, fuera de rango (reconstrucción) y borrado
+    db.add_transaction("Gasto", "Comida", 25.5, "2026-01-03", "", "Efectivo")
+    db.add_transaction("Ingreso", "Bono", 100.0, "2026-02-01", "", "Efectivo")
+    db.delete_transaction(gasto)
+    assert db.balance_series("2025-12-31", "2026-02-02", step=8) == [
+        ("2025-12-31", 0.0), ("2026-01-08", 974.5), ("2026-01-16", 974.5),
+        ("2026-01-24", 974.5), ("2026-02-01", 1074.5),
+    ]
+    assert db.balance_at("2026-02-01") == DatabaseManager(db.db_name).balance_at("2026-02-01")
+
+
+def test_credit_ledger_reverses_clamped_payment_and_reconciles(tmp_path, monkeypatch):
+    monkeypatch.setattr("db.credit_ledger.SNAPSHOT_INTERVAL", 3)
+    db = DatabaseManager(str(tmp_path / "ledger.db"))
+    db.update_credit_limit(100.0)
+    db.add_transaction("Gasto", "Comida", 30.0, "2026-01-01", "", "CreditoInterno")
+    pago = db.add_transaction("PagoCredito", "Financiero", 50.0, "2026-01-02", "", "Efectivo")
+    assert db.get_credit_info() == (100.0, 0.0)
+
+    # Antes se devolvían los 50 completos; el libro solo revierte los 30 aplicados
+    db.delete_transaction(pago)
+    assert db.get_credit_info() == (100.0, 30.0)
+    with db._reading() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM credito_snapshots").fetchone()[0] == 1
+        with pytest.raises(sqlite3.IntegrityError):
+            conn.execute("DELETE FROM credito_movimientos")
+
+    assert db.reconcile() == (30.0, 30.0, 0.0, 0.0, [])
+    db.update_credit_usage(5.0)
+    report = db.reconcile()
+    assert (report.difference, report.adjustments) == (5.0, 5.0)
+    db.reconcile(fix=True)
+    assert db.get_credit_info() == (100.0, 30.0)
+    assert db.reconcile().difference == 0.0
+
+
+def test_read_cache_hits_and_invalidation(tmp_path):
+    db_file = str(tmp_path / "cache.db")
+    db = DatabaseManager(db_file, pooled=True, cache_size=2)
+    try:
+        db.add_transaction("Ingreso", "Sueldo", 100.0, "2026-01-01", "", "Efectivo")
+        assert db.get_summary() == (100.0, 0.0)
+        assert db.get_summary() == (100.0, 0.0)
+        stats = db.cache_stats()
+        assert stats.hits >= 1 and stats.size >= 1
+
+        # Escritura propia: invalida
+        db.add_transaction("Gasto", "Comida", 40.0, "2026-01-02", "", "Efectivo")
+        assert db.get_summary() == (100.0, 40.0)
+
+        # Escritura de otra conexión (otro proceso): la detecta data_version
+        other = sqlite3.connect(db_file)
+        other.execute("INSERT INTO transacciones (tipo, categoria, monto, fecha) VALUES ('Gasto', 'Renta', 1000, '2026-01-03')")
+        other.commit()
+        other.close()
+        assert db.get_summary() == (100.0, 50.0)
+        assert db.balance_at("2026-01-31") == 50.0
+
+        # LRU acotada
+        db.get_plans(); db.get_recurring(); db.get_credit_info()
+        assert db.cache_stats().size == 2 and db.cache_stats().evictions >= 1
+    finally:
+        db.close()
+
+
+def test_deleting_charge_then_payment_leaves_clean_ledger(tmp_path):
+    db = DatabaseManager(str(tmp_path / "ledger.db"))
+    db.update_credit_limit(100.0)
+    cargo = db.add_transaction("Gasto", "Comida", 30.0, "2026-01-01", "", "CreditoInterno")
+    pago = db.add_transaction("PagoCredito", "Financiero", 50.0, "2026-01-02", "", "Efectivo")
+
+    db.delete_transaction(cargo)
+    assert db.get_credit_info() == (100.0, 0.0)
+    assert db.reconcile() == (0.0, 0.0, 0.0, 0.0, [])
+
+    db.delete_transaction(pago)
+    assert db.get_transactions() == []
+    assert db.get_credit_info() == (100.0, 0.0)
+    assert db.reconcile() == (0.0, 0.0, 0.0, 0.0, [])
+
+
+def test_balance_index_is_not_patched_twice_when_rebuilt_during_commit(tmp_path):
+    db = DatabaseManager(str(tmp_path / "race.db"), pooled=True)
+    try:
+        db.add_transaction("Ingreso", "Sueldo", 100.0, "2026-01-01", "", "Efectivo")
+        assert db.balance_at("2026-01-31") == 100.0
+        original = db._apply_flows
+
+        def apply_after_concurrent_rebuild(flows):
+            # Un lector descarta y reconstruye el índice justo después del commit
+            def reader():
+                db._balance_index = None
+                db.balance_at("2026-01-31")
+            thread = threading.Thread(target=reader)
+            thread.start()
+            thread.join(0.2)
+            original(flows)
+            return thread
+
+        threads = []
+        db._apply_flows = lambda flows: threads.append(apply_after_concurrent_rebuild(flows))
+        db.add_transaction("Gasto", "Comida", 30.0, "2026-01-02", "", "Efectivo")
+        threads[0].join(5)
+        assert db.balance_at("2026-01-31") == 70.0
+    finally:
+        db.close()
+
+
+def test_unparseable_flow_date_drops_index_instead_of_failing_the_write(tmp_path):
+    db = DatabaseManager(str(tmp_path / "baddate.db"), pooled=True)
+    events = []
+    db.events.subscribe(DataChanged, events.append)
+    try:
+        db.add_transaction("Ingreso", "Sueldo", 100.0, "2026-01-01", "", "Efectivo")
+        assert db.balance_at("2026-01-31") == 100.0
+        db.add_transaction("Gasto", "Comida", 30.0, "01/02/2026", "", "Efectivo")
+        assert db.count_transactions() == 2
+        assert db._balance_index is None and len(events) == 2
+    finally:
+        db.close()
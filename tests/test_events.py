@@ -0,0 +1,103 @@
+import threading
+import sqlite3
+from db.database import DatabaseManager
+from db.events import CREDIT_TABLES, TX_TABLES, DataChanged, EventBus
+from ui.async_bridge import TkAsyncioBridge
+from ui.event_coalescer import FrameCoalescer
+from tests.fakes import FakeTk
+
+
+def test_writes_publish_tables_ids_and_months(tmp_path):
+    db = DatabaseManager(str(tmp_path / "events.db"), pooled=True)
+    events = []
+    db.events.subscribe(DataChanged, events.append)
+    try:
+        ids = db.add_transactions_bulk([
+            ("Ingreso", "Sueldo", 500.0, "2026-01-31", "", "Efectivo"),
+            ("Gasto", "Comida", 20.0, "2026-02-01", "", "CreditoInterno"),
+        ])
+        db.delete_transaction(9999)  # no existe: nada que avisar
+        db.add_recurring("Netflix", 10.0, 5, "Suscripción")
+    finally:
+        db.close()
+    assert len(events) == 2
+    bulk, recurring = events
+    assert bulk.tables == frozenset(TX_TABLES + CREDIT_TABLES)
+    assert bulk.ids_for("transacciones") == frozenset(ids)
+    assert bulk.months == {"2026-01", "2026-02"}
+    assert recurring.tables == {"transacciones_recurrentes"} and not recurring.touches(TX_TABLES)
+
+
+def test_cache_drops_only_entries_of_changed_tables(tmp_path):
+    db = DatabaseManager(str(tmp_path / "cache.db"), pooled=True)
+    try:
+        db.create_plan("Viaje", 1000.0, "2026-12-31", "#00FFFF")
+        db.get_plans(); db.get_summary()
+        plans_gen, tx_gen = db.data_generation("planes_ahorro"), db.data_generation(*TX_TABLES)
+
+        db.add_transaction("Ingreso", "Sueldo", 100.0, "2026-01-01", "", "Efectivo")
+        hits = db.cache_stats().hits
+        assert len(db.get_plans()) == 1
+        assert db.cache_stats().hits == hits + 1
+        assert db.get_summary() == (100.0, 0.0)
+        assert db.data_generation("planes_ahorro") == plans_gen
+        assert db.data_generation(*TX_TABLES) != tx_gen
+
+        db.clear_cache()  # sin detalle: todo queda viejo
+        assert db.data_generation("planes_ahorro") != plans_gen
+        assert db.cache_stats().size == 0
+    finally:
+        db.close()
+
+
+def test_merge_unions_changes_and_unknown_wins():
+    a = DataChanged(frozenset({"transacciones"}), (("transacciones", frozenset({1})),), frozenset({"2026-01"}))
+    b = DataChanged(frozenset({"transacciones", "planes_ahorro"}), (("transacciones", frozenset({2})),),
+                    frozenset({"2026-02"}))
+    merged = a.merge(b)
+    assert merged.tables == {"transacciones", "planes_ahorro"}
+    assert merged.ids_for("transacciones") == {1, 2} and merged.months == {"2026-01", "2026-02"}
+    assert a.merge(DataChanged()).unknown and DataChanged().touches(["metas_ahorro"])
+
+
+def test_coalescer_delivers_one_event_per_frame_on_the_tk_thread():
+    root = FakeTk()
+    bridge = TkAsyncioBridge(root)
+    bridge.start()
+    bus = EventBus()
+    coalescer = FrameCoalescer(root, bus, bridge)
+    received, threads = [], []
+    coalescer.subscribe(lambda event: (received.append(event), threads.append(threading.get_ident())))
+
+    for tx_id in range(1, 4):
+        bus.publish(DataChanged(frozenset({"transacciones"}), (("transacciones", frozenset({tx_id})),)))
+    worker = threading.Thread(target=bus.publish, args=(DataChanged(frozenset({"planes_ahorro"})),))
+    worker.start()
+    worker.join()
+    root.run(3)
+    bridge.close()
+    coalescer.close()
+
+    assert len(received) == 1
+    assert received[0].tables == {"transacciones", "planes_ahorro"}
+    assert received[0].ids_for("transacciones") == {1, 2, 3}
+    assert threads == [threading.get_ident()]
+
+
+def test_own_commits_without_pool_are_not_taken_for_foreign(tmp_path):
+    db = DatabaseManager(str(tmp_path / "own.db"))
+    events = []
+    db.events.subscribe(DataChanged, events.append)
+    budgets = db.data_generation("presupuestos")
+    db.add_transaction("Ingreso", "Sueldo", 100.0, "2026-01-01", "", "Efectivo")
+    db.balance_at("2026-01-31")
+    db.add_transaction("Gasto", "Comida", 30.0, "2026-01-01", "", "Efectivo")
+    assert db.data_generation("presupuestos") == budgets
+    assert not any(e.unknown for e in events) and db._balance_index is not None
+
+    other = sqlite3.connect(db.db_name)
+    other.execute("DELETE FROM presupuestos")
+    other.commit()
+    other.close()
+    assert db.data_generation("presupuestos") == budgets + 1 and events[-1].unknown
+    db.close()
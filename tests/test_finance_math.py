@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from services.finance_math import FinanceMath
+
+
+def _loop_growth(principal, contribution, rate_annual, months):
+    amount, out = principal, [principal]
+    for _ in range(months):
+        amount += amount * rate_annual / 12 + contribution
+        out.append(amount)
+    return out
+
+
+def test_compound_growth_grid_matches_monthly_loop():
+    rates = np.array([0.0, 0.05, 0.08, 0.12])
+    contributions = np.array([0.0, 100.0, 250.0])
+    t, grid = FinanceMath.compound_growth_grid(1000.0, contributions[None, :], rates[:, None], 60)
+    assert grid.shape == (4, 3, 61) and t[-1] == 60
+    for i, r in enumerate(rates):
+        for j, c in enumerate(contributions):
+            assert grid[i, j] == pytest.approx(_loop_growth(1000.0, c, r, 60), rel=1e-12)
+
+    # El envoltorio conserva la API de listas
+    months, amounts = FinanceMath.calculate_compound_growth(1000.0, 100.0, 0.08, 12)
+    assert months == list(range(13)) and amounts == pytest.approx(_loop_growth(1000.0, 100.0, 0.08, 12))
+
+
+def test_compound_growth_grid_pads_shorter_horizons():
+    t, grid = FinanceMath.compound_growth_grid([100.0, 100.0], 10.0, 0.0, [2, 4])
+    assert t.tolist() == [0, 1, 2, 3, 4]
+    assert grid[0, :3].tolist() == [100.0, 110.0, 120.0] and np.isnan(grid[0, 3:]).all()
+    assert grid[1].tolist() == [100.0, 110.0, 120.0, 130.0, 140.0]
+    with pytest.raises(ValueError):
+        FinanceMath.compound_growth_grid(1.0, 1.0, 0.1, -1)
+
+
+def test_monte_carlo_without_volatility_matches_closed_form():
+    from services.monte_carlo import simulate
+    paths = simulate(1000.0, [100.0], 24, n_paths=50, mean_return=0.06, volatility=0.0, seed=1)
+    # Sin volatilidad el factor mensual es (1.06)^(1/12): tasa efectiva, no nominal
+    rate = 12 * (1.06 ** (1 / 12) - 1)
+    _, expected = FinanceMath.compound_growth_grid(1000.0, 100.0, rate, 24)
+    assert np.allclose(paths, expected, rtol=1e-5)
+
+
+def test_monte_carlo_is_reproducible_across_workers_and_scores_goals(tmp_path):
+    from datetime import date
+    from db.database import DatabaseManager
+    from services import monte_carlo
+
+    a = monte_carlo.simulate(0.0, [50.0, 150.0], 12, n_paths=300, seed=7, workers=1, chunk_paths=100)
+    b = monte_carlo.simulate(0.0, [50.0, 150.0], 12, n_paths=300, seed=7, workers=2, chunk_paths=100)
+    assert np.array_equal(a, b)
+
+    db = DatabaseManager(str(tmp_path / "mc.db"))
+    db.add_transaction("Ingreso", "Sueldo", 300.0, "2025-01-05", "", "Efectivo")
+    db.add_transaction("Gasto", "Comida", 200.0, "2025-01-20", "", "Efectivo")
+    db.create_plan("Fácil", 50.0, "2027-01-01", "#FFFFFF")
+    db.create_plan("Imposible", 1_000_000.0, "2027-01-01", "#FFFFFF")
+    result = monte_carlo.project(db, months=12, n_paths=2000, today=date(2026, 1, 1), seed=3, volatility=0.0)
+    assert result.paths == 2000 and result.p10.shape == (13,)
+    assert (result.p10 <= result.p50).all() and (result.p50 <= result.p90).all()
+    probs = {g.name: (g.months, g.probability) for g in result.goals}
+    assert probs == {"Fácil": (12, 1.0), "Imposible": (12, 0.0)}
+
+    # Una fecha límite muy lejana no alarga la simulación más allá del tope
+    db.create_plan("Lejano", 50.0, "2076-01-01", "#FFFFFF")
+    far = monte_carlo.project(db, months=12, n_paths=200, today=date(2026, 1, 1), seed=3, volatility=0.0)
+    goal = next(g for g in far.goals if g.name == "Lejano")
+    assert goal.months == 600 and goal.beyond_horizon and goal.probability == 1.0
+    assert not any(g.beyond_horizon for g in far.goals if g.name != "Lejano")
@@ -0,0 +1,53 @@
+from datetime import date, timedelta
+from db.database import DatabaseManager
+from services.forecast_service import ForecastService
+
+
+def test_forecast_spreads_credit_purchase_in_installments(tmp_path):
+    db = DatabaseManager(str(tmp_path / "forecast.db"))
+    today = date.today()
+    db.update_credit_limit(1000.0)
+    db.add_transaction("Ingreso", "Sueldo", 100.0, today.isoformat(), "", "Efectivo")
+    db.add_transaction_atomic("Gasto", "Compras", 90.0, today.isoformat(), "", "CreditoInterno")
+    service = ForecastService(db)
+
+    # Sin tendencia, para contar solo lo programado
+    f = service.forecast(months=3, trend_days=0)
+    assert f.dates[0] == today + timedelta(days=1)
+    # Caja: 100 - 90 de saldo contable + 90 de crédito aún sin pagar
+    assert f.start_balance == 100.0
+    # Cuotas de 30 a los 14, 28 y 42 días (índice = días - 1)
+    assert [f.balances[i] for i in (12, 13, 27, 41)] == [100.0, 70.0, 40.0, 10.0]
+    assert f.balances[-1] == 10.0 and f.overdraft_days == 0
+
+    # Un pago adelantado salda primero la cuota más próxima
+    db.add_transaction_atomic("PagoCredito", "Financiero", 30.0, today.isoformat(), "", "Transferencia")
+    f = service.forecast(months=3, trend_days=0)
+    assert f.start_balance == 70.0
+    assert [f.balances[i] for i in (13, 27, 41)] == [70.0, 40.0, 10.0]
+
+
+def test_forecast_reports_recurring_overdraft(tmp_path):
+    db = DatabaseManager(str(tmp_path / "overdraft.db"))
+    today = date.today()
+    db.add_transaction("Ingreso", "Sueldo", 50.0, today.isoformat(), "", "Efectivo")
+    db.add_recurring("Renta", 40.0, 1, "Vivienda", inicio=(today + timedelta(days=1)).isoformat())
+
+    # Dos días 1 en los próximos dos meses: 50 -> 10 -> -30
+    f = ForecastService(db).forecast(months=2, trend_days=0)
+    assert f.first_overdraft.day == 1
+    assert f.lowest_balance == -30.0 and f.lowest_date == f.first_overdraft
+    assert f.overdraft_days == (f.dates[-1].astype(date) - f.first_overdraft).days + 1
+
+
+def test_trend_leaves_credit_purchases_to_their_installments(tmp_path):
+    db = DatabaseManager(str(tmp_path / "trend.db"))
+    today = date.today()
+    db.update_credit_limit(1000.0)
+    db.add_transaction("Ingreso", "Sueldo", 100.0, today.isoformat(), "", "Efectivo")
+    db.add_transaction_atomic("Gasto", "Compras", 90.0, today.isoformat(), "", "CreditoInterno")
+
+    # La compra solo sale por sus tres cuotas; la tendencia es el ingreso del día
+    f = ForecastService(db).forecast(months=3, trend_days=30)
+    days = len(f.dates)
+    assert f.balances[-1] == 100.0 + 100.0 * days - 90.0
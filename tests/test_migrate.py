@@ -0,0 +1,90 @@
+import sqlite3
+import pytest
+from db.database import DatabaseManager
+from db.migrate import MIGRATIONS, SCHEMA_VERSION, apply_migrations, get_version
+
+
+def test_fresh_database_reaches_current_version(tmp_path):
+    db = DatabaseManager(str(tmp_path / "fresh.db"))
+    with db._reading() as conn:
+        assert get_version(conn) == SCHEMA_VERSION
+
+
+def test_up_to_date_database_only_reads_user_version(tmp_path):
+    db_file = str(tmp_path / "current.db")
+    DatabaseManager(db_file)
+
+    conn = sqlite3.connect(db_file)
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        assert apply_migrations(conn) == SCHEMA_VERSION
+    finally:
+        conn.close()
+    assert statements == ["PRAGMA user_version"]
+
+
+def test_legacy_database_is_adopted_and_constraints_added(tmp_path):
+    db_file = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(db_file)
+    conn.execute('''
+        CREATE TABLE transacciones_recurrentes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, nombre TEXT NOT NULL, monto REAL NOT NULL,
+            dia_cobro INTEGER NOT NULL, categoria TEXT, activo INTEGER DEFAULT 1
+        )
+    ''')
+    conn.executemany("INSERT INTO transacciones_recurrentes (nombre, monto, dia_cobro, categoria) VALUES (?, ?, ?, ?)",
+                     [("Netflix", 12.0, 5, "Entretenimiento"), ("Gym", 30.0, 1, "Salud")])
+    conn.execute("DELETE FROM transacciones_recurrentes WHERE nombre = 'Gym'")
+    conn.commit()
+    conn.close()
+
+    db = DatabaseManager(db_file)
+    assert db.get_recurring() == [(1, "Netflix", 12.0, 5, "Entretenimiento", 1)]
+    db.add_recurring("Spotify", 9.0, 10, "Entretenimiento")
+    assert [r[0] for r in db.get_recurring()] == [1, 3]  # el id 2 borrado no se reutiliza
+    with pytest.raises(sqlite3.IntegrityError):
+        db.add_recurring("Imposible", 1.0, 32, "Otro")
+
+
+def test_legacy_real_amounts_are_converted_to_cents(tmp_path):
+    db_file = str(tmp_path / "real.db")
+    # Esquema v5 (montos REAL) creado con las migraciones anteriores
+    conn = sqlite3.connect(db_file)
+    cur = conn.cursor()
+    for step in MIGRATIONS[:5]:
+        step(cur)
+    cur.execute("PRAGMA user_version = 5")
+    cur.execute("INSERT INTO transacciones (tipo, categoria, monto, fecha) VALUES ('Gasto', 'Comida', 19.99, '2026-01-01')")
+    cur.execute("UPDATE credito_config SET saldo_utilizado = 12.35")
+    conn.commit()
+    conn.close()
+
+    db = DatabaseManager(db_file)
+    with db._reading() as conn:
+        assert conn.execute("SELECT monto, typeof(monto) FROM transacciones").fetchone() == (1999, "integer")
+        assert conn.execute("SELECT limite_total FROM credito_config").fetchone() == (50000,)
+        assert conn.execute("SELECT total FROM resumen_mensual").fetchone() == (1999,)
+    assert db.get_transactions()[0][3] == 19.99
+    assert db.get_credit_info() == (500.0, 12.35)  # conservado como ajuste en el libro de crédito
+    assert db.search_transactions("comi")[0][0][0] == 1
+
+
+def test_failed_migration_rolls_back_everything(tmp_path, monkeypatch):
+    def broken(cur):
+        cur.execute("CREATE TABLE debe_desaparecer (x)")
+        raise RuntimeError("fallo a mitad")
+
+    monkeypatch.setattr("db.migrate.MIGRATIONS", MIGRATIONS + [broken])
+    monkeypatch.setattr("db.migrate.SCHEMA_VERSION", SCHEMA_VERSION + 1)
+
+    db_file = str(tmp_path / "broken.db")
+    with pytest.raises(RuntimeError):
+        DatabaseManager(db_file)
+
+    conn = sqlite3.connect(db_file)
+    try:
+        assert get_version(conn) == 0
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name IN ('transacciones', 'debe_desaparecer')").fetchall() == []
+    finally:
+        conn.close()
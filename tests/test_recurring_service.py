@@ -0,0 +1,36 @@
+from datetime import date
+from db.database import DatabaseManager
+from services.recurring_service import RecurringService, due_dates
+
+
+def test_due_dates_clamp_short_months_and_resume_after_last_period():
+    dates = list(due_dates(31, date(2026, 1, 15), date(2026, 4, 30)))
+    assert dates == [("2026-01", date(2026, 1, 31)), ("2026-02", date(2026, 2, 28)),
+                     ("2026-03", date(2026, 3, 31)), ("2026-04", date(2026, 4, 30))]
+    # Un cargo anterior a `inicio` no cuenta; el de este mes aún no vence
+    assert list(due_dates(10, date(2026, 1, 15), date(2026, 3, 5))) == [("2026-02", date(2026, 2, 10))]
+    assert list(due_dates(31, date(2026, 1, 15), date(2026, 4, 30), "2026-03")) == [("2026-04", date(2026, 4, 30))]
+
+
+def test_post_due_catches_up_once(tmp_path):
+    db = DatabaseManager(str(tmp_path / "recurring.db"))
+    db.add_recurring("Netflix", 12.99, 29, "Suscripción", inicio="2024-01-01")
+    db.add_recurring("Gimnasio", 30.0, 5, "Salud", inicio="2024-02-10")
+    service = RecurringService(db)
+
+    ids = service.post_due(today=date(2024, 4, 1))
+    # Netflix: ene, feb (29, bisiesto), mar; Gimnasio: mar
+    assert len(ids) == 4
+    fechas = sorted(t[4] for t in db.get_transactions())
+    assert fechas == ["2024-01-29", "2024-02-29", "2024-03-05", "2024-03-29"]
+    assert db.get_summary() == (0.0, 3 * 12.99 + 30.0)
+
+    assert service.post_due(today=date(2024, 4, 1)) == []
+    # Volver a enviar cargos ya registrados tampoco duplica
+    assert db.post_recurring(service.due_charges(today=date(2024, 4, 1))) == []
+    assert db.post_recurring([(1, "2024-01", "Suscripción", 12.99, "2024-01-29", "Netflix")]) == []
+
+    # Abril y mayo de ambas
+    assert len(service.post_due(today=date(2024, 5, 30))) == 4
+    assert db.count_transactions() == 8
+    assert db.balance_at("2024-05-30") == -(5 * 1299 + 3 * 3000) / 100
@@ -0,0 +1,83 @@
+import hashlib
+import json
+import threading
+import pytest
+from utils import security
+from tests.fakes import FakeTk
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    monkeypatch.setattr(security, "CONFIG_PATH", str(path))
+    monkeypatch.setattr(security, "PIN_ITERATIONS", 1_000)
+    monkeypatch.setattr(security, "calibrate_iterations", lambda: 2_000)
+    return path
+
+
+def test_pin_and_answer_round_trip_with_stored_parameters(config_path):
+    security.save_pin_hash("1234", "¿Mascota?", "  Firulais ")
+    data = json.loads(config_path.read_text())
+    assert data["kdf"] == data["recovery_kdf"] == data["kdf_target"] == {"algorithm": "pbkdf2_sha256", "iterations": 2_000}
+    assert data["salt"] != data["recovery_salt"]
+    assert security.verify_pin("1234") and not security.verify_pin("0000")
+    assert security.verify_recovery_answer("firulais")
+
+    security.save_pin_hash("5678")  # nuevo PIN sin tocar la recuperación
+    assert security.verify_pin("5678") and security.verify_recovery_answer("FIRULAIS")
+
+
+def test_legacy_hashes_are_upgraded_on_success(config_path, monkeypatch):
+    salt = bytes(16)
+    legacy = lambda secret: hashlib.pbkdf2_hmac("sha256", secret.encode(), salt, 100_000).hex()
+    config_path.write_text(json.dumps({"salt": salt.hex(), "hash": legacy("1234"),
+                                       "recovery_hash": legacy("firulais"), "security_question": "?"}))
+    monkeypatch.setattr(security, "PIN_ITERATIONS", 150_000)
+
+    assert not security.verify_pin("9999")
+    assert "kdf" not in json.loads(config_path.read_text())
+    assert security.verify_pin("1234")
+    data = json.loads(config_path.read_text())
+    assert data["kdf"]["iterations"] == 150_000 and data["salt"] != salt.hex()
+    assert data["recovery_salt"] == salt.hex()  # la respuesta antigua sigue verificando
+    assert security.verify_recovery_answer("Firulais")
+    assert json.loads(config_path.read_text())["recovery_kdf"]["iterations"] == 150_000
+    assert security.verify_pin("1234") and security.verify_recovery_answer("firulais")
+
+
+def test_legacy_install_calibrates_on_first_login(config_path, monkeypatch):
+    salt = bytes(16)
+    legacy = lambda secret: hashlib.pbkdf2_hmac("sha256", secret.encode(), salt, 100_000).hex()
+    config_path.write_text(json.dumps({"salt": salt.hex(), "hash": legacy("1234"),
+                                       "recovery_hash": legacy("firulais"), "security_question": "?"}))
+    calls = []
+    monkeypatch.setattr(security, "calibrate_iterations", lambda: calls.append(1) or 300_000)
+
+    assert security.verify_pin("1234")
+    data = json.loads(config_path.read_text())
+    assert data["kdf_target"]["iterations"] == data["kdf"]["iterations"] == 300_000
+    assert security.verify_recovery_answer("firulais")
+    assert json.loads(config_path.read_text())["recovery_kdf"]["iterations"] == 300_000
+    assert calls == [1]
+
+
+def test_calibration_scales_to_target_and_respects_minimum():
+    fast = security.calibrate_iterations(target_ms=10_000, minimum=1_000, sample=1_000)
+    assert fast > 1_000 and fast % 10_000 == 0
+    assert security.calibrate_iterations(target_ms=0, minimum=50_000, sample=1_000) == 50_000
+
+
+def test_kdf_service_delivers_results_through_after():
+    root = FakeTk()
+    kdf = security.KdfService(root)
+    results, errors = [], []
+    kdf.run(lambda pin: pin == "1234", "1234", on_done=results.append)
+    kdf.run(lambda: 1 / 0, on_done=results.append, on_error=errors.append)
+    assert kdf.busy
+    for _ in range(500):
+        root.run(1)
+        if not kdf.busy:
+            break
+        threading.Event().wait(0.001)
+    kdf.shutdown()
+    assert results == [True] and isinstance(errors[0], ZeroDivisionError)
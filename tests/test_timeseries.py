@@ -0,0 +1,37 @@
+from datetime import date
+import numpy as np
+from db.database import DatabaseManager
+from services.timeseries import expense_trend, fill_gaps, lttb
+
+
+def test_totals_by_period_group_in_sql_and_fill_gaps(tmp_path):
+    db = DatabaseManager(str(tmp_path / "series.db"))
+    db.add_transaction("Gasto", "Comida", 10.0, "2026-03-02", "", "Efectivo")  # lunes
+    db.add_transaction("Gasto", "Comida", 5.0, "2026-03-02", "", "Efectivo")
+    db.add_transaction("Gasto", "Renta", 20.0, "2026-03-08", "", "Efectivo")   # domingo
+    db.add_transaction("Gasto", "Renta", 1.0, "2026-04-30", "", "Efectivo")
+    db.add_transaction("Ingreso", "Sueldo", 99.0, "2026-03-03", "", "Efectivo")
+
+    assert db.get_totals_by_period("2026-03-01", "2026-05-01") == [("2026-03-02", 1500), ("2026-03-08", 2000), ("2026-04-30", 100)]
+    assert db.get_totals_by_period(bucket="week") == [("2026-03-02", 3500), ("2026-04-27", 100)]
+    assert db.get_totals_by_period(bucket="month", tipo="Ingreso") == [("2026-03", 9900)]
+
+    days = fill_gaps(db.get_totals_by_period("2026-03-01", "2026-03-10"), date(2026, 3, 1), date(2026, 3, 10))
+    assert len(days.dates) == 9 and days.values.tolist() == [0, 15, 0, 0, 0, 0, 0, 20, 0]
+    months = fill_gaps(db.get_totals_by_period(bucket="month"), date(2026, 2, 15), date(2026, 5, 1), "month")
+    assert months.dates.astype(str).tolist() == ["2026-02-01", "2026-03-01", "2026-04-01"]
+    assert months.values.tolist() == [0, 35, 1]
+
+    trend = expense_trend(db, days=None, today=date(2026, 4, 30))
+    assert trend.dates[0] == np.datetime64("2026-03-02") and trend.values.sum() == 36.0
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    x = np.arange("2020-01-01", "2023-01-01", dtype="M8[D]")
+    y = np.sin(np.arange(len(x)) / 30.0)
+    y[500] = 50.0
+    xs, ys = lttb(x, y, 200)
+    assert len(xs) == 200 and xs[0] == x[0] and xs[-1] == x[-1]
+    assert 50.0 in ys and (np.diff(xs.astype(np.int64)) > 0).all()
+    # Con menos puntos que el presupuesto la serie queda intacta
+    assert len(lttb(x[:10], y[:10], 200)[0]) == 10
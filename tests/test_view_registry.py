@@ -0,0 +1,93 @@
+from db.database import DatabaseManager
+from db.events import DataChanged
+from ui.view_registry import ViewRegistry
+from ui.views.base import CachedView
+
+
+class _FakeFrame:
+    def __init__(self):
+        self.alive = True
+        self.visible = True
+
+    def winfo_exists(self):
+        return self.alive
+
+    def winfo_children(self):
+        return []
+
+    def grid(self):
+        self.visible = True
+
+    def grid_remove(self):
+        self.visible = False
+
+    def winfo_manager(self):
+        return "grid" if self.visible else ""
+
+    def destroy(self):
+        self.alive = False
+
+
+class _FakeView(CachedView, _FakeFrame):
+    def __init__(self, db):
+        super().__init__()
+        self.db = db
+        self.loads = 0
+
+    @staticmethod
+    def load(db):
+        return db.count_transactions()
+
+    def _setup_ui(self, data):
+        self.loads += 1
+        self.data = data
+
+
+def test_registry_keeps_recent_views_and_evicts_lru():
+    registry = ViewRegistry(max_resident=2)
+    a, b, c = _FakeFrame(), _FakeFrame(), _FakeFrame()
+    registry.add("a", a)
+    registry.add("b", b)
+    assert registry.get("a") is a  # "a" pasa a ser la más reciente
+    registry.add("c", c)
+    assert registry.names() == ["a", "c"] and not b.alive and b not in registry
+    registry.hide_all()
+    assert not a.visible and not c.visible
+    registry.clear()
+    assert len(registry) == 0 and not a.alive and not c.alive
+
+
+def test_refresh_requeries_only_after_data_changes(tmp_path):
+    db = DatabaseManager(str(tmp_path / "views.db"))
+    view = _FakeView(db)
+    view.data_generation = db.data_generation()
+    assert not view.refresh() and view.loads == 0
+
+    db.add_transaction("Gasto", "Comida", 5.0, "2026-01-01", "", "Efectivo")
+    assert view.is_stale()
+    assert view.refresh() and view.loads == 1 and view.data == 1
+    assert not view.refresh() and view.loads == 1
+
+
+def test_only_the_visible_view_applies_changes_to_its_tables(tmp_path):
+    db = DatabaseManager(str(tmp_path / "events.db"), pooled=True)
+    events = []
+    db.events.subscribe(DataChanged, events.append)
+    try:
+        view = type("_TxView", (_FakeView,), {"TABLES": ("transacciones",)})(db)
+        view.data_generation = view.current_generation(db)
+
+        db.create_plan("Viaje", 100.0, "2026-12-31", "#00FFFF")
+        view.on_data_changed(events[-1])
+        assert view.loads == 0 and not view.is_stale()  # otra tabla
+
+        view.grid_remove()
+        db.add_transaction("Gasto", "Comida", 5.0, "2026-01-01", "", "Efectivo")
+        view.on_data_changed(events[-1])
+        assert view.loads == 0 and view.is_stale()  # oculta: espera a refresh()
+
+        view.grid()
+        view.on_data_changed(events[-1])
+        assert view.loads == 1 and view.data == 1 and not view.is_stale()
+    finally:
+        db.close()
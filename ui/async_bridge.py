@@ -0,0 +1,91 @@
+"""Puente entre el bucle de Tk y un bucle de asyncio.
+
+Tk y asyncio quieren cada uno su propio mainloop. Aquí el bucle de
+asyncio no corre por su cuenta: un `after()` periódico de Tk lo avanza
+una vuelta (procesa los callbacks listos y vuelve), así que las
+corrutinas y sus continuaciones se ejecutan siempre en el hilo de Tk y
+pueden tocar widgets sin más. El trabajo bloqueante va a hilos (p. ej.
+AsyncDatabaseManager) y su resultado despierta al bucle en la vuelta
+siguiente.
+
+    bridge = TkAsyncioBridge(root)
+    bridge.start()
+    bridge.spawn(view.load(), on_error=show_error)
+"""
+import asyncio
+from typing import Any, Callable, Coroutine, Optional, Set
+
+# Con tareas pendientes se sondea rápido; sin ellas, lo justo para no gastar CPU
+BUSY_INTERVAL_MS = 8
+IDLE_INTERVAL_MS = 100
+
+
+class TkAsyncioBridge:
+    def __init__(self, root: Any, busy_ms: int = BUSY_INTERVAL_MS, idle_ms: int = IDLE_INTERVAL_MS) -> None:
+        self.root = root
+        self.busy_ms = busy_ms
+        self.idle_ms = idle_ms
+        self.loop = asyncio.new_event_loop()
+        self._tasks: Set[asyncio.Task] = set()
+        self._after_id: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._after_id is not None
+
+    def start(self) -> None:
+        if not self.running:
+            self._schedule(0)
+
+    def stop(self) -> None:
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def close(self) -> None:
+        """Cancela las tareas pendientes y cierra el bucle."""
+        self.stop()
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            self.loop.run_until_complete(asyncio.gather(*self._tasks, return_exceptions=True))
+        self.loop.close()
+
+    def spawn(self, coro: Coroutine[Any, Any, Any],
+              on_done: Optional[Callable[[Any], None]] = None,
+              on_error: Optional[Callable[[BaseException], None]] = None) -> asyncio.Task:
+        """Lanza `coro` en el bucle; los callbacks se llaman en el hilo de Tk.
+
+        Una tarea cancelada no llama a ninguno de los dos.
+        """
+        task = self.loop.create_task(coro)
+        self._tasks.add(task)
+
+        def _finished(t: asyncio.Task) -> None:
+            self._tasks.discard(t)
+            if t.cancelled():
+                return
+            exc = t.exception()
+            if exc is not None:
+                if on_error is not None:
+                    on_error(exc)
+                else:
+                    self.loop.call_exception_handler({"message": "Error en tarea del puente Tk", "exception": exc, "task": t})
+            elif on_done is not None:
+                on_done(t.result())
+
+        task.add_done_callback(_finished)
+        if self.running:
+            # Acortar la espera si el bucle estaba en modo inactivo
+            self.stop()
+            self._schedule(0)
+        return task
+
+    def _schedule(self, delay_ms: int) -> None:
+        self._after_id = self.root.after(delay_ms, self._tick)
+
+    def _tick(self) -> None:
+        # Una vuelta del bucle: ejecuta lo que esté listo y regresa a Tk
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+        self._schedule(self.busy_ms if self._tasks else self.idle_ms)
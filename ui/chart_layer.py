@@ -0,0 +1,101 @@
+"""Actualización incremental de gráficos de matplotlib embebidos en Tk.
+
+Para controles que disparan muchos eventos (p. ej. un slider) no conviene
+`ax.clear()` + `canvas.draw()` en cada uno:
+
+- `Debouncer` agrupa los eventos y entrega solo el último valor, como
+  mucho una vez por fotograma.
+- `BlitLayer` guarda el fondo ya rasterizado (ejes, rejilla y artistas
+  estáticos) y en cada actualización solo repinta los artistas que
+  cambian, sobre ese fondo, con `blit`.
+
+Los artistas se crean una vez y se modifican con `set_data`/`set_verts`.
+El módulo no importa matplotlib: solo usa los objetos que recibe.
+"""
+from typing import Any, Callable, Iterable, Optional
+
+import numpy as np
+
+# ~60 fps
+FRAME_MS = 16
+
+
+class Debouncer:
+    """Llama a `callback(valor)` con el último valor recibido, tras `delay_ms`."""
+
+    def __init__(self, widget: Any, callback: Callable[[Any], None], delay_ms: int = FRAME_MS) -> None:
+        self.widget = widget
+        self.callback = callback
+        self.delay_ms = delay_ms
+        self._value: Any = None
+        self._after_id: Optional[str] = None
+
+    def __call__(self, value: Any) -> None:
+        self._value = value
+        # Mientras haya una entrega programada solo se actualiza el valor
+        if self._after_id is None:
+            self._after_id = self.widget.after(self.delay_ms, self._fire)
+
+    def flush(self) -> None:
+        """Entrega ya el valor pendiente, si lo hay."""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._fire()
+
+    def cancel(self) -> None:
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _fire(self) -> None:
+        self._after_id = None
+        self.callback(self._value)
+
+
+class BlitLayer:
+    """Repinta `artists` sobre un fondo cacheado en lugar de redibujar la figura."""
+
+    def __init__(self, canvas: Any, artists: Iterable[Any]) -> None:
+        self.canvas = canvas
+        self.artists = list(artists)
+        self._background = None
+        for artist in self.artists:
+            # Los artistas animados no se pintan en draw(): quedan fuera del fondo
+            artist.set_animated(True)
+        # Cada redibujado completo (inicio, cambio de tamaño) renueva el fondo
+        self._cid = canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _on_draw(self, event: Any) -> None:
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self) -> None:
+        figure = self.canvas.figure
+        for artist in self.artists:
+            figure.draw_artist(artist)
+
+    def update(self) -> None:
+        """Muestra el estado actual de los artistas."""
+        if self._background is None:
+            # Aún no hubo un dibujado completo del que sacar el fondo
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_artists()
+        self.canvas.blit(self.canvas.figure.bbox)
+
+    def invalidate(self) -> None:
+        """Fuerza un dibujado completo (p. ej. tras cambiar límites de ejes)."""
+        self._background = None
+        self.canvas.draw_idle()
+
+    def disconnect(self) -> None:
+        self.canvas.mpl_disconnect(self._cid)
+
+
+def fill_vertices(x: np.ndarray, y1: np.ndarray, y2: Any) -> np.ndarray:
+    """Vértices del polígono entre y1 e y2, como los de `fill_between`."""
+    x = np.asarray(x, dtype=float)
+    y1 = np.broadcast_to(np.asarray(y1, dtype=float), x.shape)
+    y2 = np.broadcast_to(np.asarray(y2, dtype=float), x.shape)
+    return np.concatenate([np.column_stack([x, y1]), np.column_stack([x[::-1], y2[::-1]])])
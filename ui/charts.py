@@ -0,0 +1,148 @@
+"""Motor de gráficos compartido: carga diferida de matplotlib y reutilización de figuras.
+
+matplotlib se importa la primera vez que se pide una figura, no al
+arrancar la aplicación. Cada gráfico ocupa un `slot` con nombre
+("dashboard.gastos", "reports.trend", ...):
+
+- `figure(slot)` entrega una figura limpia; si hay una liberada de ese
+  slot se reutiliza en lugar de crear otra. Puede llamarse desde el hilo
+  de `View.load`.
+- `canvas(fig, master)` la monta en un widget de Tk (en el hilo de Tk).
+- `release(fig)` destruye su canvas y la devuelve vacía al pool;
+  `release_all()` lo hace con todas las montadas y se llama al
+  desmontar una vista, así las figuras no se acumulan.
+
+`stats()` informa cuántas figuras hay vivas y cuánta memoria ocupan sus
+búferes de dibujo.
+"""
+import importlib.util
+import threading
+import weakref
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# Figuras liberadas que se guardan por slot para reutilizar
+POOL_PER_SLOT = 1
+
+
+class ChartStats(NamedTuple):
+    live: int           # figuras montadas en un canvas
+    pooled: int         # figuras libres esperando reutilización
+    created: int        # figuras creadas desde el arranque
+    reused: int         # veces que se reutilizó una figura del pool
+    buffer_bytes: int   # memoria estimada de los búferes RGBA de las figuras vivas
+
+    @property
+    def figures(self) -> int:
+        return self.live + self.pooled
+
+
+class ChartEngine:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._backend: Optional[Tuple[Any, Any, Any]] = None
+        self._available: Optional[bool] = None
+        self._pool: Dict[str, List[Any]] = {}
+        # Débil: una figura de una carga descartada nunca se monta ni se libera
+        self._slots: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+        self._canvases: Dict[Any, Any] = {}
+        self._created = 0
+        self._reused = 0
+
+    def available(self) -> bool:
+        """Si matplotlib está instalado (sin importarlo)."""
+        if self._available is None:
+            self._available = importlib.util.find_spec("matplotlib") is not None
+        return self._available
+
+    def _load_backend(self) -> Tuple[Any, Any, Any]:
+        """(Figure, FigureCanvasTkAgg, FigureCanvasBase), importados una sola vez."""
+        if self._backend is None:
+            from matplotlib.figure import Figure
+            from matplotlib.backend_bases import FigureCanvasBase
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            self._backend = (Figure, FigureCanvasTkAgg, FigureCanvasBase)
+        return self._backend
+
+    def figure(self, slot: str, figsize: Tuple[float, float] = (8, 4), dpi: int = 100,
+               facecolor: Optional[str] = None) -> Any:
+        """Figura vacía para `slot`, reutilizada del pool si hay una libre."""
+        figure_cls, _canvas_cls, _base_cls = self._load_backend()
+        with self._lock:
+            free = self._pool.get(slot)
+            fig = free.pop() if free else None
+            if fig is not None:
+                self._reused += 1
+            else:
+                self._created += 1
+        if fig is None:
+            fig = figure_cls(figsize=figsize, dpi=dpi, facecolor=facecolor)
+        else:
+            fig.set_size_inches(*figsize)
+            fig.set_dpi(dpi)
+            if facecolor is not None:
+                fig.set_facecolor(facecolor)
+        with self._lock:
+            self._slots[fig] = slot
+        return fig
+
+    def canvas(self, fig: Any, master: Any) -> Any:
+        """Canvas de Tk para `fig`; si ya tiene uno en ese `master` se reutiliza."""
+        _figure_cls, canvas_cls, _base_cls = self._load_backend()
+        current = self._canvases.get(fig)
+        if current is not None:
+            if current.get_tk_widget().master is master:
+                return current
+            current.get_tk_widget().destroy()
+        canvas = canvas_cls(fig, master=master)
+        self._canvases[fig] = canvas
+        return canvas
+
+    def release(self, fig: Any) -> None:
+        """Destruye el canvas de `fig` y la devuelve vacía al pool de su slot."""
+        canvas = self._canvases.pop(fig, None)
+        if canvas is not None:
+            widget = canvas.get_tk_widget()
+            if widget.winfo_exists():
+                widget.destroy()
+        with self._lock:
+            slot = self._slots.pop(fig, None)
+            if slot is None:
+                return
+            free = self._pool.setdefault(slot, [])
+            if len(free) >= POOL_PER_SLOT:
+                return
+        fig.clear()
+        # Sin referencia al canvas de Tk destruido, que así puede liberarse
+        self._load_backend()[2](fig)
+        with self._lock:
+            free.append(fig)
+
+    def release_within(self, widget: Any) -> None:
+        """Libera las figuras montadas dentro de `widget` (al destruir o recargar una vista)."""
+        for fig, canvas in list(self._canvases.items()):
+            w = canvas.get_tk_widget()
+            while w is not None and w is not widget:
+                w = getattr(w, "master", None)
+            if w is widget:
+                self.release(fig)
+
+    def release_all(self) -> None:
+        """Libera todas las figuras montadas (al desmontar la vista actual)."""
+        for fig in list(self._canvases):
+            self.release(fig)
+
+    def clear_pool(self) -> None:
+        with self._lock:
+            self._pool.clear()
+
+    def stats(self) -> ChartStats:
+        with self._lock:
+            live = list(self._canvases)
+            pooled = sum(len(free) for free in self._pool.values())
+            created, reused = self._created, self._reused
+        buffer_bytes = sum(int(fig.bbox.width) * int(fig.bbox.height) * 4 for fig in live)
+        return ChartStats(len(live), pooled, created, reused, buffer_bytes)
+
+
+# Instancia compartida por todas las vistas
+charts = ChartEngine()
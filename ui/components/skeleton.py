@@ -0,0 +1,26 @@
+"""Esqueleto de carga que ocupa el hueco de una vista mientras llegan sus datos."""
+import customtkinter as ctk
+from utils.constants import *
+
+
+class ViewSkeleton(ctk.CTkFrame):
+    def __init__(self, parent):
+        super().__init__(parent, corner_radius=0, fg_color="transparent")
+        self.grid(row=0, column=1, sticky="nsew", padx=40, pady=30)
+
+        # Bloques grises con la forma típica de una vista: título, tarjetas y panel
+        ctk.CTkFrame(self, height=44, width=380, fg_color=COLOR_CARD_BG, corner_radius=8).pack(anchor="w", pady=(0, 40))
+
+        cards = ctk.CTkFrame(self, fg_color="transparent")
+        cards.pack(fill="x", pady=10)
+        for _ in range(3):
+            ctk.CTkFrame(cards, height=110, fg_color=COLOR_CARD_BG, corner_radius=12,
+                         border_width=1, border_color=COLOR_CARD_BORDER).pack(side="left", expand=True, fill="both", padx=10)
+
+        self.panel = ctk.CTkFrame(self, fg_color=COLOR_CARD_BG, corner_radius=12, border_width=1, border_color=COLOR_CARD_BORDER)
+        self.panel.pack(fill="both", expand=True, pady=30)
+        self.status = ctk.CTkLabel(self.panel, text="Cargando...", font=FONT_BODY, text_color=COLOR_TEXT_GRAY)
+        self.status.pack(expand=True)
+
+    def show_error(self, message):
+        self.status.configure(text=f"No se pudo cargar la vista: {message}", text_color=COLOR_ACCENT_RED)
@@ -0,0 +1,76 @@
+"""Entrega de los cambios de la base de datos a la interfaz, una vez por fotograma.
+
+DatabaseManager publica un DataChanged por cada commit, en el hilo que
+escribió. Una importación o el registro de cargos recurrentes puede
+producir muchos seguidos; aquí se fusionan (DataChanged.merge) y los
+suscriptores reciben uno solo por fotograma, siempre en el hilo de Tk:
+
+    coalescer = FrameCoalescer(root, db.events, bridge)
+    coalescer.subscribe(lambda event: ...)
+
+Desde otro hilo no se puede llamar a `after()`; la entrega se agenda a
+través del bucle de asyncio del puente, que corre en el hilo de Tk.
+"""
+import threading
+from typing import Any, Callable, List, Optional
+
+from db.events import DataChanged, EventBus
+from ui.chart_layer import FRAME_MS
+
+
+class FrameCoalescer:
+    def __init__(self, root: Any, bus: EventBus, bridge: Any = None, frame_ms: int = FRAME_MS) -> None:
+        self.root = root
+        self.bridge = bridge
+        self.frame_ms = frame_ms
+        self._tk_thread = threading.get_ident()
+        self._lock = threading.Lock()
+        self._pending: Optional[DataChanged] = None
+        self._scheduled = False
+        self._after_id: Optional[str] = None
+        self._handlers: List[Callable[[DataChanged], None]] = []
+        self._unsubscribe = bus.subscribe(DataChanged, self._on_event)
+
+    def subscribe(self, handler: Callable[[DataChanged], None]) -> Callable[[], None]:
+        """Registra `handler` (se llama en el hilo de Tk); devuelve la baja."""
+        self._handlers.append(handler)
+
+        def unsubscribe() -> None:
+            if handler in self._handlers:
+                self._handlers.remove(handler)
+        return unsubscribe
+
+    def close(self) -> None:
+        """Deja de escuchar el bus y descarta lo pendiente."""
+        self._unsubscribe()
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        with self._lock:
+            self._pending = None
+            self._scheduled = False
+
+    def _on_event(self, event: DataChanged) -> None:
+        with self._lock:
+            self._pending = event if self._pending is None else self._pending.merge(event)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        if threading.get_ident() == self._tk_thread or self.bridge is None:
+            self._schedule()
+        else:
+            self.bridge.loop.call_soon_threadsafe(self._schedule)
+
+    def _schedule(self) -> None:
+        self._after_id = self.root.after(self.frame_ms, self.flush)
+
+    def flush(self) -> None:
+        """Entrega ya lo acumulado (si hay algo)."""
+        self._after_id = None
+        with self._lock:
+            event, self._pending = self._pending, None
+            self._scheduled = False
+        if event is None:
+            return
+        for handler in list(self._handlers):
+            handler(event)
@@ -2,7 +2,7 @@
 import sys
 import customtkinter as ctk
 from tkinter import messagebox
-from utils.security import (save_pin_hash, verify_pin, is_first_time, 
+from utils.security import (save_pin_hash, verify_pin, is_first_time, KdfService,
                             verify_recovery_answer, get_security_question, save_user_profile)
 from utils.constants import *
 
@@ -21,6 +21,8 @@ class LoginWindow(ctk.CTkToplevel):
         
         # Datos de Estado
         self.temp_pin = None
+        # Derivaciones del PIN fuera del hilo de Tk
+        self.kdf = KdfService(self)
         
         # Estados: "LOGIN", "SETUP_PIN", "SETUP_SECURITY", "SETUP_PROFILE", "RECOVERY"
         self.login_state = "SETUP_PIN" if is_first_time() else "LOGIN"
@@ -38,6 +40,10 @@ class LoginWindow(ctk.CTkToplevel):
         y = (self.winfo_screenheight() // 2) - (height // 2)
         self.geometry(f'{width}x{height}+{x}+{y}')
 
+    def destroy(self):
+        self.kdf.shutdown()
+        super().destroy()
+
     def clear_frame(self):
         for widget in self.main_frame.winfo_children():
             widget.destroy()
@@ -130,7 +136,12 @@ class LoginWindow(ctk.CTkToplevel):
         self.render_current_state()
 
     def _handle_login(self):
-        if verify_pin(self.entry_pin.get()):
+        if self.kdf.busy:
+            return
+        self.kdf.run(verify_pin, self.entry_pin.get(), on_done=self._on_login_checked)
+
+    def _on_login_checked(self, ok):
+        if ok:
             try:
                 self.on_success()
                 self.destroy()
@@ -157,12 +168,12 @@ class LoginWindow(ctk.CTkToplevel):
             messagebox.showerror("Error", "Campos obligatorios", parent=self)
             return
         
+        if self.kdf.busy:
+            return
         # Guardar PIN e información de seguridad
-        try:
-            save_pin_hash(self.temp_pin, q, a)
-            self._utils_set_state("SETUP_PROFILE")
-        except Exception as e:
-            messagebox.showerror("Error", f"Error guardando datos: {e}", parent=self)
+        self.kdf.run(save_pin_hash, self.temp_pin, q, a,
+                     on_done=lambda _: self._utils_set_state("SETUP_PROFILE"),
+                     on_error=lambda e: messagebox.showerror("Error", f"Error guardando datos: {e}", parent=self))
 
     def _handle_setup_profile(self):
         nombre = self.entry_name.get()
@@ -182,8 +193,12 @@ class LoginWindow(ctk.CTkToplevel):
         self.destroy()
 
     def _handle_recovery(self):
-        ans = self.entry_recovery_answer.get()
-        if verify_recovery_answer(ans):
+        if self.kdf.busy:
+            return
+        self.kdf.run(verify_recovery_answer, self.entry_recovery_answer.get(), on_done=self._on_recovery_checked)
+
+    def _on_recovery_checked(self, ok):
+        if ok:
             messagebox.showinfo("Correcto", "Respuesta correcta. Por favor defina su nuevo PIN.", parent=self)
             # ¿Lógica de limpieza de configuración? O simplemente sobrescribir.
             # Idealmente queremos mantener el perfil pero resetear el PIN.
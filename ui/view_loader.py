@@ -0,0 +1,48 @@
+"""Carga de vistas en segundo plano.
+
+`show_view` pone primero un esqueleto y pide aquí los datos de la vista
+(`View.load(db)`: consultas y preparación de figuras, sin widgets). La
+carga corre en el pool de lectores de AsyncDatabaseManager y el
+resultado vuelve al hilo de Tk a través del puente `after()`; solo
+entonces se construye la vista real.
+
+Solo hay una carga vigente: pedir otra vista cancela la anterior y, si
+su resultado llega igualmente (la consulta ya estaba en curso), se
+descarta.
+"""
+import asyncio
+from typing import Any, Callable, Optional
+
+from db.async_database import AsyncDatabaseManager
+from ui.async_bridge import TkAsyncioBridge
+
+
+class ViewLoader:
+    def __init__(self, bridge: TkAsyncioBridge, adb: AsyncDatabaseManager) -> None:
+        self.bridge = bridge
+        self.adb = adb
+        self._task: Optional[asyncio.Task] = None
+        self._generation = 0
+
+    def load(self, load_fn: Callable[[Any], Any], on_ready: Callable[[Any], None],
+             on_error: Optional[Callable[[BaseException], None]] = None) -> None:
+        """Ejecuta `load_fn(db)` en segundo plano y llama a `on_ready(datos)` en el hilo de Tk."""
+        self.cancel()
+        generation = self._generation
+
+        def _ready(data: Any) -> None:
+            if generation == self._generation:
+                on_ready(data)
+
+        def _failed(exc: BaseException) -> None:
+            if generation == self._generation and on_error is not None:
+                on_error(exc)
+
+        self._task = self.bridge.spawn(self.adb.run_read(load_fn, self.adb.db), on_done=_ready, on_error=_failed)
+
+    def cancel(self) -> None:
+        """Invalida la carga en curso (si la hay)."""
+        self._generation += 1
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
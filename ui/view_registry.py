@@ -0,0 +1,64 @@
+"""Registro de vistas construidas que se conservan ocultas entre visitas.
+
+`show_view` ya no destruye la vista saliente: la oculta con
+`grid_remove()` y la guarda aquí. Al volver a ella basta con `grid()` y
+`refresh()`, que solo vuelve a consultar si cambió la generación de
+datos (ver ui/views/base.py). Como mucho quedan `max_resident` vistas;
+al superar el límite se destruye la usada hace más tiempo.
+"""
+from collections import OrderedDict
+from typing import Any, List, Optional
+
+MAX_RESIDENT_VIEWS = 4
+
+
+class ViewRegistry:
+    def __init__(self, max_resident: int = MAX_RESIDENT_VIEWS) -> None:
+        if max_resident < 1:
+            raise ValueError("Debe poder conservarse al menos una vista")
+        self.max_resident = max_resident
+        self._views: "OrderedDict[str, Any]" = OrderedDict()
+
+    def __contains__(self, widget: Any) -> bool:
+        return any(view is widget for view in self._views.values())
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+    def names(self) -> List[str]:
+        """Nombres residentes, del menos al más reciente."""
+        return list(self._views)
+
+    def values(self) -> List[Any]:
+        """Vistas residentes vivas, sin alterar el orden de uso."""
+        return [view for view in self._views.values() if view.winfo_exists()]
+
+    def get(self, name: str) -> Optional[Any]:
+        """Vista viva de `name` (la marca como la más reciente) o None."""
+        view = self._views.get(name)
+        if view is None:
+            return None
+        if not view.winfo_exists():
+            del self._views[name]
+            return None
+        self._views.move_to_end(name)
+        return view
+
+    def add(self, name: str, view: Any) -> None:
+        """Registra `view` y destruye las menos recientes que sobren."""
+        old = self._views.pop(name, None)
+        if old is not None and old is not view:
+            old.destroy()
+        self._views[name] = view
+        while len(self._views) > self.max_resident:
+            _name, evicted = self._views.popitem(last=False)
+            evicted.destroy()
+
+    def hide_all(self) -> None:
+        for view in self._views.values():
+            view.grid_remove()
+
+    def clear(self) -> None:
+        """Destruye todas las vistas residentes."""
+        while self._views:
+            self._views.popitem(last=False)[1].destroy()
@@ -0,0 +1,71 @@
+"""Comportamiento común de las vistas que se conservan entre visitas."""
+from ui.charts import charts
+
+
+class CachedView:
+    """Mixin para vistas que `show_view` oculta en lugar de destruir.
+
+    `TABLES` son las tablas de las que lee la vista (None = todas) y
+    `data_generation` la generación de esas tablas (ver
+    `DatabaseManager.data_generation`) con la que se construyó o
+    actualizó. `refresh()` solo vuelve a consultar si alguna cambió.
+
+    `on_data_changed` recibe los cambios agrupados por fotograma (ver
+    ui/event_coalescer.py): la vista visible los aplica en el momento;
+    una oculta los deja para `refresh()` cuando se vuelva a mostrar.
+    """
+    TABLES = None
+    data_generation = None
+
+    @classmethod
+    def current_generation(cls, db) -> int:
+        return db.data_generation(*(cls.TABLES or ()))
+
+    def is_stale(self) -> bool:
+        return self.current_generation(self.db) != self.data_generation
+
+    def on_data_changed(self, event, loader=None) -> None:
+        # grid_remove() quita el gestor al instante; winfo_ismapped() espera al ciclo ocioso
+        if event.touches(self.TABLES) and self.winfo_manager():
+            self.apply_change(event, loader)
+
+    def apply_change(self, event, loader=None) -> None:
+        """Aplica un cambio a la vista visible; por defecto vuelve a consultar."""
+        self.refresh(loader)
+
+    def refresh(self, loader=None) -> bool:
+        """Actualiza la vista si sus datos quedaron viejos; devuelve si lo hizo.
+
+        Con `loader` (un ViewLoader) la consulta corre en segundo plano y la
+        vista sigue mostrando los datos anteriores hasta que llegan los nuevos.
+        """
+        generation = self.current_generation(self.db)
+        if generation == self.data_generation:
+            return False
+        load = getattr(type(self), "load", None)
+        if loader is not None and load is not None:
+            # La generación se anota al aplicar: una carga cancelada deja la vista vieja
+            loader.load(load, lambda data: self._apply(data, generation))
+        else:
+            self._apply(load(self.db) if load is not None else None, generation)
+        return True
+
+    def _apply(self, data, generation) -> None:
+        if self.winfo_exists():
+            self.reload(data)
+            self.data_generation = generation
+
+    def reload(self, data=None) -> None:
+        """Reconstruye el contenido con `data` (por defecto, vuelve a montar la UI)."""
+        self._teardown()
+        for widget in self.winfo_children():
+            widget.destroy()
+        self._setup_ui(data)
+
+    def _teardown(self) -> None:
+        """Libera lo que no se va con los widgets (figuras, temporizadores)."""
+        charts.release_within(self)
+
+    def destroy(self):
+        self._teardown()
+        super().destroy()
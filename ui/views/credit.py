@@ -3,28 +3,40 @@ import customtkinter as ctk
 from datetime import datetime
 from tkinter import messagebox
 from utils.constants import *
+from ui.views.base import CachedView
+from db.events import CREDIT_TABLES
 
-class CreditView(ctk.CTkFrame):
-    def __init__(self, parent, db, tx_service):
+class CreditView(CachedView, ctk.CTkFrame):
+    TABLES = CREDIT_TABLES
+
+    def __init__(self, parent, db, tx_service, data=None):
         super().__init__(parent, corner_radius=0, fg_color="transparent")
         self.db = db
         self.tx_service = tx_service
         self.grid(row=0, column=1, sticky="nsew", padx=40, pady=30)
-        self._setup_ui()
+        self._setup_ui(data)
+
+    @staticmethod
+    def load(db):
+        """Consultas de la vista; se ejecuta en un hilo de trabajo (sin tocar widgets)."""
+        return {"credit": db.get_credit_info()}
 
-    def _setup_ui(self):
+    def _setup_ui(self, data=None):
         ctk.CTkLabel(self, text="Cashea", font=FONT_TITLE_MAIN, text_color=COLOR_TEXT_WHITE).pack(anchor="w", pady=(0, 40))
         
         self.content_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.content_frame.pack(fill="both", expand=True)
         
-        self._refresh_data() 
+        self._refresh_data(data)
+
+    def reload(self, data=None):
+        self._refresh_data(data)
 
-    def _refresh_data(self):
+    def _refresh_data(self, data=None):
         for widget in self.content_frame.winfo_children():
             widget.destroy()
 
-        lim, used = self.db.get_credit_info()
+        lim, used = (data or self.load(self.db))["credit"]
         disp = lim - used
         percent = used / lim if lim > 0 else 0
 
@@ -61,13 +73,11 @@ class CreditView(ctk.CTkFrame):
         try:
             val = float(self.new_limit_var.get())
             self.db.update_credit_limit(val)
-            self._refresh_data()
         except ValueError: messagebox.showerror("Error", "Número Inválido")
 
     def pay_credit(self):
         try:
             val = float(self.pay_credit_var.get())
             self.tx_service.create_transaction("PagoCredito", "Financiero", val, datetime.now().strftime("%Y-%m-%d"), "Abono Crédito", "Transferencia")
-            self._refresh_data()
             messagebox.showinfo("Éxito", "Pago procesado")
         except ValueError: messagebox.showerror("Error", "Monto Inválido")
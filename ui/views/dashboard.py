@@ -2,27 +2,35 @@
 import customtkinter as ctk
 from utils.constants import *
 from ui.components.cards import create_info_card
+from ui.charts import charts
+from ui.views.base import CachedView
+from db.events import CREDIT_TABLES, TX_TABLES
 
-try:
-    import matplotlib.pyplot as plt
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    HAS_MATPLOTLIB = True
-except ImportError:
-    HAS_MATPLOTLIB = False
+class DashboardView(CachedView, ctk.CTkFrame):
+    TABLES = TX_TABLES + CREDIT_TABLES
 
-class DashboardView(ctk.CTkFrame):
-    def __init__(self, parent, db):
+    def __init__(self, parent, db, data=None):
         super().__init__(parent, corner_radius=0, fg_color="transparent")
         self.db = db
         self.grid(row=0, column=1, sticky="nsew", padx=40, pady=30)
-        self._setup_ui()
+        self._setup_ui(data if data is not None else self.load(db))
 
-    def _setup_ui(self):
+    @staticmethod
+    def load(db):
+        """Consultas y figura de la vista; se ejecuta en un hilo de trabajo (sin tocar widgets)."""
+        expenses = db.get_expenses_by_category()
+        return {
+            "summary": db.get_summary(),
+            "credit": db.get_credit_info(),
+            "figure": DashboardView._build_figure(expenses) if charts.available() and expenses else None,
+        }
+
+    def _setup_ui(self, data):
         ctk.CTkLabel(self, text="Panel de Control De Finanzas", font=FONT_TITLE_MAIN, text_color=COLOR_TEXT_WHITE).pack(anchor="w", pady=(0, 40))
 
-        ingresos, gastos = self.db.get_summary()
+        ingresos, gastos = data["summary"]
         balance = ingresos - gastos
-        cred_lim, cred_used = self.db.get_credit_info()
+        cred_lim, cred_used = data["credit"]
         cred_disp = cred_lim - cred_used
 
         cards_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -33,9 +41,28 @@ class DashboardView(ctk.CTkFrame):
         create_info_card(cards_frame, "Balance Neto", f"${balance:.2f}", COLOR_ACCENT_BLUE, "—").pack(side="left", expand=True, fill="both", padx=10)
         create_info_card(cards_frame, "Crédito Disponible", f"${cred_disp:.2f}", COLOR_ACCENT_YELLOW, "::").pack(side="left", expand=True, fill="both", padx=10)
 
-        self._create_chart()
+        self._create_chart(data["figure"])
+
+    @staticmethod
+    def _build_figure(data):
+        categories = [x[0] for x in data]
+        amounts = [x[1] for x in data]
+        fig = charts.figure("dashboard.gastos", figsize=(6, 4), dpi=100, facecolor=theme_color(COLOR_CARD_BG))
+        ax = fig.add_subplot(111)
+        colors = [
+            theme_color(COLOR_ACCENT_GREEN), 
+            theme_color(COLOR_ACCENT_RED), 
+            theme_color(COLOR_ACCENT_BLUE), 
+            theme_color(COLOR_ACCENT_YELLOW), 
+            '#9b59b6', '#e67e22'
+        ]
+        wedges, texts, autotexts = ax.pie(amounts, labels=categories, autopct='%1.1f%%', 
+                                          startangle=90, textprops={'color':"white", 'size': 10},
+                                          colors=colors, wedgeprops={'edgecolor': theme_color(COLOR_CARD_BG), 'linewidth': 3})
+        ax.set_facecolor(theme_color(COLOR_CARD_BG))
+        return fig
 
-    def _create_chart(self):
+    def _create_chart(self, fig):
         chart_container = ctk.CTkFrame(self, fg_color=COLOR_CARD_BG, corner_radius=12, border_width=1, border_color=COLOR_CARD_BORDER)
         chart_container.pack(fill="both", expand=True, pady=30)
 
@@ -44,24 +71,8 @@ class DashboardView(ctk.CTkFrame):
         chart_frame = ctk.CTkFrame(chart_container, fg_color="transparent")
         chart_frame.pack(fill="both", expand=True, padx=20, pady=(0, 20))
 
-        data = self.db.get_expenses_by_category()
-        if HAS_MATPLOTLIB and data:
-            categories = [x[0] for x in data]
-            amounts = [x[1] for x in data]
-            fig = plt.Figure(figsize=(6, 4), dpi=100, facecolor=theme_color(COLOR_CARD_BG))
-            ax = fig.add_subplot(111)
-            colors = [
-                theme_color(COLOR_ACCENT_GREEN), 
-                theme_color(COLOR_ACCENT_RED), 
-                theme_color(COLOR_ACCENT_BLUE), 
-                theme_color(COLOR_ACCENT_YELLOW), 
-                '#9b59b6', '#e67e22'
-            ]
-            wedges, texts, autotexts = ax.pie(amounts, labels=categories, autopct='%1.1f%%', 
-                                              startangle=90, textprops={'color':"white", 'size': 10},
-                                              colors=colors, wedgeprops={'edgecolor': theme_color(COLOR_CARD_BG), 'linewidth': 3})
-            ax.set_facecolor(theme_color(COLOR_CARD_BG))
-            canvas = FigureCanvasTkAgg(fig, master=chart_frame)
+        if fig is not None:
+            canvas = charts.canvas(fig, chart_frame)
             canvas.draw()
             canvas.get_tk_widget().pack(side="left", fill="both", expand=True, padx=10, pady=10)
         else:
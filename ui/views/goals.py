@@ -5,28 +5,45 @@ from utils.constants import *
 from datetime import datetime
 import math
 import random
+from ui.views.base import CachedView
+from db.events import TX_TABLES
 
-class GoalsView(ctk.CTkFrame):
-    def __init__(self, parent, db):
+class GoalsView(CachedView, ctk.CTkFrame):
+    TABLES = ("planes_ahorro",) + TX_TABLES
+
+    def __init__(self, parent, db, data=None):
         super().__init__(parent, corner_radius=0, fg_color="transparent")
         self.db = db
         # Alinear con el espaciado de RecurringView
         self.grid(row=0, column=1, sticky="nsew", padx=40, pady=30)
 
-        self._avg_savings = self._calculate_avg_savings()
-        self._setup_ui()
+        data = data if data is not None else self.load(db)
+        self._avg_savings = data["avg_savings"]
+        self._setup_ui(data)
+
+    @staticmethod
+    def load(db):
+        """Consultas de la vista; se ejecuta en un hilo de trabajo (sin tocar widgets)."""
+        return {"avg_savings": GoalsView._calculate_avg_savings(db), "plans": db.get_plans()}
+
+    def reload(self, data=None):
+        # Solo las tarjetas dependen de los datos; se conserva el formulario
+        data = data if data is not None else self.load(self.db)
+        self._avg_savings = data["avg_savings"]
+        self.refresh_plans(data["plans"])
 
-    def _calculate_avg_savings(self):
+    @staticmethod
+    def _calculate_avg_savings(db):
         """Estima la capacidad de ahorro mensual basada en los últimos 90 días.
         Heurística: (Ingresos Totales - Gastos Totales) / 3
         """
-        ing, gast = self.db.get_summary()
+        ing, gast = db.get_summary()
         balance = ing - gast
         if balance > 0:
             return balance / 3 # Estimación aproximada
         return 0
 
-    def _setup_ui(self):
+    def _setup_ui(self, data):
         # Encabezado (Usando pack para coincidir con RecurringView)
         header = ctk.CTkFrame(self, fg_color="transparent")
         header.pack(fill="x", pady=(0, 30))
@@ -60,7 +77,7 @@ class GoalsView(ctk.CTkFrame):
         # Necesitamos columnas para las tarjetas dentro del marco desplazable
         self.cards_scroll.grid_columnconfigure((0, 1, 2), weight=1)
 
-        self.refresh_plans()
+        self.refresh_plans(data["plans"])
 
     def _handle_add_goal(self):
         try:
@@ -82,16 +99,16 @@ class GoalsView(ctk.CTkFrame):
             # Reiniciar formulario
             self.name_var.set("")
             self.target_var.set("")
-            self.refresh_plans()
             
         except ValueError as e:
             messagebox.showerror("Error", str(e), parent=self)
 
-    def refresh_plans(self):
+    def refresh_plans(self, plans=None):
         for w in self.cards_scroll.winfo_children():
             w.destroy()
 
-        plans = self.db.get_plans()
+        if plans is None:
+            plans = self.db.get_plans()
         
         # Diseño: 3 columnas
         col = 0
@@ -185,7 +202,6 @@ class GoalsView(ctk.CTkFrame):
                 self.db.deposit_to_plan(pid, val)
                 messagebox.showinfo("Éxito", f"Aportado ${val} a {name}", parent=dialog)
                 dialog.destroy()
-                self.refresh_plans()
             except ValueError as e:
                 messagebox.showerror("Error", f"Error: {e}", parent=dialog)
             except Exception as e:
@@ -197,7 +213,6 @@ class GoalsView(ctk.CTkFrame):
         if messagebox.askyesno("Confirmar Eliminación", f"¿Estás seguro de que deseas eliminar el plan '{name}'?\nEsta acción no se puede deshacer.", parent=self):
             try:
                 self.db.delete_plan(pid)
-                self.refresh_plans()
             except Exception as e:
                 messagebox.showerror("Error", f"No se pudo eliminar: {e}", parent=self)
 
@@ -2,29 +2,48 @@
 import customtkinter as ctk
 from utils.constants import *
 from services.finance_math import FinanceMath
+from services import monte_carlo
+from ui.chart_layer import BlitLayer, Debouncer, fill_vertices
+from ui.charts import charts
+from ui.views.base import CachedView
+from db.events import TX_TABLES
 
-try:
-    import matplotlib.pyplot as plt
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    HAS_MATPLOTLIB = True
-except ImportError:
-    HAS_MATPLOTLIB = False
+# Trayectorias de la simulación de la vista (un solo bloque, sin pool de procesos)
+VIEW_PATHS = 20_000
+SLIDER_MAX = 1000
+RATE_ANNUAL = 0.08
 
-class ProjectionsView(ctk.CTkFrame):
-    def __init__(self, parent, db):
+class ProjectionsView(CachedView, ctk.CTkFrame):
+    TABLES = TX_TABLES + ("planes_ahorro",)
+
+    def __init__(self, parent, db, data=None):
         super().__init__(parent, corner_radius=0, fg_color="#0A0A0A") # Fondo negro profundo
         self.db = db
         self.grid(row=0, column=1, sticky="nsew", padx=0, pady=0)
-        self._setup_ui()
+        self._setup_ui(data if data is not None else self.load(db))
+
+    @staticmethod
+    def load(db):
+        """Consultas de la vista; se ejecuta en un hilo de trabajo (sin tocar widgets)."""
+        current_balance_ing, current_balance_gas = db.get_summary()
+        return {
+            "avg_savings": max(0, FinanceMath.calculate_average_savings(db, days=90)),
+            "principal": current_balance_ing - current_balance_gas,
+            "monte_carlo": monte_carlo.project(db, months=60, n_paths=VIEW_PATHS),
+        }
 
-    def _setup_ui(self):
+    def _setup_ui(self, data):
         # 1. Datos Base
-        self.avg_savings = max(0, FinanceMath.calculate_average_savings(self.db, days=90))
-        current_balance_ing, current_balance_gas = self.db.get_summary()
-        self.current_principal = current_balance_ing - current_balance_gas
+        self.avg_savings = data["avg_savings"]
+        self.current_principal = data["principal"]
+        self.monte_carlo = data.get("monte_carlo")
         
         # 60 Meses (5 Años)
         self.months = 60 
+
+        # El escenario base no depende del slider: se calcula una sola vez
+        self.t, self.amounts_base = FinanceMath.compound_growth_grid(
+            self.current_principal, self.avg_savings, RATE_ANNUAL, self.months)
         
         # 2. ENCABEZADO
         header_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -41,7 +60,9 @@ class ProjectionsView(ctk.CTkFrame):
         self.slider_label = ctk.CTkLabel(controls_frame, text="Ahorro Extra Mensual: $0", font=("Inter", 16, "bold"), text_color=COLOR_TEXT_WHITE)
         self.slider_label.pack(anchor="w", pady=(0, 5))
         
-        self.slider = ctk.CTkSlider(controls_frame, from_=0, to=1000, number_of_steps=100, command=self._update_simulation)
+        # Los eventos del slider se agrupan: como mucho un recálculo por fotograma
+        self.debouncer = Debouncer(self, self._update_simulation)
+        self.slider = ctk.CTkSlider(controls_frame, from_=0, to=SLIDER_MAX, number_of_steps=100, command=self.debouncer)
         self.slider.pack(fill="x", pady=(0, 15))
         self.slider.set(0)
         
@@ -60,6 +81,14 @@ class ProjectionsView(ctk.CTkFrame):
         self.lbl_gain_extra = ctk.CTkLabel(results_frame, text="Ganancia Extra: $0", font=("Inter", 18, "bold"), text_color="#2ECC71")
         self.lbl_gain_extra.grid(row=0, column=1, padx=20, pady=15, sticky="e")
 
+        # Resultado 3: Probabilidad de cumplir cada plan (Monte Carlo)
+        if self.monte_carlo and self.monte_carlo.goals:
+            goals_text = "  |  ".join(
+                f"{g.name}: {g.probability:.0%}" + (f" (a {monte_carlo.MAX_GOAL_MONTHS // 12} años)" if g.beyond_horizon else "")
+                for g in self.monte_carlo.goals)
+            ctk.CTkLabel(results_frame, text=f"Probabilidad de metas a tiempo: {goals_text}", font=("Inter", 13),
+                         text_color=COLOR_TEXT_GRAY).grid(row=1, column=0, columnspan=2, padx=20, pady=(0, 15), sticky="w")
+
         # 4. GRÁFICO
         chart_frame = ctk.CTkFrame(self, fg_color="transparent")
         chart_frame.pack(fill="both", expand=True, padx=20, pady=(0, 20))
@@ -68,8 +97,8 @@ class ProjectionsView(ctk.CTkFrame):
         self.ax = None
         self.canvas = None
         
-        if HAS_MATPLOTLIB:
-            self.figure = plt.Figure(figsize=(8, 5), dpi=100, facecolor="#0A0A0A")
+        if charts.available():
+            self.figure = charts.figure("projections.growth", figsize=(8, 5), dpi=100, facecolor="#0A0A0A")
             self.ax = self.figure.add_subplot(111)
             self.ax.set_facecolor("#0A0A0A")
             
@@ -80,11 +109,13 @@ class ProjectionsView(ctk.CTkFrame):
             self.ax.tick_params(axis='y', colors='white')
             self.ax.grid(True, axis='y', color='#333333', linestyle='--', alpha=0.5)
 
-            self.canvas = FigureCanvasTkAgg(self.figure, master=chart_frame)
+            self.canvas = charts.canvas(self.figure, chart_frame)
             self.canvas.get_tk_widget().pack(fill="both", expand=True)
             
             # Dibujado Inicial
+            self._build_chart()
             self._update_simulation(0)
+            self.canvas.draw()
         else:
             ctk.CTkLabel(chart_frame, text="Matplotlib no instalado", text_color=COLOR_TEXT_RED).pack(expand=True)
             
@@ -92,15 +123,42 @@ class ProjectionsView(ctk.CTkFrame):
         ctk.CTkLabel(self, text="Ahorro Base (Promedio 90 días): ${:.2f}".format(self.avg_savings), 
                      font=("Inter", 12), text_color=COLOR_TEXT_GRAY).pack(side="bottom", pady=(0, 20))
 
+    def _build_chart(self):
+        """Crea los artistas una sola vez; al mover el slider solo cambian los del escenario optimizado."""
+        t, base = self.t, self.amounts_base
+
+        # Estáticos (forman parte del fondo cacheado)
+        # Bandas Monte Carlo: P10-P90 sombreado y mediana punteada
+        mc = self.monte_carlo
+        if mc is not None:
+            self.ax.fill_between(mc.months, mc.p10, mc.p90, color="#F1C40F", alpha=0.12, label="P10-P90")
+            self.ax.plot(mc.months, mc.p50, color="#F1C40F", linewidth=1, linestyle="--", label="Mediana")
+        # Trazar Base (Cian)
+        self.ax.plot(t, base, color="#00F2FF", linewidth=2, label="Actual")
+        self.ax.fill_between(t, self.current_principal, base, color="#00F2FF", alpha=0.1)
+
+        # Dinámicos: Optimizado (Verde) y relleno entre ambos
+        self.opt_line, = self.ax.plot(t, base, color="#2ECC71", linewidth=2, label="Optimizado")
+        self.gain_fill = self.ax.fill_between(t, base, base, color="#2ECC71", alpha=0.3)
+
+        # Límites fijos que ya cubren el máximo del slider: arrastrar nunca obliga a reescalar
+        _, top = FinanceMath.compound_growth_grid(self.current_principal, self.avg_savings + SLIDER_MAX, RATE_ANNUAL, self.months)
+        lows = [self.current_principal, base.min()] + ([mc.p10.min()] if mc is not None else [])
+        highs = [top.max()] + ([mc.p90.max()] if mc is not None else [])
+        pad = 0.05 * (max(highs) - min(lows)) or 1.0
+        self.ax.set_xlim(t[0], t[-1])
+        self.ax.set_ylim(min(lows) - pad, max(highs) + pad)
+
+        self.blit = BlitLayer(self.canvas, [self.opt_line, self.gain_fill])
+
     def _update_simulation(self, value):
         extra_savings = float(value)
         self.slider_label.configure(text=f"Ahorro Extra Mensual: ${int(extra_savings)}")
         
-        # Calcular Escenarios
-        # 1. Base
-        t_base, amounts_base = FinanceMath.calculate_compound_growth(self.current_principal, self.avg_savings, 0.08, self.months)
-        # 2. Optimizado
-        t_opt, amounts_opt = FinanceMath.calculate_compound_growth(self.current_principal, self.avg_savings + extra_savings, 0.08, self.months)
+        # Solo el escenario optimizado depende del slider
+        _, amounts_opt = FinanceMath.compound_growth_grid(
+            self.current_principal, self.avg_savings + extra_savings, RATE_ANNUAL, self.months)
+        amounts_base = self.amounts_base
         
         # Actualizar Etiquetas (en 24 meses = índice 24)
         idx_24 = min(24, len(amounts_opt)-1)
@@ -110,19 +168,17 @@ class ProjectionsView(ctk.CTkFrame):
         self.lbl_result_24m.configure(text=f"En 24 Meses: ${val_24:,.0f}")
         self.lbl_gain_extra.configure(text=f"Ganancia Extra: ${diff_24:,.0f}")
         
-        # Actualizar Gráfico
+        # Actualizar Gráfico: mover vértices y repintar solo lo que cambió
         if self.ax:
-            self.ax.clear()
-            self.ax.grid(True, axis='y', color='#333333', linestyle='--', alpha=0.5)
-            
-            # Trazar Base (Cian)
-            self.ax.plot(t_base, amounts_base, color="#00F2FF", linewidth=2, label="Actual")
-            
-            # Trazar Optimizado (Verde)
-            self.ax.plot(t_opt, amounts_opt, color="#2ECC71", linewidth=2, label="Optimizado")
-            
-            # Rellenar Entre
-            self.ax.fill_between(t_base, amounts_base, amounts_opt, color="#2ECC71", alpha=0.3)
-            self.ax.fill_between(t_base, [self.current_principal]*len(t_base), amounts_base, color="#00F2FF", alpha=0.1)
-            
-            self.canvas.draw()
+            self.opt_line.set_ydata(amounts_opt)
+            self.gain_fill.set_verts([fill_vertices(self.t, amounts_base, amounts_opt)])
+            self.blit.update()
+
+    def _teardown(self):
+        # Una actualización pendiente no debe llegar a widgets ya destruidos
+        self.debouncer.cancel()
+        if self.canvas is not None:
+            self.blit.disconnect()
+            charts.release(self.figure)
+            self.canvas = None
+        super()._teardown()
@@ -2,20 +2,41 @@
 import customtkinter as ctk
 from tkinter import messagebox
 from utils.constants import *
+from services.recurring_service import RecurringService
+from services.forecast_service import ForecastService
+from ui.views.base import CachedView
+from db.events import CREDIT_TABLES, TX_TABLES
 
-class RecurringView(ctk.CTkFrame):
-    def __init__(self, parent, db):
+FORECAST_MONTHS = 12
+
+class RecurringView(CachedView, ctk.CTkFrame):
+    # El pronóstico parte del saldo y del crédito usado
+    TABLES = ("transacciones_recurrentes", "cargos_recurrentes") + TX_TABLES + CREDIT_TABLES
+
+    def __init__(self, parent, db, data=None):
         super().__init__(parent, corner_radius=0, fg_color="transparent")
         self.db = db
         self.grid(row=0, column=1, sticky="nsew", padx=40, pady=30)
-        self._setup_ui()
+        self._setup_ui(data)
 
-    def _setup_ui(self):
+    @staticmethod
+    def load(db):
+        """Consultas de la vista; se ejecuta en un hilo de trabajo (sin tocar widgets)."""
+        return {"recurring": db.get_recurring(), "forecast": ForecastService(db).forecast(FORECAST_MONTHS)}
+
+    def _setup_ui(self, data=None):
         # Encabezado
         header = ctk.CTkFrame(self, fg_color="transparent")
         header.pack(fill="x", pady=(0, 30))
         ctk.CTkLabel(header, text="Suscripciones y Pagos Fijos", font=FONT_TITLE_MAIN, text_color=COLOR_TEXT_WHITE).pack(side="left")
+        ctk.CTkButton(header, text="Registrar cargos pendientes", command=self.post_due,
+                      fg_color=theme_color(COLOR_ACCENT_BLUE), width=180).pack(side="right")
         
+        # Pronóstico de caja
+        self.forecast_label = ctk.CTkLabel(self, text="", font=FONT_SUBTITLE, text_color=COLOR_TEXT_GRAY, anchor="w")
+        self.forecast_label.pack(fill="x", pady=(0, 10))
+        self.refresh_forecast(data["forecast"] if data is not None else None)
+
         # Formulario para agregar nueva
         add_frame = ctk.CTkFrame(self, fg_color=COLOR_CARD_BG, corner_radius=12, border_width=1, border_color=COLOR_CARD_BORDER)
         add_frame.pack(fill="x", pady=10)
@@ -52,13 +73,20 @@ class RecurringView(ctk.CTkFrame):
         self.list_scroll = ctk.CTkScrollableFrame(self, fg_color="transparent")
         self.list_scroll.pack(fill="both", expand=True)
         
-        self.refresh_list()
+        self.refresh_list(data["recurring"] if data is not None else None)
         
-    def refresh_list(self):
+    def reload(self, data=None):
+        # Solo la lista y el pronóstico dependen de los datos; se conserva el formulario
+        data = data if data is not None else self.load(self.db)
+        self.refresh_list(data["recurring"])
+        self.refresh_forecast(data["forecast"])
+
+    def refresh_list(self, recurrings=None):
         for w in self.list_scroll.winfo_children():
             w.destroy()
             
-        recurrings = self.db.get_recurring()
+        if recurrings is None:
+            recurrings = self.db.get_recurring()
         
         if not recurrings:
             ctk.CTkLabel(self.list_scroll, text="No hay suscripciones activas.", text_color=COLOR_TEXT_GRAY).pack(pady=40)
@@ -68,6 +96,15 @@ class RecurringView(ctk.CTkFrame):
             rid, name, amount, day, cat, active = r
             self._create_row(rid, name, amount, day, cat)
             
+    def refresh_forecast(self, forecast=None):
+        if forecast is None:
+            forecast = ForecastService(self.db).forecast(FORECAST_MONTHS)
+        text = (f"Próximos {FORECAST_MONTHS} meses: saldo mínimo ${forecast.lowest_balance:,.2f} "
+                f"el {forecast.lowest_date.strftime('%d/%m/%Y')}")
+        if forecast.overdraft_days:
+            text += f"  |  {forecast.overdraft_days} días en descubierto desde el {forecast.first_overdraft.strftime('%d/%m/%Y')}"
+        self.forecast_label.configure(text=text, text_color=COLOR_ACCENT_RED if forecast.overdraft_days else COLOR_TEXT_GRAY)
+
     def _create_row(self, rid, name, amount, day, cat):
         row = ctk.CTkFrame(self.list_scroll, fg_color=COLOR_CARD_BG, corner_radius=10)
         row.pack(fill="x", pady=5)
@@ -97,11 +134,16 @@ class RecurringView(ctk.CTkFrame):
             self.name_var.set("")
             self.amount_var.set("")
             self.day_var.set("")
-            self.refresh_list()
         except ValueError:
             messagebox.showerror("Error", "Datos inválidos (Monto > 0, Día 1-31)")
             
+    def post_due(self):
+        ids = RecurringService(self.db).post_due()
+        if ids:
+            messagebox.showinfo("Cargos registrados", f"Se registraron {len(ids)} cargos pendientes.")
+        else:
+            messagebox.showinfo("Cargos registrados", "No hay cargos pendientes.")
+
     def delete_recurring(self, rid):
         if messagebox.askyesno("Confirmar", "¿Eliminar suscripción?"):
             self.db.delete_recurring(rid)
-            self.refresh_list()
@@ -1,25 +1,39 @@
 """Vista de Reportes."""
 import customtkinter as ctk
 from utils.constants import *
-try:
-    import matplotlib.pyplot as plt
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    HAS_MATPLOTLIB = True
-except ImportError:
-    HAS_MATPLOTLIB = False
-
-class ReportsView(ctk.CTkFrame):
-    def __init__(self, parent, db):
+from services import timeseries
+from ui.charts import charts
+from ui.views.base import CachedView
+from db.events import TX_TABLES
+
+# Ventanas de la tendencia (días; None = todo el historial)
+TREND_WINDOWS = {"90 días": 90, "1 año": 365, "Todo": None}
+DEFAULT_TREND_WINDOW = "90 días"
+
+class ReportsView(CachedView, ctk.CTkFrame):
+    TABLES = TX_TABLES
+
+    def __init__(self, parent, db, data=None):
         super().__init__(parent, corner_radius=0, fg_color="transparent")
         self.db = db
         # Configuración de grid para la vista
         self.grid(row=0, column=1, sticky="nsew", padx=40, pady=30)
-        self._setup_ui()
+        self._setup_ui(data if data is not None else self.load(db))
 
-    def _setup_ui(self):
+    @staticmethod
+    def load(db):
+        """Consultas y figuras de la vista; se ejecuta en un hilo de trabajo (sin tocar widgets)."""
+        if not charts.available():
+            return {}
+        return {
+            "trend": ReportsView._build_trend_figure(timeseries.expense_trend(db, TREND_WINDOWS[DEFAULT_TREND_WINDOW])),
+            "category": ReportsView._build_category_figure(db.get_expenses_by_category()),
+        }
+
+    def _setup_ui(self, data):
         ctk.CTkLabel(self, text="Reportes Avanzados", font=FONT_TITLE_MAIN, text_color=COLOR_TEXT_WHITE).pack(anchor="w", pady=(0, 20))
         
-        if not HAS_MATPLOTLIB:
+        if not charts.available():
             ctk.CTkLabel(self, text="Matplotlib no instalado. No se pueden mostrar gráficos.", text_color="red").pack()
             return
 
@@ -28,65 +42,79 @@ class ReportsView(ctk.CTkFrame):
         scroll.pack(fill="both", expand=True)
         
         # 1. Tendencia Mensual (Gráfico de Líneas)
-        self._create_trend_chart(scroll)
+        self._create_trend_chart(scroll, data["trend"])
         
         # 2. Desglose por Categoría (Barras/Pastel)
-        self._create_category_chart(scroll)
+        self._create_category_chart(scroll, data["category"])
 
-    def _create_trend_chart(self, parent):
-        frame = ctk.CTkFrame(parent, fg_color=COLOR_CARD_BG, corner_radius=12)
-        frame.pack(fill="x", pady=10)
-        
-        ctk.CTkLabel(frame, text="Tendencia de Gastos (Últimos 90 días)", font=("Inter", 16, "bold"), text_color=theme_color(COLOR_TEXT_WHITE)).pack(anchor="w", padx=20, pady=15)
-        
-        # Datos
-        txs = self.db.get_recent_transactions(90)
-        # Procesar fechas
-        from collections import defaultdict
-        import datetime
-        daily_expenses = defaultdict(float)
-        
-        for t in txs:
-            # t: id, tipo, cat, monto, fecha, desc, metodo
-            if t[1] == "Gasto":
-                daily_expenses[t[4]] += t[3]
-                
-        dates = sorted(daily_expenses.keys())
-        amounts = [daily_expenses[d] for d in dates]
-        
-        if not dates:
-            ctk.CTkLabel(frame, text="No hay suficientes datos", text_color="gray").pack(pady=30)
-            return
+    @staticmethod
+    def _build_trend_figure(series):
+        # series: gasto diario ya agregado en SQLite, sin huecos y reducido con LTTB
+        if not len(series.dates) or not series.values.any():
+            return None
 
         # Gráfico
-        fig = plt.Figure(figsize=(8, 4), dpi=100, facecolor=theme_color(COLOR_CARD_BG))
+        fig = charts.figure("reports.trend", figsize=(8, 4), dpi=100, facecolor=theme_color(COLOR_CARD_BG))
         ax = fig.add_subplot(111)
         
-        ax.plot(dates, amounts, marker='o', color=theme_color(COLOR_ACCENT_BLUE), linestyle='-')
+        # Marcadores solo mientras se distingan los puntos
+        marker = 'o' if len(series.dates) <= 120 else None
+        ax.plot(series.dates, series.values, marker=marker, markersize=4, color=theme_color(COLOR_ACCENT_BLUE), linestyle='-')
         ax.set_facecolor(theme_color(COLOR_CARD_BG))
         ax.tick_params(colors=theme_color(COLOR_TEXT_WHITE), labelrotation=45)
         for spine in ax.spines.values():
             spine.set_color('#444')
-            
-        canvas = FigureCanvasTkAgg(fig, master=frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True, padx=20, pady=10)
+        return fig
 
-    def _create_category_chart(self, parent):
+    def _create_trend_chart(self, parent, fig):
         frame = ctk.CTkFrame(parent, fg_color=COLOR_CARD_BG, corner_radius=12)
         frame.pack(fill="x", pady=10)
         
-        ctk.CTkLabel(frame, text="Gasto por Categoría", font=("Inter", 16, "bold"), text_color=theme_color(COLOR_TEXT_WHITE)).pack(anchor="w", padx=20, pady=15)
-        
-        data = self.db.get_expenses_by_category()
-        if not data:
-            ctk.CTkLabel(frame, text="Sin datos", text_color=theme_color(COLOR_TEXT_GRAY)).pack(pady=30)
+        header = ctk.CTkFrame(frame, fg_color="transparent")
+        header.pack(fill="x", padx=20, pady=15)
+        self.trend_title = ctk.CTkLabel(header, text="", font=("Inter", 16, "bold"), text_color=theme_color(COLOR_TEXT_WHITE))
+        self.trend_title.pack(side="left")
+        window = ctk.CTkSegmentedButton(header, values=list(TREND_WINDOWS), command=self._change_trend_window)
+        window.set(DEFAULT_TREND_WINDOW)
+        window.pack(side="right")
+
+        self.trend_body = ctk.CTkFrame(frame, fg_color="transparent")
+        self.trend_body.pack(fill="both", expand=True)
+        self.trend_fig = None
+        self._show_trend(DEFAULT_TREND_WINDOW, fig)
+
+    def _change_trend_window(self, label):
+        # Liberar antes de construir: la nueva figura reutiliza la anterior
+        if self.trend_fig is not None:
+            charts.release(self.trend_fig)
+            self.trend_fig = None
+        # La agregación corre en SQLite y llegan como mucho MAX_POINTS puntos: basta con hacerlo aquí
+        self._show_trend(label, self._build_trend_figure(timeseries.expense_trend(self.db, TREND_WINDOWS[label])))
+
+    def _show_trend(self, label, fig):
+        for widget in self.trend_body.winfo_children():
+            widget.destroy()
+        suffix = "Todo el historial" if TREND_WINDOWS[label] is None else f"Últimos {label}"
+        self.trend_title.configure(text=f"Tendencia de Gastos ({suffix})")
+
+        if fig is None:
+            ctk.CTkLabel(self.trend_body, text="No hay suficientes datos", text_color="gray").pack(pady=30)
             return
             
+        self.trend_fig = fig
+        canvas = charts.canvas(fig, self.trend_body)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill="both", expand=True, padx=20, pady=10)
+
+    @staticmethod
+    def _build_category_figure(data):
+        if not data:
+            return None
+            
         cats = [x[0] for x in data]
         vals = [x[1] for x in data]
         
-        fig = plt.Figure(figsize=(8, 4), dpi=100, facecolor=theme_color(COLOR_CARD_BG))
+        fig = charts.figure("reports.category", figsize=(8, 4), dpi=100, facecolor=theme_color(COLOR_CARD_BG))
         ax = fig.add_subplot(111)
         
         # Gráfico de Barras Horizontal
@@ -98,7 +126,18 @@ class ReportsView(ctk.CTkFrame):
         ax.set_facecolor(theme_color(COLOR_CARD_BG))
         for spine in ax.spines.values():
             spine.set_color('#444')
+        return fig
+
+    def _create_category_chart(self, parent, fig):
+        frame = ctk.CTkFrame(parent, fg_color=COLOR_CARD_BG, corner_radius=12)
+        frame.pack(fill="x", pady=10)
+        
+        ctk.CTkLabel(frame, text="Gasto por Categoría", font=("Inter", 16, "bold"), text_color=theme_color(COLOR_TEXT_WHITE)).pack(anchor="w", padx=20, pady=15)
+
+        if fig is None:
+            ctk.CTkLabel(frame, text="Sin datos", text_color=theme_color(COLOR_TEXT_GRAY)).pack(pady=30)
+            return
             
-        canvas = FigureCanvasTkAgg(fig, master=frame)
+        canvas = charts.canvas(fig, frame)
         canvas.draw()
         canvas.get_tk_widget().pack(fill="both", expand=True, padx=20, pady=10)
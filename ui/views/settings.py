@@ -2,16 +2,27 @@
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 from utils.constants import *
+from config import APP_DATA_DIR
 from services.data_service import DataService
+from ui.views.base import CachedView
 
-class SettingsView(ctk.CTkFrame):
-    def __init__(self, parent, db):
+class SettingsView(CachedView, ctk.CTkFrame):
+    TABLES = ()
+
+    def __init__(self, parent, db, bridge, adb):
         super().__init__(parent, corner_radius=0, fg_color="transparent")
         self.db = db
         self.ds = DataService(db)
+        # Los respaldos (con sus pausas entre lotes y el hash del archivo) van en un hilo de trabajo
+        self.bridge = bridge
+        self.adb = adb
         self.grid(row=0, column=1, sticky="nsew", padx=40, pady=30)
         self._setup_ui()
 
+    def reload(self, data=None):
+        # Nada de esta vista depende de los datos guardados
+        pass
+
     def _setup_ui(self):
         ctk.CTkLabel(self, text="Configuración", font=FONT_TITLE_MAIN, text_color=COLOR_TEXT_WHITE).pack(anchor="w", pady=(0, 40))
 
@@ -26,14 +37,49 @@ class SettingsView(ctk.CTkFrame):
         backup_frame.pack(fill="x", padx=20, pady=(0, 20))
         
         ctk.CTkLabel(backup_frame, text="Crear Respaldo de Base de Datos", font=FONT_BODY, text_color=COLOR_TEXT_GRAY).pack(side="left")
-        ctk.CTkButton(backup_frame, text="Respaldar Ahora", command=self.create_backup, 
-                      fg_color=COLOR_ACCENT_BLUE, height=32).pack(side="right")
+        self.backup_button = ctk.CTkButton(backup_frame, text="Respaldar Ahora", command=self.create_backup,
+                                           fg_color=COLOR_ACCENT_BLUE, height=32)
+        self.backup_button.pack(side="right")
+
+        # Respaldo incremental deduplicado en la carpeta de datos de la app
+        store_frame = ctk.CTkFrame(data_frame, fg_color="transparent")
+        store_frame.pack(fill="x", padx=20, pady=(0, 20))
+
+        ctk.CTkLabel(store_frame, text="Respaldo Incremental (solo guarda cambios)", font=FONT_BODY, text_color=COLOR_TEXT_GRAY).pack(side="left")
+        self.incremental_button = ctk.CTkButton(store_frame, text="Respaldo Incremental", command=self.create_incremental_backup,
+                                                fg_color=COLOR_ACCENT_BLUE, height=32)
+        self.incremental_button.pack(side="right")
+
+    def _run_backup(self, fn, *args, on_done):
+        """Ejecuta `fn` en segundo plano; el resultado o el error vuelven al hilo de Tk."""
+        buttons = (self.backup_button, self.incremental_button)
+        for button in buttons:
+            button.configure(state="disabled")
+
+        def finish():
+            if self.winfo_exists():
+                for button in buttons:
+                    button.configure(state="normal")
+
+        def done(result):
+            finish()
+            on_done(result)
+
+        def failed(e):
+            finish()
+            messagebox.showerror("Error", f"Fallo en el respaldo: {e}")
+
+        self.bridge.spawn(self.adb.run_read(fn, *args), on_done=done, on_error=failed)
 
     def create_backup(self):
         target_dir = filedialog.askdirectory(title="Seleccionar Directorio de Respaldo")
         if target_dir:
-            try:
-                path = self.ds.backup_database(target_dir)
-                messagebox.showinfo("Éxito", f"Respaldo creado en:\n{path}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Fallo en el respaldo: {e}")
+            self._run_backup(self.ds.backup_database, target_dir,
+                             on_done=lambda path: messagebox.showinfo("Éxito", f"Respaldo creado en:\n{path}"))
+
+    def create_incremental_backup(self):
+        def done(manifest):
+            messagebox.showinfo("Éxito", f"Respaldo {manifest['id']} creado\n"
+                                         f"Datos nuevos: {manifest['new_bytes'] / 1024:.0f} KB de {manifest['size'] / 1024:.0f} KB")
+
+        self._run_backup(self.ds.incremental_backup, str(APP_DATA_DIR / "backups"), on_done=done)
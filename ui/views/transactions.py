@@ -3,13 +3,26 @@ import customtkinter as ctk
 from tkinter import ttk, messagebox
 from datetime import datetime
 from utils.constants import *
+from ui.views.base import CachedView
 
+# Paginación por clave: filas por página y máximo de filas cargadas a la vez
+PAGE_SIZE = 100
+MAX_LOADED_ROWS = 500
 
-class TransactionsView(ctk.CTkFrame):
-    def __init__(self, parent, db, tx_service):
+
+class TransactionsView(CachedView, ctk.CTkFrame):
+    TABLES = ("transacciones",)
+
+    def __init__(self, parent, db, tx_service, bridge, adb):
         super().__init__(parent, corner_radius=0, fg_color="transparent")
         self.db = db
         self.tx_service = tx_service
+        self.bridge = bridge
+        self.adb = adb
+        self._search_query = ""
+        # Páginas de la búsqueda cargadas: [(número de página, [iids]), ...]
+        self._search_window = []
+        self._search_after = None
         self.grid(row=0, column=1, sticky="nsew", padx=40, pady=30)
         self._setup_ui()
 
@@ -17,10 +30,14 @@ class TransactionsView(ctk.CTkFrame):
         header_frame = ctk.CTkFrame(self, fg_color="transparent")
         header_frame.pack(fill="x", pady=(0, 40))
         ctk.CTkLabel(header_frame, text="Transacciones", font=FONT_TITLE_MAIN, text_color=COLOR_TEXT_WHITE).pack(side="left")
-        ctk.CTkButton(header_frame, text="Exportar", command=self.export_csv, 
-                      fg_color=COLOR_ACCENT_BLUE, width=100).pack(side="right")
+        self.export_button = ctk.CTkButton(header_frame, text="Exportar", command=self.export_csv,
+                                           fg_color=COLOR_ACCENT_BLUE, width=100)
+        self.export_button.pack(side="right")
         ctk.CTkButton(header_frame, text="Eliminar", command=self.delete_selected,
                       fg_color=theme_color(COLOR_ACCENT_RED), width=100).pack(side="right", padx=5)
+        self.search_entry = ctk.CTkEntry(header_frame, placeholder_text="Buscar descripción o categoría...", width=260)
+        self.search_entry.pack(side="right", padx=5)
+        self.search_entry.bind("<KeyRelease>", self._on_search_key)
 
         form_frame = ctk.CTkFrame(self, fg_color=COLOR_CARD_BG, corner_radius=12, border_width=1, border_color=COLOR_CARD_BORDER)
         form_frame.pack(fill="x", pady=10)
@@ -74,18 +91,198 @@ class TransactionsView(ctk.CTkFrame):
         
         self.tree.column("Desc", width=250)
 
-        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
+        self.scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscroll=self._on_tree_scroll)
         self.tree.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        self.scrollbar.pack(side="right", fill="y")
         
         self.refresh_table()
 
+    def reload(self, data=None):
+        # Solo la tabla depende de los datos; se conservan búsqueda y formulario
+        self.refresh_table()
+
+    def apply_change(self, event, loader=None):
+        """Inserta o quita en sitio las filas cambiadas; recarga si son demasiadas."""
+        generation = self.current_generation(self.db)
+        ids = event.ids_for("transacciones")
+        if event.unknown or not ids or len(ids) > PAGE_SIZE:
+            self.refresh_table()
+        else:
+            for tx_id in sorted(ids):
+                if self.db.get_transaction(tx_id) is None:
+                    self._remove_row(tx_id)
+                else:
+                    self._insert_row(tx_id)
+        self.data_generation = generation
+
     def refresh_table(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        for row in self.db.get_transactions():
-            self.tree.insert("", "end", values=row)
+        """Recarga la tabla desde la transacción más reciente (o la primera página de la búsqueda)."""
+        self.tree.delete(*self.tree.get_children())
+        self._search_window = []
+        self._has_newer = False
+        self._has_older = True
+        self._page_pending = False
+        self._load_older()
+
+    # --- Carga incremental (ventana deslizante sobre la paginación por clave) ---
+    @staticmethod
+    def _row_key(row):
+        return (row[4], int(row[0]))
+
+    def _item_key(self, iid):
+        values = self.tree.item(iid, "values")
+        return (values[4], int(values[0]))
+
+    def _on_tree_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if self._page_pending:
+            return
+        # Diferir la carga: modificar el Treeview aquí volvería a invocar este callback
+        if float(last) >= 0.9 and self._has_older:
+            self._page_pending = True
+            self.after_idle(self._load_older)
+        elif float(first) <= 0.1 and self._has_newer:
+            self._page_pending = True
+            self.after_idle(self._load_newer)
+
+    def _top_visible_index(self):
+        top = self.tree.identify_row(1)
+        return self.tree.index(top) if top else 0
+
+    # --- Búsqueda (FTS) mientras se escribe ---
+    def _on_search_key(self, _event=None):
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+        self._search_after = self.after(150, self._run_search)
+
+    def _run_search(self):
+        self._search_after = None
+        query = self.search_entry.get().strip()
+        if query == self._search_query:
+            return
+        self._search_query = query
+        self.refresh_table()
+
+    def _insert_search_rows(self, rows, index):
+        """Inserta desde `index` las filas que no estén ya (la paginación por
+        desplazamiento puede repetir una si otra se insertó o borró entre páginas)."""
+        iids = []
+        for row in rows:
+            iid = str(row[0])
+            if self.tree.exists(iid):
+                continue
+            self.tree.insert("", index, iid=iid, values=row)
+            iids.append(iid)
+            if index != "end":
+                index += 1
+        return iids
+
+    def _drop_search_page(self, iids):
+        iids = [iid for iid in iids if self.tree.exists(iid)]
+        if iids:
+            self.tree.delete(*iids)
+        return len(iids)
+
+    def _load_search_older(self):
+        page = self._search_window[-1][0] + 1 if self._search_window else 0
+        rows, cursor = self.db.search_transactions(self._search_query, limit=PAGE_SIZE, cursor=page * PAGE_SIZE)
+        self._has_older = cursor is not None
+        top = self._top_visible_index()
+        self._search_window.append((page, self._insert_search_rows(rows, "end")))
+
+        # Misma ventana acotada que la paginación por clave, por páginas completas
+        if len(self._search_window) > MAX_LOADED_ROWS // PAGE_SIZE:
+            _, dropped = self._search_window.pop(0)
+            removed = self._drop_search_page(dropped)
+            self._has_newer = True
+            self.tree.yview_moveto(max(top - removed, 0) / max(len(self.tree.get_children()), 1))
+
+    def _load_search_newer(self):
+        page = self._search_window[0][0] - 1
+        rows, _ = self.db.search_transactions(self._search_query, limit=PAGE_SIZE, cursor=page * PAGE_SIZE)
+        self._has_newer = page > 0
+        top = self._top_visible_index()
+        iids = self._insert_search_rows(rows, 0)
+        self._search_window.insert(0, (page, iids))
+
+        if len(self._search_window) > MAX_LOADED_ROWS // PAGE_SIZE:
+            _, dropped = self._search_window.pop()
+            self._drop_search_page(dropped)
+            self._has_older = True
+        self.tree.yview_moveto((top + len(iids)) / max(len(self.tree.get_children()), 1))
+
+    def _load_older(self):
+        self._page_pending = False
+        if self._search_query:
+            self._load_search_older()
+            return
+        children = self.tree.get_children()
+        cursor = self._item_key(children[-1]) if children else None
+        rows = self.db.get_transactions_page(cursor, limit=PAGE_SIZE)
+        self._has_older = len(rows) == PAGE_SIZE
+        if not rows:
+            return
+
+        top = self._top_visible_index()
+        for row in rows:
+            self.tree.insert("", "end", iid=str(row[0]), values=row)
+
+        # Memoria acotada: descartar las filas más recientes de la ventana
+        children = self.tree.get_children()
+        excess = len(children) - MAX_LOADED_ROWS
+        if excess > 0:
+            self.tree.delete(*children[:excess])
+            self._has_newer = True
+            self.tree.yview_moveto(max(top - excess, 0) / MAX_LOADED_ROWS)
+
+    def _load_newer(self):
+        self._page_pending = False
+        if self._search_query:
+            self._load_search_newer()
+            return
+        children = self.tree.get_children()
+        if not children:
+            return
+        rows = self.db.get_transactions_page(self._item_key(children[0]), limit=PAGE_SIZE, backward=True)
+        self._has_newer = len(rows) == PAGE_SIZE
+        if not rows:
+            return
+
+        top = self._top_visible_index()
+        for index, row in enumerate(rows):
+            self.tree.insert("", index, iid=str(row[0]), values=row)
+
+        children = self.tree.get_children()
+        if len(children) > MAX_LOADED_ROWS:
+            self.tree.delete(*children[MAX_LOADED_ROWS:])
+            self._has_older = True
+        self.tree.yview_moveto((top + len(rows)) / len(self.tree.get_children()))
+
+    def _insert_row(self, tx_id):
+        """Inserta una transacción nueva en su posición sin recargar la tabla."""
+        if self._search_query:
+            return  # La relevancia decide la posición; se verá al repetir la búsqueda
+        if self.tree.exists(str(tx_id)):
+            return
+        row = self.db.get_transaction(tx_id)
+        if row is None:
+            return
+        key = self._row_key(row)
+        children = self.tree.get_children()
+        if self._has_newer and children and key > self._item_key(children[0]):
+            return  # Queda por encima de la ventana cargada; aparecerá al desplazarse
+        for index, iid in enumerate(children):
+            if key > self._item_key(iid):
+                self.tree.insert("", index, iid=str(row[0]), values=row)
+                return
+        if not self._has_older:
+            self.tree.insert("", "end", iid=str(row[0]), values=row)
+
+    def _remove_row(self, tx_id):
+        iid = str(tx_id)
+        if self.tree.exists(iid):
+            self.tree.delete(iid)
 
     def delete_selected(self):
         selected = self.tree.selection()
@@ -94,10 +291,9 @@ class TransactionsView(ctk.CTkFrame):
             return
         item = selected[0]
         values = self.tree.item(item, "values")
-        tx_id = values[0]
+        tx_id = int(values[0])
         if messagebox.askyesno("Confirmar", f"¿Eliminar la transacción ID {tx_id}?"):
             self.db.delete_transaction(tx_id)
-            self.refresh_table()
             messagebox.showinfo("Éxito", "Transacción eliminada")
 
     def save_transaction(self):
@@ -111,20 +307,72 @@ class TransactionsView(ctk.CTkFrame):
                 datetime.now().strftime("%Y-%m-%d"), self.var_desc.get(), self.var_metodo.get()
             )
             self.var_monto.set(""); self.var_desc.set("")
-            self.refresh_table()
             messagebox.showinfo("Éxito", "Transacción guardada exitosamente")
         except ValueError as e:
             messagebox.showerror("Error", str(e))
 
     def export_csv(self):
         from tkinter import filedialog
-        from services.data_service import DataService
-        
-        filename = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("Archivos CSV", "*.csv")])
-        if filename:
-            try:
-                ds = DataService(self.db)
-                ds.export_transactions_csv(filename)
-                messagebox.showinfo("Éxito", "Datos exportados exitosamente")
-            except Exception as e:
+        from services.data_service import DataService, ExportCancelled
+
+        filename = filedialog.asksaveasfilename(defaultextension=".csv",
+                                                filetypes=[("Archivos CSV", "*.csv"), ("CSV comprimido", "*.csv.gz")])
+        if not filename:
+            return
+        # La exportación corre en un hilo de trabajo; el diálogo solo refleja su avance
+        dialog, on_progress = self._create_export_progress()
+        self.export_button.configure(state="disabled")
+
+        def finish():
+            if dialog.winfo_exists():
+                dialog.destroy()
+            if self.winfo_exists():
+                self.export_button.configure(state="normal")
+
+        def done(rows):
+            finish()
+            messagebox.showinfo("Éxito", f"{rows} transacciones exportadas exitosamente")
+
+        def failed(e):
+            finish()
+            if isinstance(e, ExportCancelled):
+                messagebox.showinfo("Exportación", "Exportación cancelada")
+            else:
                 messagebox.showerror("Error", f"Fallo al exportar: {e}")
+
+        ds = DataService(self.db)
+        self.bridge.spawn(self.adb.run_read(ds.export_transactions_csv, filename, progress=on_progress),
+                          on_done=done, on_error=failed)
+
+    def _create_export_progress(self):
+        """Diálogo con barra de progreso y botón de cancelar para la exportación.
+
+        `on_progress` se llama desde el hilo de trabajo: pinta a través del
+        bucle del puente (en el hilo de Tk) y devuelve False si se canceló.
+        """
+        dialog = ctk.CTkToplevel(self)
+        dialog.title("Exportando")
+        dialog.geometry("320x150")
+        dialog.attributes("-topmost", True)
+
+        label = ctk.CTkLabel(dialog, text="Preparando exportación...", font=FONT_BODY)
+        label.pack(pady=(20, 10))
+        bar = ctk.CTkProgressBar(dialog, width=260)
+        bar.set(0)
+        bar.pack(pady=5)
+
+        state = {"cancelled": False}
+        ctk.CTkButton(dialog, text="Cancelar", fg_color=theme_color(COLOR_ACCENT_RED),
+                      command=lambda: state.update(cancelled=True)).pack(pady=10)
+        dialog.protocol("WM_DELETE_WINDOW", lambda: state.update(cancelled=True))
+
+        def show_progress(done, total):
+            if dialog.winfo_exists():
+                bar.set(done / total)
+                label.configure(text=f"{done:,} / {total:,} transacciones")
+
+        def on_progress(done, total):
+            self.bridge.loop.call_soon_threadsafe(show_progress, done, total)
+            return not state["cancelled"]
+
+        return dialog, on_progress
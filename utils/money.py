@@ -0,0 +1,27 @@
+"""Conversión entre montos decimales y centavos enteros.
+
+La base de datos guarda todo importe como INTEGER en centavos; la API
+pública de DatabaseManager sigue aceptando y devolviendo float. Esta es
+la única frontera donde se redondea.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Optional, Union
+
+CENTS = 100
+
+Amount = Union[int, float, Decimal, str]
+
+
+def to_cents(amount: Amount) -> int:
+    """Convierte un importe a centavos redondeando al centavo más cercano (half-up).
+
+    Se pasa por `str` para no arrastrar el error binario del float
+    (0.1 + 0.2 -> 30 centavos, no 30.000000000000004).
+    """
+    value = amount if isinstance(amount, Decimal) else Decimal(str(amount))
+    return int((value * CENTS).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents: Optional[int]) -> float:
+    """Convierte centavos a float para la UI (None cuenta como 0)."""
+    return (cents or 0) / CENTS
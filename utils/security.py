@@ -1,70 +1,225 @@
-"""Utilidades de seguridad para la Aplicación de Finanzas."""
+"""Utilidades de seguridad para la Aplicación de Finanzas.
+
+El PIN y la respuesta de recuperación se guardan derivados con PBKDF2,
+cada uno con su sal y sus parámetros (`kdf`). El coste objetivo sale de
+calibrar la máquina la primera vez, con config.PIN_ITERATIONS como
+mínimo; un hash con parámetros más débiles sigue verificando y se
+vuelve a derivar con los vigentes en cuanto se acierta.
+
+La derivación es lenta a propósito: la interfaz la lanza con
+`KdfService` para no bloquear el hilo de Tk.
+"""
 import os
 import json
+import time
 import hashlib
 import hmac
-from typing import Optional, Dict
-from utils.constants import CONFIG_FILE
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Dict, NamedTuple
+from config import PIN_ITERATIONS, PIN_KDF_TARGET_MS, PIN_SALT_LENGTH, USER_CONFIG_FILE
+
+CONFIG_PATH = os.path.join(os.path.expanduser("~"), USER_CONFIG_FILE)
+
+KDF_ALGORITHM = "pbkdf2_sha256"
+# Hashes guardados antes de registrar los parámetros en la configuración
+LEGACY_ITERATIONS = 100_000
+# Iteraciones de la derivación de prueba al calibrar
+CALIBRATION_SAMPLE = 20_000
+
+
+class KdfParams(NamedTuple):
+    algorithm: str
+    iterations: int
+
+    @classmethod
+    def from_config(cls, raw: Optional[Dict]) -> "KdfParams":
+        if not raw:
+            return cls(KDF_ALGORITHM, LEGACY_ITERATIONS)
+        return cls(raw["algorithm"], int(raw["iterations"]))
+
+    def to_config(self) -> Dict:
+        return {"algorithm": self.algorithm, "iterations": self.iterations}
+
+
+def derive(secret: str, salt: bytes, params: KdfParams) -> bytes:
+    if params.algorithm != KDF_ALGORITHM:
+        raise ValueError(f"Algoritmo de derivación no soportado: {params.algorithm}")
+    return hashlib.pbkdf2_hmac("sha256", secret.encode(), salt, params.iterations)
+
+
+def calibrate_iterations(target_ms: int = PIN_KDF_TARGET_MS, minimum: int = PIN_ITERATIONS,
+                         sample: int = CALIBRATION_SAMPLE) -> int:
+    """Iteraciones para que una derivación tarde ~`target_ms` en esta máquina.
+
+    Se mide una derivación de `sample` iteraciones y se escala; el
+    resultado se redondea a decenas de millar y nunca baja de `minimum`.
+    """
+    start = time.perf_counter()
+    derive("calibracion", os.urandom(PIN_SALT_LENGTH), KdfParams(KDF_ALGORITHM, sample))
+    elapsed = max(time.perf_counter() - start, 1e-6)
+    iterations = int(sample * target_ms / 1000 / elapsed) // 10_000 * 10_000
+    return max(minimum, iterations)
+
+
+def target_params(data: Optional[Dict] = None) -> KdfParams:
+    """Parámetros vigentes: los calibrados en `data`, con PIN_ITERATIONS como mínimo."""
+    raw = (data or {}).get("kdf_target")
+    calibrated = int(raw["iterations"]) if raw and raw.get("algorithm") == KDF_ALGORITHM else 0
+    return KdfParams(KDF_ALGORITHM, max(PIN_ITERATIONS, calibrated))
+
+
+def _normalize_answer(answer: str) -> str:
+    return answer.lower().strip()
+
+
+def _hash_record(secret: str, params: KdfParams) -> Dict:
+    salt = os.urandom(PIN_SALT_LENGTH)
+    return {"salt": salt.hex(), "hash": derive(secret, salt, params).hex(), "kdf": params.to_config()}
+
+
+def _put_record(data: Dict, prefix: str, record: Dict) -> None:
+    if not prefix and "recovery_hash" in data and "recovery_salt" not in data:
+        # La respuesta antigua se derivó con la sal del PIN: conservarla aparte
+        data["recovery_salt"] = data.get("salt")
+    for key, value in record.items():
+        data[prefix + key] = value
+
+
+def _check_record(data: Dict, prefix: str, secret: str) -> Optional[KdfParams]:
+    """Parámetros del hash guardado si `secret` coincide; None si no."""
+    try:
+        salt = bytes.fromhex(data.get(prefix + "salt") or data["salt"])
+        stored = bytes.fromhex(data[prefix + "hash"])
+        params = KdfParams.from_config(data.get(prefix + "kdf"))
+        return params if hmac.compare_digest(derive(secret, salt, params), stored) else None
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _upgrade_record(data: Dict, prefix: str, secret: str, params: KdfParams) -> None:
+    """Vuelve a derivar `secret` si su hash usa parámetros más débiles que los vigentes.
+
+    Una instalación anterior no tiene coste calibrado: se calibra en el
+    primer acierto y se guarda, para que la actualización llegue a él.
+    """
+    calibrated = "kdf_target" not in data
+    if calibrated:
+        data["kdf_target"] = KdfParams(KDF_ALGORITHM, calibrate_iterations()).to_config()
+    target = target_params(data)
+    if params.algorithm != target.algorithm or params.iterations < target.iterations:
+        _put_record(data, prefix, _hash_record(secret, target))
+    elif not calibrated:
+        return
+    try:
+        _write_config(data)
+    except OSError:
+        pass  # Se reintentará en el siguiente acceso
 
-CONFIG_PATH = os.path.join(os.path.expanduser("~"), CONFIG_FILE)
 
 def save_pin_hash(pin: str, question: str = None, answer: str = None) -> None:
-    """Guarda el hash del PIN y opcionalmente los datos de recuperación."""
-    salt = os.urandom(16)
-    dk = hashlib.pbkdf2_hmac("sha256", pin.encode(), salt, 100_000)
-    
+    """Guarda el hash del PIN y opcionalmente los datos de recuperación.
+
+    La primera vez calibra el coste de la derivación para esta máquina.
+    Con respuesta, el PIN y la respuesta se derivan en paralelo.
+    """
     # Cargar datos existentes si los hay para no sobrescribir perfil
-    current_data = {}
-    if os.path.exists(CONFIG_PATH):
-        try:
-            with open(CONFIG_PATH, "r") as f:
-                current_data = json.load(f)
-        except:
-            pass
+    current_data = _read_config() or {}
+    if "kdf_target" in current_data:
+        params = target_params(current_data)
+    else:
+        params = KdfParams(KDF_ALGORITHM, calibrate_iterations())
 
     data = {
-        "salt": salt.hex(),
-        "hash": dk.hex(),
         # Mantener datos previos si no se pasan nuevos
         "security_question": question if question else current_data.get("security_question"),
-        "recovery_hash": _hash_answer(answer, salt) if answer else current_data.get("recovery_hash"),
-        "profile": current_data.get("profile", {})
+        "profile": current_data.get("profile", {}),
+        "kdf_target": params.to_config(),
     }
-    
-    _write_config(data)
+    for key in ("salt", "recovery_salt", "recovery_hash", "recovery_kdf"):
+        if key in current_data:
+            data[key] = current_data[key]
+
+    if answer:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            pin_record = pool.submit(_hash_record, pin, params)
+            answer_record = pool.submit(_hash_record, _normalize_answer(answer), params)
+            _put_record(data, "", pin_record.result())
+            _put_record(data, "recovery_", answer_record.result())
+    else:
+        _put_record(data, "", _hash_record(pin, params))
 
-def _hash_answer(answer: str, salt: bytes) -> str:
-    """Genera hash para la respuesta de seguridad (normalizada)."""
-    normalized = answer.lower().strip()
-    dk = hashlib.pbkdf2_hmac("sha256", normalized.encode(), salt, 100_000)
-    return dk.hex()
+    _write_config(data)
 
 def verify_pin(pin: str) -> bool:
-    """Verifica si el PIN proporcionado coincide con el hash almacenado."""
+    """Verifica si el PIN proporcionado coincide con el hash almacenado.
+
+    Si coincide y el hash usa parámetros antiguos, lo actualiza.
+    """
     data = _read_config()
     if not data: return False
-    
-    try:
-        salt = bytes.fromhex(data["salt"])
-        stored = bytes.fromhex(data["hash"])
-        dk = hashlib.pbkdf2_hmac("sha256", pin.encode(), salt, 100_000)
-        return hmac.compare_digest(dk, stored)
-    except (KeyError, ValueError):
+
+    params = _check_record(data, "", pin)
+    if params is None:
         return False
+    _upgrade_record(data, "", pin, params)
+    return True
 
 def verify_recovery_answer(answer: str) -> bool:
-    """Verifica la respuesta de seguridad."""
+    """Verifica la respuesta de seguridad (y actualiza su hash si es antiguo)."""
     data = _read_config()
-    if not data or "recovery_hash" not in data or "salt" not in data: return False
+    if not data or "recovery_hash" not in data: return False
 
-    try:
-        salt = bytes.fromhex(data["salt"])
-        stored = bytes.fromhex(data["recovery_hash"])
-        normalized = answer.lower().strip()
-        dk = hashlib.pbkdf2_hmac("sha256", normalized.encode(), salt, 100_000)
-        return hmac.compare_digest(dk, stored)
-    except (KeyError, ValueError):
+    answer = _normalize_answer(answer)
+    params = _check_record(data, "recovery_", answer)
+    if params is None:
         return False
+    _upgrade_record(data, "recovery_", answer, params)
+    return True
+
+
+class KdfService:
+    """Ejecuta derivaciones en un hilo de trabajo y entrega el resultado en el hilo de Tk.
+
+        kdf = KdfService(window)
+        kdf.run(verify_pin, pin, on_done=lambda ok: ...)
+
+    El resultado se recoge sondeando con `after()` desde el hilo de Tk,
+    nunca llamando a Tk desde el hilo de trabajo.
+    """
+
+    def __init__(self, widget: Any, poll_ms: int = 16) -> None:
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kdf")
+        self._pending = 0
+
+    @property
+    def busy(self) -> bool:
+        return self._pending > 0
+
+    def run(self, fn: Callable[..., Any], *args: Any, on_done: Callable[[Any], None],
+            on_error: Optional[Callable[[BaseException], None]] = None) -> Future:
+        future = self._executor.submit(fn, *args)
+        self._pending += 1
+        self._poll(future, on_done, on_error)
+        return future
+
+    def _poll(self, future: Future, on_done: Callable[[Any], None],
+              on_error: Optional[Callable[[BaseException], None]]) -> None:
+        if not future.done():
+            self.widget.after(self.poll_ms, lambda: self._poll(future, on_done, on_error))
+            return
+        self._pending -= 1
+        exc = future.exception()
+        if exc is None:
+            on_done(future.result())
+        elif on_error is not None:
+            on_error(exc)
+        else:
+            raise exc
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
 
 def get_security_question() -> Optional[str]:
     data = _read_config()
@@ -73,7 +228,7 @@ def get_security_question() -> Optional[str]:
 def save_user_profile(nombre: str, apellido: str, edad: int) -> None:
     data = _read_config()
     if not data: return # No debería pasar si se creó PIN primero
-    
+
     data["profile"] = {
         "nombre": nombre,
         "apellido": apellido,